@@ -8,6 +8,7 @@ import subprocess
 import uuid
 import re
 import traceback
+from collections import deque
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
@@ -24,23 +25,40 @@ from requests_aws4auth import AWS4Auth
 import cv2
 import numpy as np
 import pyautogui
-from plyer import notification
+from notification_manager import get_notification_manager, stop_notification_manager
 import pystray
 import ctypes
 import socket
 from vpn_settings import is_vpn_connected, connect_to_vpn_with_fallback, connect_to_vpn
 from notification_popover import NotificationPopover
+from notification_coalescer import NotificationCoalescer
+from notification_record import NotificationLevel, NotificationRecord
+from notification_store import NotificationStore
+from notification_archive import NotificationArchive
+from async_runner import get_async_runner
+from browser_pool import DEFAULT_CACHE_DIR as BROWSER_CACHE_DIR, get_browser_pool
+from browser_session import BrowserSessionStore
+from log_highlight import LogHighlighter
+from log_view import LogView
+from workspace import DEFAULT_CONCURRENCY, open_workspace
+from nav_timing import configure_timing_store, get_timing_store, record_navigation_soon
+from nav_timing_window import LinkTimingWindow
+from route_profiles import configure_route_profiles
+from link_health import LinkHealthChecker
+from logging_config import (
+    LOG_FILE, add_handler, configure_logging, enable_structured_log, get_flood_stats, remove_handler
+)
 from constants import LINKS, KNOWN_SECURITY_KEYS
 import hid
 import keyboard
 import ipaddress
 import importlib
 from config_manager import ConfigManager
-from gui_helpers import create_button_frame, create_security_keys_list, update_security_keys_list, get_connected_keys, toggle_pin_visibility
+from gui_helpers import create_button_frame, create_security_keys_list, update_security_keys_list, get_connected_keys, toggle_pin_visibility, update_link_badge
 import manage_zukey
 
 import asyncio
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
 ctk.set_appearance_mode("System")
 ctk.set_default_color_theme("blue")
@@ -48,40 +66,7 @@ ctk.set_default_color_theme("blue")
 def setup_logging():
     """Setup logging configuration."""
     try:
-        # Create logs directory if it doesn't exist
-        if not os.path.exists('logs'):
-            os.makedirs('logs')
-            
-        # Set up file handler for detailed logging
-        log_file = os.path.join('logs', 'quicklinks.log')
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(logging.DEBUG)
-        
-        # Set up console handler with more detailed output
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)  # Changed from ERROR to INFO to show more details
-        
-        # Create formatters and add it to the handlers
-        file_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        console_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')  # Added timestamp to console output
-        file_handler.setFormatter(file_formatter)
-        console_handler.setFormatter(console_formatter)
-        
-        # Get the root logger and configure it
-        logger = logging.getLogger()
-        logger.setLevel(logging.DEBUG)
-        
-        # Remove any existing handlers
-        for handler in logger.handlers[:]:
-            logger.removeHandler(handler)
-        
-        # Add our configured handlers
-        logger.addHandler(file_handler)
-        logger.addHandler(console_handler)
-        
-        # Log initial setup message
-        logger.info("Logging system initialized")
-        
+        configure_logging()
     except Exception as e:
         print(f"Error setting up logging: {e}")
         traceback.print_exc()  # Print full traceback for setup errors
@@ -335,6 +320,10 @@ class QuickLinksApp:
         # Load window state and settings
         self.load_window_state()
         
+        # Optional JSON-lines log for log_query.py
+        if self.settings.settings.get("structured_log", False):
+            enable_structured_log()
+        
         # Apply theme from settings
         theme = self.settings.settings.get("theme", "system")
         ctk.set_appearance_mode(theme)
@@ -345,12 +334,24 @@ class QuickLinksApp:
         self.root.attributes('-alpha', opacity)
         
         # Initialize notifications with settings
-        self.notifications = []
-        self.unread_notifications = []
+        self.notification_store = NotificationStore(
+            archive=NotificationArchive(
+                max_age_days=self.settings.settings.get("notification_retention_days", 30),
+                max_count=self.settings.settings.get("notification_max_count", 1000)
+            )
+        )
+        self.notification_store.subscribe(self._on_notification_event)
+        self.notification_store.subscribe_unread(self._on_unread_count_changed)
         self.notification_visible = False
         self.notification_popover = None
         self.notification_ui = None  # Initialize to None first
         
+        # Fold flapping events and throttle desktop toasts
+        self.notification_coalescer = NotificationCoalescer(
+            window_seconds=self.settings.settings.get("notification_coalesce_window", 60),
+            toast_interval_seconds=self.settings.settings.get("toast_rate_limit_seconds", 30)
+        )
+        
         # Configure root grid
         self.root.grid_rowconfigure(0, weight=1)
         self.root.grid_columnconfigure(0, weight=1)
@@ -415,6 +416,18 @@ class QuickLinksApp:
             hover_color=("gray70", "gray30")
         )
         self.settings_button.pack(side="left", padx=5, pady=5)
+
+        # Add link performance button to top controls
+        self.link_performance_button = ctk.CTkButton(
+            self.top_controls,
+            text="📊",  # Chart emoji for page load statistics
+            width=30,
+            height=30,
+            command=self.open_link_performance,
+            fg_color=("gray80", "gray20"),
+            hover_color=("gray70", "gray30")
+        )
+        self.link_performance_button.pack(side="left", padx=5, pady=5)
         
         # Initialize failure_status_label
         self.failure_status_label = ctk.CTkLabel(
@@ -452,47 +465,75 @@ class QuickLinksApp:
         # Initialize automation lock
         self.automation_lock = threading.Lock()
         
+        # One event loop for all async automation; completion callbacks come back on the Tk thread
+        self.async_runner = get_async_runner()
+        self.async_runner.set_ui_dispatcher(lambda callback: self.root.after(0, callback))
+        
+        # Long-lived browser for links and automation, launched once the window has painted
+        configure_timing_store(
+            enabled=self.settings.settings.get("nav_timing_enabled", True),
+            retention_days=self.settings.settings.get("nav_timing_retention_days", 90)
+        )
+        session_store = None
+        if self.settings.settings.get("browser_session_persist", True):
+            session_store = BrowserSessionStore(
+                max_age_hours=self.settings.settings.get("browser_session_max_age_hours", 12))
+        self.browser_pool = get_browser_pool(
+            spare_pages=self.settings.settings.get("browser_spare_pages", 1),
+            spare_contexts=self.settings.settings.get("browser_spare_contexts", 1),
+            session_store=session_store,
+            cache_dir=BROWSER_CACHE_DIR if self.settings.settings.get("browser_disk_cache", True) else None,
+            cache_size_mb=self.settings.settings.get("browser_disk_cache_mb", 256)
+        )
+        configure_route_profiles(
+            self.settings.settings.get("route_profiles"),
+            enabled=self.settings.settings.get("route_profiles_enabled", True)
+        )
+        # Only the driver starts here; the browser window is launched by warm_browser or on first use
+        if self.settings.settings.get("browser_prewarm", True):
+            self.root.after(1500, self.browser_pool.start)
+
+        # Background HTTP checks of the links, shown as badges on their buttons
+        self.link_health = None
+        if self.settings.settings.get("link_health_enabled", True):
+            self.link_health = LinkHealthChecker(
+                interval=self.settings.settings.get("link_health_interval_seconds", 60),
+                timeout=self.settings.settings.get("link_health_timeout_seconds", 5),
+                slow_ms=self.settings.settings.get("link_health_slow_ms", 2000),
+                on_update=lambda status: self.root.after(0, lambda: update_link_badge(self.button_frame, status))
+            )
+            self.root.after(3000, self.link_health.start)
+        
         # Schedule periodic tasks with longer intervals
         self.root.after(5000, self.check_dpi_scaling)  # Check DPI less frequently
-        self.root.after(1000, self.update)  # Update UI every second
         
         # Bind window events
         self.root.bind('<Configure>', lambda e: self.root.after(100, lambda: self.on_window_configure(e)))
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
 
     def _load_persistent_notifications(self):
-        """Load persistent notifications in background thread."""
-        try:
-            config_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config")
-            notification_file = os.path.join(config_dir, "notifications.json")
-            if os.path.exists(notification_file):
-                with open(notification_file, 'r') as f:
-                    stored_notifications = json.load(f)
-                    with self._ui_update_lock:
-                        self.notifications = stored_notifications
-                        self.unread_notifications = [n for n in stored_notifications if not n.get("read", False)]
-                    # Update UI in main thread
-                    self.root.after(0, self.update_notification_button)
-        except Exception as e:
-            logging.error(f"Failed to load persistent notifications: {e}")
+        """Load persistent notifications in background thread, then keep them within retention."""
+        self.notification_store.load()
+        self.notification_store.start_retention()
 
-    def update(self):
-        """Updates the GUI components or performs scheduled updates."""
-        try:
-            # Only update if window exists
-            if not self.root.winfo_exists():
-                return
-                
-            # Update notification count
-            self.update_notification_button()
-            
-            # Schedule next update
-            self.root.after(1000, self.update)
-            
-        except Exception as e:
-            logging.error(f"Error in update loop: {e}")
-            # Try to reschedule even if there was an error
-            self.root.after(1000, self.update)
+    @property
+    def notifications(self):
+        """All notifications, oldest first. Mutate through notification_store."""
+        return self.notification_store.notifications
+
+    @property
+    def unread_notifications(self):
+        """Unread notifications. Mutate through notification_store."""
+        return self.notification_store.unread_notifications
+
+    def _on_notification_event(self, event, notification):
+        """Keeps coalescing state in step with the notification store."""
+        if event == "cleared":
+            self.notification_coalescer.forget()
+
+    def _on_unread_count_changed(self, count):
+        """Pushes unread count changes to the bell button on the Tk thread."""
+        self.root.after(0, lambda: self.update_notification_button(count))
 
     def on_closing(self):
         """Handle window closing."""
@@ -542,11 +583,13 @@ class QuickLinksApp:
     def add_textbox_log_handler(self):
         """
         Adds a custom logging handler to direct log messages to the log_textbox.
+        Records are queued by the handler and drained into the textbox on the Tk thread.
         """
         if hasattr(self, 'log_textbox') and self.log_textbox:
-            handler = TextBoxHandler(self)  # Pass self instead of log_queue
-            handler.setLevel(logging.INFO)
-            logging.getLogger().addHandler(handler)
+            self.log_handler = TextBoxHandler(self)
+            self.log_handler.setLevel(logging.INFO)
+            add_handler(self.log_handler)
+            self.root.after(TextBoxHandler.DRAIN_INTERVAL_MS, self._drain_log_queue)
             logging.info("TextBoxHandler added to logger.")
         else:
             logging.warning("log_textbox not initialized. Cannot add TextBoxHandler.")
@@ -586,10 +629,28 @@ class QuickLinksApp:
             handle_midway_access_callback=self.handle_midway_access,
             open_manage_zukey_callback=self.open_manage_zukey,
             open_general_dashboard_callback=self.open_general_dashboard_window,
-            open_scanner_apw_callback=self.open_scanner_apw
+            open_scanner_apw_callback=self.open_scanner_apw,
+            workspaces=self.settings.settings.get("workspaces", {}),
+            open_workspace_callback=self.open_workspace,
+            link_hover_callback=self.warm_browser
         )
         self.button_frame.pack(fill="x", padx=20, pady=10)  # Store the reference
 
+        # Combined progress of a workspace launch; packed below the buttons while one runs
+        self.workspace_progress_frame = ctk.CTkFrame(self.content_frame, fg_color="transparent")
+        self.workspace_progress_bar = ctk.CTkProgressBar(self.workspace_progress_frame, mode="determinate")
+        self.workspace_progress_bar.pack(fill="x", padx=5, pady=(0, 5))
+        self.workspace_progress_label = ctk.CTkLabel(
+            self.workspace_progress_frame,
+            text="",
+            font=("Segoe UI", 12),
+            text_color=("gray20", "gray80"),
+            anchor="w",
+            justify="left"
+        )
+        self.workspace_progress_label.pack(fill="x", padx=5)
+        self.workspace_running = False
+
         # Create log frame
         self.log_frame = ctk.CTkFrame(
             self.main_container,
@@ -608,6 +669,11 @@ class QuickLinksApp:
             height=150
         )
         self.log_textbox.pack(fill="both", expand=True, padx=10, pady=10)
+        self.log_view = LogView(
+            self.log_textbox,
+            LOG_FILE,
+            max_lines=self.settings.settings.get("log_view_max_lines", 2000)
+        )
 
         # Configure textbox highlighting
         self.configure_textbox_highlighting()
@@ -664,27 +730,23 @@ class QuickLinksApp:
             handle_midway_access_callback=self.handle_midway_access,
             open_manage_zukey_callback=self.open_manage_zukey,
             open_general_dashboard_callback=self.open_general_dashboard_window,
-            open_scanner_apw_callback=self.open_scanner_apw
+            open_scanner_apw_callback=self.open_scanner_apw,
+            workspaces=self.settings.settings.get("workspaces", {}),
+            open_workspace_callback=self.open_workspace,
+            link_hover_callback=self.warm_browser
         )
         self.button_frame.pack(fill="x", padx=20, pady=10)  # Store the reference
+        # The new buttons start without badges; show the latest check results on them
+        if getattr(self, "link_health", None) is not None:
+            for status in self.link_health.statuses():
+                update_link_badge(self.button_frame, status)
 
     def load_logs(self):
         """
-        Loads the contents of the log file into the log textbox.
+        Loads the most recent lines of the log file into the log textbox.
+        Older lines are paged in when the user scrolls to the top.
         """
-        try:
-            with open('link_opener.log', 'r') as log_file:
-                content = log_file.read()
-            self.log_textbox.configure(state="normal")
-            self.log_textbox.delete("0.0", "end")
-            self.log_textbox.insert("0.0", content)
-            self.log_textbox.configure(state="disabled")
-        except Exception as e:
-            logging.exception("Failed to load log file.")
-            self.log_textbox.configure(state="normal")
-            self.log_textbox.delete("0.0", "end")
-            self.log_textbox.insert("0.0", f"Failed to load log file.\nError: {e}")
-            self.log_textbox.configure(state="disabled")
+        self.log_view.load_tail()
 
     def toggle_pin_visibility(self):
         self.pin_visible = toggle_pin_visibility(
@@ -701,53 +763,104 @@ class QuickLinksApp:
                 show_vpn_warning()
                 return
             
-            threading.Thread(target=self.open_link_thread, args=(url, name), daemon=True).start()
+            self.async_runner.submit(
+                self.async_open_link(url, name),
+                on_done=lambda future: self._report_link_result(future, url, name)
+            )
         except Exception as e:
             logging.error(f"Error opening link {name}: {e}", exc_info=True)
 
-    def open_link_thread(self, url, name):
-        try:
-            loop = asyncio.new_event_loop()      # Create a new event loop
-            asyncio.set_event_loop(loop)         # Set it as the current event loop in this thread
-            loop.run_until_complete(self.async_open_link(url, name))
-        except Exception as e:
-            logging.exception(f"Failed to open URL with Playwright: {name} - {url}")
-            self.root.after(0, lambda e=e: self.update_notification(f"Failed to open {name}.\nError: {e}", "red"))  # Added error message
+    def warm_browser(self):
+        """Launches the pooled browser when the pointer moves onto a link, if prewarming is enabled."""
+        if self.settings.settings.get("browser_prewarm", True):
+            self.browser_pool.warm()
+
+    def _report_link_result(self, future, url, name):
+        """Shows an error notification if opening a link failed. Runs on the Tk thread."""
+        if future.cancelled():
+            return
+        e = future.exception()
+        if e is not None:
+            logging.error(f"Failed to open URL with Playwright: {name} - {url}: {e}")
+            self.update_notification(f"Failed to open {name}.\nError: {e}", "red")
 
-    async def setup_playwright(self, channel="chrome", headless=False, args=None):
+    def open_workspace(self, name):
+        """
+        Opens all links of a workspace preset as tabs, loading them concurrently.
+        Progress is shown per tab below the buttons.
         """
-        Sets up Playwright with a new browser, context, and page.
+        if self.workspace_running:
+            logging.info(f"A workspace is already opening; ignoring {name!r}")
+            return
+        names = self.settings.settings.get("workspaces", {}).get(name, [])
+        logging.info(f"Opening workspace {name!r}: {', '.join(names)}")
+        if not self.check_vpn_connection():
+            logging.warning("VPN connection not detected")
+            show_vpn_warning()
+            return
 
-        Args:
-            channel (str): The browser channel to use.
-            headless (bool): Whether to run the browser in headless mode.
-            args (list): Additional arguments for browser launch.
+        self.workspace_running = True
+        self.workspace_progress_bar.set(0)
+        self.workspace_progress_label.configure(text=f"Opening {name}...")
+        self.workspace_progress_frame.pack(fill="x", padx=20, pady=(0, 10), after=self.button_frame)
+        tab_lines = []
+
+        def on_progress(tab, finished, total):
+            # Runs on the loop thread; hand the widget update to Tk
+            line = f"{'✓' if tab.ok else '✗'} {tab}"
+            self.root.after(0, lambda: self._update_workspace_progress(name, tab_lines, line, finished, total))
+
+        self.async_runner.submit(
+            open_workspace(
+                self.browser_pool, name, names,
+                concurrency=self.settings.settings.get("workspace_concurrency", DEFAULT_CONCURRENCY),
+                on_progress=on_progress
+            ),
+            on_done=lambda future: self._on_workspace_done(future, name)
+        )
 
-        Returns:
-            tuple: (page, context, browser, playwright)
-        """
-        try:
-            playwright = await async_playwright().start()
-            browser = await playwright.chromium.launch(channel=channel, headless=headless, args=args or [])
-            context = await browser.new_context()
-            page = await context.new_page()
-            return page, context, browser, playwright
-        except Exception as e:
-            logging.exception("Failed to setup Playwright.")
-            raise
+    def _update_workspace_progress(self, name, tab_lines, line, finished, total):
+        """Shows one finished tab of a workspace. Runs on the Tk thread."""
+        tab_lines.append(line)
+        self.workspace_progress_bar.set(finished / total)
+        self.workspace_progress_label.configure(text=f"{name}: {finished}/{total}\n" + "\n".join(tab_lines))
+
+    def _on_workspace_done(self, future, name):
+        """Reports the outcome of a workspace launch. Runs on the Tk thread."""
+        self.workspace_running = False
+        self.root.after(5000, self._hide_workspace_progress)
+        if future.cancelled():
+            return
+        e = future.exception()
+        if e is not None:
+            logging.error(f"Failed to open workspace {name!r}: {e}")
+            self.workspace_progress_label.configure(text=f"{name}: failed ({e})")
+            self.update_notification(f"Failed to open workspace {name}.\nError: {e}", "red")
+            return
+        failed = [tab.name for tab in future.result() if not tab.ok]
+        if failed:
+            self.update_notification(f"Workspace {name}: failed to open {', '.join(failed)}", "red")
+
+    def _hide_workspace_progress(self):
+        if not self.workspace_running:
+            self.workspace_progress_frame.pack_forget()
 
-    async def navigate_to_page(self, page, url, timeout=60000):
+    async def navigate_to_page(self, page, url, timeout=60000, name=None):
         """
-        Navigates the Playwright page to the specified URL.
+        Navigates the Playwright page to the specified URL and records its navigation timing.
+        The timing is read in the background after this returns, so callers must not navigate
+        or close the page straight away; automation flows await record_navigation instead.
 
         Args:
             page (Page): The Playwright Page object.
             url (str): The URL to navigate to.
             timeout (int): The timeout for page navigation in milliseconds.
+            name (str): Link name the timing is stored under; looked up from LINKS if not given.
         """
         try:
             await page.goto(url, timeout=timeout)
             logging.info(f"Successfully navigated to {url}.")
+            record_navigation_soon(page, name, url)
         except PlaywrightTimeoutError:
             logging.error(f"Timeout while navigating to {url}.")
             raise
@@ -756,23 +869,16 @@ class QuickLinksApp:
             raise
 
     async def async_open_link(self, url, name):
-        try:
-            # Check VPN connection before proceeding
-            if "corp.amazon.com" in url and not self.check_vpn_connection():
-                logging.error("VPN is not connected. Cannot access internal URLs.")
-                self.update_notification(
-                    "VPN Connection Error",
-                    "Please connect to the corporate VPN before running this script."
-                )
-                return
-            
-            page, context, browser, playwright = await self.setup_playwright(args=["--start-maximized"])
-            await self.navigate_to_page(page, url)
-            logging.info(f"Opened URL with Playwright: {name} - {url}")
-            page_title = await page.title()
-            logging.info(f"Page Title for {name}: {page_title}")
-        finally:
-            await close_resources(page, context, browser, playwright)
+        """
+        Opens a link as a new tab of the pooled browser. Runs on the async runner's loop;
+        the VPN check has already been done by open_link.
+        """
+        page = await self.browser_pool.new_page()
+        await self.navigate_to_page(page, url, name=name)
+        await self.browser_pool.sync_session(page)
+        logging.info(f"Opened URL with Playwright: {name} - {url}")
+        page_title = await page.title()
+        logging.info(f"Page Title for {name}: {page_title}")
 
     def create_notification_label(self):
         """
@@ -801,7 +907,8 @@ class QuickLinksApp:
                     
                     # Only process changes if the keys have changed
                     if current_keys != last_keys:
-                        logging.info(f"Security keys changed. Current keys: {current_keys}")
+                        logging.info(f"Security keys changed. Current keys: {current_keys}",
+                                     extra={"event": "security_key.changed"})
                         self.security_keys = current_keys
                         self.root.after(0, lambda: self.update_security_keys_list(current_keys))
                         
@@ -863,20 +970,25 @@ class QuickLinksApp:
 
     def notify_key_event(self, key, event_type):
         """
-        Shows a system notification for security key events.
+        Queues a system notification for security key events.
+        Delivery happens on the notification dispatcher thread, so key monitoring never waits on a toast.
         """
         try:
             title = "Security Key Event"
             message = f"Security key {event_type}: {key}"
             
-            notification.notify(
+            if not self.notification_coalescer.allow_toast(f"security_key:{event_type}"):
+                logging.debug(f"Security key notification rate-limited: {message}")
+                return
+            
+            get_notification_manager().show_notification(
                 title=title,
                 message=message,
-                app_name="QuickLinks",
                 app_icon=None,  # You can add an icon path here
                 timeout=5,
+                app_name="QuickLinks"
             )
-            logging.info(f"Security key notification sent: {message}")
+            logging.info(f"Security key notification queued: {message}")
         except Exception as e:
             logging.error(f"Failed to show notification: {e}")
 
@@ -894,6 +1006,24 @@ class QuickLinksApp:
             with open(os.path.join(os.path.dirname(__file__), "window_state.json"), 'w') as f:
                 json.dump(state, f)
             
+            # Report how much notification noise was suppressed this session
+            self.notification_coalescer.log_stats()
+            toast_metrics = stop_notification_manager()
+            if toast_metrics is not None:
+                logging.info(f"Toast dispatch metrics: {toast_metrics}")
+            logging.info(f"Log flood filter: {get_flood_stats()}")
+            
+            self.notification_store.stop_retention()
+            self.notification_store.flush()
+            if self.link_health is not None:
+                self.link_health.stop()
+            self.browser_pool.stop()
+            self.async_runner.stop()
+            
+            # Stop feeding the log textbox before the window goes away
+            if hasattr(self, 'log_handler'):
+                remove_handler(self.log_handler)
+            
             # Stop monitoring thread
             self.monitoring = False
             if hasattr(self, 'monitor_thread'):
@@ -922,68 +1052,56 @@ class QuickLinksApp:
         """
         Handles the MIDWAY ACCESS button click.
         """
-        # Start the automation directly
-        threading.Thread(target=self.run_midway_automation, daemon=True).start()
+        self.start_loading()
+        self.async_runner.submit(self.midway_automation(), on_done=self._on_midway_automation_done)
 
-    def run_midway_automation(self):
+    def _on_midway_automation_done(self, future):
         """
-        Runs the MIDWAY ACCESS automation.
+        Shows the outcome of the MIDWAY ACCESS automation. Runs on the Tk thread.
         """
+        self.stop_loading()
+        if future.cancelled():
+            return
         try:
-            self.start_loading()
-            asyncio.run(self.midway_automation())
+            text, color, clear_later = future.result()
         except Exception as e:
-            logging.exception("An error occurred during MIDWAY ACCESS automation.")
-            error_message = f"Automation failed: {str(e)}"
-            self.show_failure_status(error_message)
-        finally:
-            self.stop_loading()
+            logging.error(f"An error occurred during MIDWAY ACCESS automation: {e}", exc_info=e)
+            self.show_failure_status(f"Automation failed: {str(e)}")
+            return
+        
+        self.midway_status_label.configure(text=text, text_color=color)
+        if clear_later:
+            # Schedule the label to be cleared after 5 seconds
+            self.root.after(5000, self.clear_failure_status_label)
 
     async def midway_automation(self):
         """
-        Automates accessing MIDWAY ACCESS.
+        Automates accessing MIDWAY ACCESS. Runs on the async runner's loop and leaves
+        widget updates to the Tk-side completion callback.
+
+        Returns:
+            tuple: (status text, text color, whether to clear the status after a delay)
         """
-        # Check VPN connection before proceeding
-        if not self.check_vpn_connection():
-            self.midway_status_label.configure(
-                text="Error: Please connect to the corporate VPN.",
-                text_color="red"
-            )
+        # Check VPN connection before proceeding; the DNS lookup blocks, so keep it off the loop
+        vpn_connected = await asyncio.get_running_loop().run_in_executor(None, self.check_vpn_connection)
+        if not vpn_connected:
             logging.error("VPN is not connected. Cannot access MIDWAY ACCESS.")
-            return
+            return "Error: Please connect to the corporate VPN.", "red", False
             
         url = LINKS["MIDWAY ACCESS"]
         try:
-            page, context, browser, playwright = await open_page(url)
-        
-            # Update the success label
-            self.midway_status_label.configure(
-                text="Successfully opened MIDWAY ACCESS.",
-                text_color="green"
-            )
-            # Schedule the label to be cleared after 5 seconds
-            self.root.after(5000, self.clear_failure_status_label)
+            page = await self.browser_pool.open_page(url)
+            if await self.browser_pool.sync_session(page):
+                return "Already signed in to MIDWAY ACCESS.", "green", True
+            return "Successfully opened MIDWAY ACCESS.", "green", True
         except PlaywrightTimeoutError:
             logging.exception("Timeout occurred during MIDWAY ACCESS automation.")
-            self.midway_status_label.configure(
-                text="Timeout occurred while opening MIDWAY ACCESS.",
-                text_color="red"
-            )
-            # Schedule the label to be cleared after 5 seconds
-            self.root.after(5000, self.clear_failure_status_label)
+            return "Timeout occurred while opening MIDWAY ACCESS.", "red", True
         except Exception as e:
-            if "ERR_NAME_NOT_RESOLVED" in str(e):
-                self.midway_status_label.configure(
-                    text="Error: Unable to resolve the domain. Please check your VPN connection.",
-                    text_color="red"
-                )
-            else:
-                self.midway_status_label.configure(
-                    text=f"Automation Error: {e}",
-                    text_color="red"
-                )
             logging.exception("Failed to complete MIDWAY ACCESS automation.")
-            self.root.after(5000, self.clear_failure_status_label)
+            if "ERR_NAME_NOT_RESOLVED" in str(e):
+                return "Error: Unable to resolve the domain. Please check your VPN connection.", "red", True
+            return f"Automation Error: {e}", "red", True
 
     def start_loading(self):
         """
@@ -1268,26 +1386,52 @@ class QuickLinksApp:
 
     def configure_textbox_highlighting(self):
         """
-        Configures highlighting for specific keywords in the log textbox.
+        Configures the log highlight rules from settings and their tags in the log textbox.
         """
+        self.log_highlighter = LogHighlighter(self.settings.settings.get("log_highlight_rules"))
         if hasattr(self, 'log_textbox') and self.log_textbox:
-            self.log_textbox.tag_config("highlight", foreground="green")
+            self.log_highlighter.configure_tags(self.log_textbox)
         else:
             logging.warning("log_textbox not initialized. Cannot configure highlighting.")
 
-    def update_logs_in_main_thread(self, log_entry):
+    def _drain_log_queue(self):
+        """
+        Moves queued log records into the log textbox. Runs on the Tk thread via after().
+        Reschedules itself immediately while a backlog remains, otherwise on the regular interval.
+        Also pages in older history when the log view has been scrolled to the top, and newer
+        history when a view scrolled back that way returns to the bottom.
+        """
+        entries, dropped = self.log_handler.drain(TextBoxHandler.MAX_BATCH)
+        if entries or dropped:
+            self.update_logs_in_main_thread(entries, dropped)
+        try:
+            self.log_view.page_older() or self.log_view.page_newer()
+        except Exception as e:
+            logging.error(f"Failed to page log history: {e}")
+        delay = 1 if self.log_handler.has_pending() else TextBoxHandler.DRAIN_INTERVAL_MS
+        self.root.after(delay, self._drain_log_queue)
+
+    def update_logs_in_main_thread(self, log_entries, dropped=0):
         """
-        Appends a log entry to the log textbox directly in the main thread.
+        Appends a batch of log entries to the log textbox. Must be called on the Tk thread.
+        The widget state is toggled and the view scrolled once per batch; the view keeps
+        the textbox within its line cap. Highlight tags are assigned here, once per line.
+
+        Args:
+            log_entries (list): (level name, formatted line, log file offset) entries, oldest first
+            dropped (int): Entries discarded because the queue overflowed before this batch
         """
         if hasattr(self, 'log_textbox') and self.log_textbox:
             try:
-                self.log_textbox.configure(state="normal")
-                if "Detected keys" in log_entry:
-                    self.log_textbox.insert("end", log_entry + "\n", "highlight")
-                else:
-                    self.log_textbox.insert("end", log_entry + "\n")
-                self.log_textbox.configure(state="disabled")
-                self.log_textbox.see("end")  # Auto-scroll to the latest log
+                # Consecutive lines with the same tag go in with a single insert
+                runs = []
+                if dropped:
+                    runs.append((f"... {dropped} log lines dropped during a burst ...\n", None))
+                runs.extend(self.log_highlighter.runs((level, line) for level, line, _ in log_entries))
+                offsets = [offset for _, _, offset in log_entries]
+                # Offsets that go backwards mean the file rotated within the batch
+                in_order = offsets and None not in offsets and offsets == sorted(offsets)
+                self.log_view.append(runs, offsets[0] if in_order else None)
             except Exception as e:
                 print(f"Error updating logs in main thread: {e}")
         else:
@@ -1457,12 +1601,12 @@ class QuickLinksApp:
         except Exception as e:
             logging.error(f"Error toggling notification popover: {e}")
 
-    def update_notification_button(self):
+    def update_notification_button(self, unread_count=None):
         """Updates the notification button text with unread count."""
         try:
-            unread_count = len(self.unread_notifications)
+            if unread_count is None:
+                unread_count = self.notification_store.unread_count
             self.notification_button.configure(text=f"🔔 {unread_count}")
-            self.notification_button.update()
             
         except Exception as e:
             logging.error(f"Error updating notification button: {e}")
@@ -1470,9 +1614,7 @@ class QuickLinksApp:
     def clear_notifications(self):
         """Clears all notifications and updates the display."""
         try:
-            self.notifications.clear()
-            self.unread_notifications.clear()
-            self.update_notification_button()
+            self.notification_store.clear()
             self.toggle_notification_popover()
         except Exception as e:
             logging.error(f"Error clearing notifications: {e}")
@@ -1480,33 +1622,19 @@ class QuickLinksApp:
     def add_notification(self, message, level="info"):
         """Add a notification to the list and persist it."""
         try:
-            notification = {
-                "message": message,
-                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "level": level,
-                "read": False
-            }
-            
-            self.notifications.append(notification)
+            notification = NotificationRecord(message, level)
             
-            if not notification["read"]:
-                self.unread_notifications.append(notification)
+            # Repeats within the coalescing window fold into the existing entry
+            merged = self.notification_coalescer.coalesce(notification)
+            is_new = merged is notification
             
-            try:
-                config_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config")
-                notification_file = os.path.join(config_dir, "notifications.json")
-                os.makedirs(config_dir, exist_ok=True)
-                with open(notification_file, 'w') as f:
-                    json.dump(self.notifications, f)
-            except Exception as e:
-                logging.error(f"Failed to save notification to file: {e}")
-            
-            if hasattr(self, 'notification_ui') and self.notification_ui and self.notification_ui.visible:
-                self.notification_ui.update_notifications()
-                
-            self.update_notification_button()
-                
-            logging.info(f"Added notification: {message}")
+            # The store persists the change and pushes it to the popover and bell button
+            if is_new:
+                self.notification_store.add(notification)
+                logging.info(f"Added notification: {message}")
+            else:
+                self.notification_store.touch(merged)
+                logging.debug(f"Coalesced repeated notification (x{merged.count}): {message}")
         except Exception as e:
             logging.error(f"Failed to add notification: {e}")
 
@@ -1520,8 +1648,8 @@ class QuickLinksApp:
                     widget.destroy()
                 
                 for notification in reversed(self.notifications[-10:]):
-                    color = "#FFE4E1" if notification["level"] == "warning" else "#E8F5E9"
-                    msg = f"{notification['timestamp']}: {notification['message']}"
+                    color = "#FFE4E1" if notification.level is NotificationLevel.WARNING else "#E8F5E9"
+                    msg = f"{notification.format_time()}: {notification.message}"
                     
                     label = ctk.CTkLabel(
                         self.notification_frame,
@@ -1621,6 +1749,15 @@ class QuickLinksApp:
         dialog = self.show_dialog(SettingsDialog)
         dialog.show_dialog()
 
+    def open_link_performance(self):
+        """Opens the per-link page load statistics."""
+        store = get_timing_store()
+        if store is None:
+            self.show_error("Link Performance", "Page load timing is disabled in settings.")
+            return
+        window = LinkTimingWindow(self.root, store)
+        window.window.attributes('-topmost', self.always_on_top)
+
     def connect_vpn(self):
         """Open the Cisco VPN window"""
         try:
@@ -1692,6 +1829,7 @@ class QuickLinksApp:
                     result = retry(get_code, 3)
                     
                     if "reported" in result:
+                        logging.info(f"Retrieved scanner code for {serial_number} from {region.value}")
                         code = result["reported"]
                         if "desired" in result and result["reported"] != result["desired"]:
                             code = f"Current: {result['reported']}, Upcoming: {result['desired']}"
@@ -1886,15 +2024,50 @@ def parse_sn(sn):
 
 class TextBoxHandler(logging.Handler):
     """
-    Custom logging handler that writes log records to a textbox.
+    Custom logging handler that queues log records for the log textbox.
+    emit() runs on whichever thread logged, so it only formats and enqueues; the app
+    drains the queue into the widget on the Tk thread (QuickLinksApp._drain_log_queue).
     """
+    DRAIN_INTERVAL_MS = 100   # Drain period when the queue is idle
+    MAX_BATCH = 500           # Most lines inserted per drain
+    MAX_PENDING = 10000       # Oldest lines are dropped beyond this during a log storm
+
     def __init__(self, app):
         super().__init__()
         self.app = app
+        self._pending = deque(maxlen=self.MAX_PENDING)
+        self._dropped = 0
 
     def emit(self, record):
-        log_entry = self.format(record)
-        self.app.update_logs_in_main_thread(log_entry)
+        # Handler.handle() holds self.lock here, so the overflow count is consistent
+        try:
+            if len(self._pending) == self.MAX_PENDING:
+                self._dropped += 1
+            # The file handler ahead of this one records where the line went in the log file
+            self._pending.append((record.levelname, self.format(record), getattr(record, "log_offset", None)))
+        except Exception:
+            self.handleError(record)
+
+    def has_pending(self):
+        return bool(self._pending)
+
+    def drain(self, max_items):
+        """
+        Removes up to max_items queued entries.
+
+        Returns:
+            tuple: ((level name, line, log file offset or None) entries oldest first,
+                    number of entries dropped since the last drain)
+        """
+        self.acquire()
+        try:
+            entries = []
+            while self._pending and len(entries) < max_items:
+                entries.append(self._pending.popleft())
+            dropped, self._dropped = self._dropped, 0
+        finally:
+            self.release()
+        return entries, dropped
 
 def check_dependencies():
     """
@@ -1,11 +1,6 @@
-import logging
+from logging_config import configure_logging
+
 
 def setup_logging():
-    logging.basicConfig(
-        level=logging.DEBUG,  # Capture all debug messages
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler('link_opener.log'),
-            logging.StreamHandler()  # Output logs to the terminal
-        ]
-    ) 
\ No newline at end of file
+    """Configures application logging; see logging_config.configure_logging."""
+    return configure_logging()
@@ -0,0 +1,122 @@
+"""
+The application's single asyncio event loop.
+One background thread runs the loop for all async work (Playwright automation in
+particular). Other threads submit coroutines and get concurrent.futures.Future objects
+back, optionally with a completion callback delivered on the Tk thread.
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+import threading
+from typing import Callable, Coroutine, Optional
+
+UiDispatcher = Callable[[Callable[[], None]], None]
+
+
+class AsyncRunner:
+    """Runs one event loop on a daemon thread, started on first use."""
+
+    STOP_TIMEOUT_SECONDS = 5.0
+
+    def __init__(self, name: str = "AsyncLoop"):
+        """
+        Args:
+            name: Name of the loop thread
+        """
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._lock = threading.Lock()
+        self._ui_dispatcher: Optional[UiDispatcher] = None
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return self._loop
+
+    def in_loop_thread(self) -> bool:
+        """True if called from the loop thread itself."""
+        return threading.current_thread() is self._thread
+
+    def set_ui_dispatcher(self, dispatcher: UiDispatcher) -> None:
+        """
+        Sets how completion callbacks reach the UI thread.
+
+        Args:
+            dispatcher: Schedules a no-argument callable on the UI thread, e.g. lambda fn: root.after(0, fn)
+        """
+        self._ui_dispatcher = dispatcher
+
+    def submit(self, coro: Coroutine,
+               on_done: Optional[Callable[[concurrent.futures.Future], None]] = None) -> concurrent.futures.Future:
+        """
+        Schedules a coroutine on the loop; safe to call from any thread.
+
+        Args:
+            coro: Coroutine to run
+            on_done: Called with the finished future on the UI thread, or on the loop
+                thread if no UI dispatcher is set
+
+        Returns:
+            concurrent.futures.Future: Resolves to the coroutine's result
+        """
+        with self._lock:
+            if not self._thread.is_alive():
+                self._thread.start()
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        if on_done is not None:
+            future.add_done_callback(lambda f: self._deliver(on_done, f))
+        return future
+
+    def stop(self) -> None:
+        """Cancels outstanding tasks, stops the loop and waits for the thread to finish."""
+        if not self._thread.is_alive():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._cancel_tasks(), self._loop).result(self.STOP_TIMEOUT_SECONDS)
+        except Exception as e:
+            logging.warning(f"Async tasks did not cancel cleanly: {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(self.STOP_TIMEOUT_SECONDS)
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+        self._loop.close()
+
+    def _deliver(self, on_done: Callable[[concurrent.futures.Future], None],
+                 future: concurrent.futures.Future) -> None:
+        def call():
+            try:
+                on_done(future)
+            except Exception:
+                logging.exception("Error in async completion callback")
+
+        if self._ui_dispatcher is None:
+            call()
+            return
+        try:
+            self._ui_dispatcher(call)
+        except Exception as e:
+            # The UI may already be gone during shutdown
+            logging.debug(f"Could not deliver async completion to the UI: {e}")
+
+    @staticmethod
+    async def _cancel_tasks() -> None:
+        current = asyncio.current_task()
+        tasks = [task for task in asyncio.all_tasks() if task is not current]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+_runner: Optional[AsyncRunner] = None
+_runner_lock = threading.Lock()
+
+
+def get_async_runner() -> AsyncRunner:
+    """Returns the process-wide AsyncRunner, creating it on first use."""
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = AsyncRunner()
+        return _runner
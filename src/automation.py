@@ -2,35 +2,26 @@ import asyncio
 import logging
 import os
 import datetime
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from browser_pool import get_browser_pool
+from nav_timing import record_navigation
+from route_profiles import finish_flow, start_flow
 from constants import LINKS
 import pywinauto
 import time
 import threading
 
+# These coroutines run on the shared AsyncRunner loop (get_async_runner().submit(...)) and
+# borrow tabs and contexts from the shared browser pool instead of launching Playwright.
+
 async def async_open_link(url, name):
     try:
-        playwright = await async_playwright().start()
-        browser = await playwright.chromium.launch(
-            channel="chrome",
-            headless=False,
-            args=["--start-maximized"]
-        )
-
-        context = await browser.new_context()
-        page = await context.new_page()
-        await page.goto(url, timeout=60000)
+        page = await get_browser_pool().open_page(url, timeout=60000)
         logging.info(f"Opened URL with Playwright: {name} - {url}")
 
         page_title = await page.title()
         logging.info(f"Page Title for {name}: {page_title}")
 
-        await browser.close()
-
-        await page.close()
-        await context.close()
-        await playwright.stop()
-
     except PlaywrightTimeoutError:
         logging.exception(f"Timeout while loading the page: {name} - {url}")
     except Exception as e:
@@ -46,39 +37,48 @@ async def async_open_midway_access(username, pin, testing_mode=False, timeout=60
         testing_mode (bool): Enable testing mode for detailed logs and screenshots.
         timeout (int): Timeout for page navigation in milliseconds.
     """
+    context = flow_run = None
     try:
         log_debug_step(1, "Setting up Playwright.")
-        playwright, browser, context, page = await setup_playwright()
+        context, page = await setup_playwright()
+        flow_run = await start_flow("MIDWAY ACCESS", context)
         
         log_debug_step(2, f"Navigating to MIDWAY ACCESS URL: {LINKS['MIDWAY ACCESS']} with timeout={timeout}ms")
         await page.goto(LINKS["MIDWAY ACCESS"], timeout=timeout)
+        await record_navigation(page, "MIDWAY ACCESS")
         logging.info("Opened MIDWAY ACCESS URL.")
         if testing_mode:
             await capture_screenshot(page, "midway_access_open.png", "Opened MIDWAY ACCESS URL")
 
-        log_debug_step(3, "Filling in username and PIN.")
-        await page.fill('#user_name', username)
-        await page.fill('#password', pin)
-        if testing_mode:
-            await capture_screenshot(page, "midway_access_filled_form.png", "Filled login form")
-
-        log_debug_step(4, "Submitting the login form.")
-        await page.click('#verify_btn')
-        await page.wait_for_load_state('networkidle', timeout=15000)
-        logging.info("Submitted login form.")
-        if testing_mode:
-            await capture_screenshot(page, "midway_access_submit.png", "Submitted login form")
+        pool = get_browser_pool()
+        if await pool.sync_session(page):
+            # The context started from a saved sign-in that is still valid
+            logging.info("MIDWAY ACCESS session restored; skipping login.")
+        else:
+            log_debug_step(3, "Filling in username and PIN.")
+            await page.fill('#user_name', username)
+            await page.fill('#password', pin)
+            if testing_mode:
+                await capture_screenshot(page, "midway_access_filled_form.png", "Filled login form")
+
+            log_debug_step(4, "Submitting the login form.")
+            await page.click('#verify_btn')
+            await page.wait_for_load_state('networkidle', timeout=15000)
+            logging.info("Submitted login form.")
+            if testing_mode:
+                await capture_screenshot(page, "midway_access_submit.png", "Submitted login form")
+            await pool.sync_session(page)
 
         log_debug_step(5, "Retrieving page title after login.")
         page_title = await page.title()
         logging.info(f"Page Title after login: {page_title}")
-
-        await browser.close()
-        await playwright.stop()
     except PlaywrightTimeoutError as te:
         log_error("MIDWAY ACCESS automation", te, LINKS["MIDWAY ACCESS"])
     except Exception as e:
         log_error("MIDWAY ACCESS automation", e, LINKS["MIDWAY ACCESS"])
+    finally:
+        await finish_flow(flow_run)
+        await teardown_playwright(context)
 
 async def async_open_reports_page(testing_mode=False, timeout=60000):
     """
@@ -88,23 +88,26 @@ async def async_open_reports_page(testing_mode=False, timeout=60000):
         testing_mode (bool): Enable testing mode for detailed logs and screenshots.
         timeout (int): Timeout for page navigation in milliseconds.
     """
+    context = flow_run = None
     try:
         log_debug_step(1, "Setting up Playwright.")
-        playwright, browser, context, page = await setup_playwright()
+        context, page = await setup_playwright()
+        flow_run = await start_flow("REPORTS", context)
         
         log_debug_step(2, f"Navigating to REPORTS URL: {LINKS['REPORTS']} with timeout={timeout}ms")
         await page.goto(LINKS["REPORTS"], timeout=timeout)
+        await record_navigation(page, "REPORTS")
         logging.info("Opened REPORTS page with Playwright.")
 
         if testing_mode:
             await capture_screenshot(page, "reports_page_open.png", "Opened REPORTS page")
-
-        await browser.close()
-        await playwright.stop()
     except PlaywrightTimeoutError as te:
         log_error("REPORTS page automation", te, LINKS["REPORTS"])
     except Exception as e:
         log_error("REPORTS page automation", e, LINKS["REPORTS"])
+    finally:
+        await finish_flow(flow_run)
+        await teardown_playwright(context)
 
 async def capture_screenshot(page, filename, description):
     """
@@ -123,31 +126,32 @@ async def capture_screenshot(page, filename, description):
     except Exception as e:
         logging.exception(f"Failed to capture screenshot: {e}")
 
-async def setup_playwright(channel="chrome", headless=False):
+async def setup_playwright():
     """
-    Sets up Playwright browser, context, and page instances.
-
-    Args:
-        channel (str): Browser channel to use (default: Chrome).
-        headless (bool): Whether to run the browser in headless mode.
+    Takes an isolated context from the shared browser pool and opens a page in it.
 
     Returns:
-        tuple: (playwright, browser, context, page)
+        tuple: (context, page); pass the context to teardown_playwright when done
     """
     try:
-        playwright = await async_playwright().start()
-        browser = await playwright.chromium.launch(
-            channel=channel,
-            headless=headless,
-            args=["--start-maximized"]
-        )
-        context = await browser.new_context()
+        pool = get_browser_pool()
+        context = await pool.acquire_context()
         page = await context.new_page()
-        return playwright, browser, context, page
+        return context, page
     except Exception as e:
         logging.exception("Failed to setup Playwright.")
         raise
 
+async def teardown_playwright(context):
+    """
+    Closes a context obtained from setup_playwright. The shared browser stays running.
+
+    Args:
+        context: Playwright BrowserContext, or None if setup failed.
+    """
+    if context is not None:
+        await get_browser_pool().release_context(context)
+
 def create_debug_folder():
     """
     Creates a timestamped folder for debug output.
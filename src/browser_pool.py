@@ -0,0 +1,360 @@
+"""
+Long-lived Playwright browser shared by link clicks and automation flows.
+The Playwright driver is started in the background after the window has painted. The
+browser is launched once, when the pointer first moves onto a link button or on first use,
+not at startup, since a headed browser opens a window of its own. It is then kept warm
+with a ready context and spare contexts (and, when headless, spare tabs), so opening a link
+is a new tab rather than a new Chrome process. A headed browser keeps no spare tab: a blank
+tab would show a window before the user has opened anything. A periodic health check replaces a browser that stopped responding, and a
+browser that crashed or was closed is relaunched on the next request.
+
+The pool runs on the application's AsyncRunner loop, so every Playwright call in the app
+shares one loop and one driver connection.
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Coroutine, List, Optional
+
+from playwright.async_api import async_playwright
+
+from async_runner import AsyncRunner, get_async_runner
+from browser_session import LOGIN_FORM_SELECTOR, BrowserSessionStore
+from nav_timing import record_navigation_soon
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "browser")
+
+
+class BrowserPool:
+    """
+    Owns one Playwright driver and one browser on the AsyncRunner loop.
+
+    All Playwright objects live on that loop. Coroutines running there call new_page(),
+    open_page() and acquire_context() directly; other threads use submit() or open_url(),
+    which return concurrent.futures.Future objects.
+
+    - Links open as tabs of one shared default context, taking a pre-created spare tab.
+    - Automation flows that need isolation take a pre-created context with acquire_context().
+    - Spares are replenished in the background after each use.
+    - With a session store, every context starts from the saved sign-in state, and
+      sync_session() keeps that state current.
+    """
+
+    HEALTH_INTERVAL_SECONDS = 15
+    PROBE_TIMEOUT_SECONDS = 5
+    CLOSE_TIMEOUT_SECONDS = 5
+    SESSION_SAVE_INTERVAL_SECONDS = 300
+
+    def __init__(self, channel: str = "chrome", headless: bool = False, args: Optional[List[str]] = None,
+                 spare_pages: int = 1, spare_contexts: int = 1, runner: Optional[AsyncRunner] = None,
+                 session_store: Optional[BrowserSessionStore] = None, cache_dir: Optional[str] = None,
+                 cache_size_mb: int = 256):
+        """
+        Args:
+            channel: Browser channel to launch
+            headless: Whether to run the browser headless
+            args: Extra browser command-line arguments
+            spare_pages: Blank tabs kept ready in the default context; only used when headless
+            spare_contexts: Isolated contexts kept ready for automation flows
+            runner: Loop to run on; defaults to the shared AsyncRunner
+            session_store: Saved sign-in state to start contexts from; None disables it
+            cache_dir: Directory for the browser's HTTP disk cache, kept across runs; None uses
+                a throwaway cache in the temporary profile
+            cache_size_mb: Size limit of the disk cache
+        """
+        self.channel = channel
+        self.headless = headless
+        self.args = ["--start-maximized"] if args is None else list(args)
+        if cache_dir is not None:
+            # launch() uses a fresh temporary profile each time; pointing its cache elsewhere keeps it
+            os.makedirs(cache_dir, exist_ok=True)
+            self.args += [f"--disk-cache-dir={cache_dir}", f"--disk-cache-size={cache_size_mb * 1024 * 1024}"]
+        # A headed browser with no tabs shows no window; a spare tab would open one
+        self.spare_page_count = spare_pages if headless else 0
+        self.spare_context_count = spare_contexts
+        self.launch_count = 0
+        self.session_store = session_store if session_store is not None and session_store.available else None
+
+        self.runner = runner or get_async_runner()
+        self._started = False
+        self._health_task: Optional[asyncio.Task] = None
+        self._replenish_task: Optional[asyncio.Task] = None
+        self._launch_lock: Optional[asyncio.Lock] = None   # Created on the loop
+        self._warming = False
+
+        self._playwright = None
+        self._browser = None
+        self._context = None
+        self._spare_pages = deque()
+        self._spare_contexts = deque()
+
+    def start(self) -> concurrent.futures.Future:
+        """Starts the Playwright driver and the health checks in the background, without opening a browser window."""
+        self._started = True
+        return self.submit(self._start())
+
+    def warm(self) -> None:
+        """
+        Launches the browser in the background ahead of a likely request, e.g. when the pointer
+        enters a link button. Safe to call from any thread and often; does nothing once the
+        browser is up or launching.
+        """
+        browser = self._browser
+        if self._warming or (browser is not None and browser.is_connected()):
+            return
+        self._started = True
+        self._warming = True
+        future = self.submit(self._ensure_browser())
+        future.add_done_callback(lambda _: setattr(self, "_warming", False))
+
+    def submit(self, coro: Coroutine) -> concurrent.futures.Future:
+        """Runs a coroutine on the pool's loop; safe to call from any thread."""
+        return self.runner.submit(coro)
+
+    def open_url(self, url: str, timeout: int = 60000) -> concurrent.futures.Future:
+        """Opens a URL in a new tab from any thread; the future resolves to the Page."""
+        return self.submit(self.open_page(url, timeout))
+
+    def stop(self) -> None:
+        """Closes the browser and the driver. Must not be called from the loop thread."""
+        if not self._started:
+            return
+        try:
+            self.submit(self._shutdown()).result(timeout=self.CLOSE_TIMEOUT_SECONDS * 2)
+        except Exception as e:
+            logging.warning(f"Browser pool did not shut down cleanly: {e}")
+
+    async def new_page(self):
+        """Returns a tab in the shared context, taking a spare one if available. Runs on the pool loop."""
+        await self._ensure_browser()
+        page = None
+        while self._spare_pages and page is None:
+            candidate = self._spare_pages.popleft()
+            if not candidate.is_closed():
+                page = candidate
+        if page is None:
+            page = await self._context.new_page()
+        self._schedule_replenish()
+        await page.bring_to_front()
+        return page
+
+    async def open_page(self, url: str, timeout: int = 60000):
+        """Navigates a new tab to a URL, records its navigation timing and returns it. Runs on the pool loop."""
+        started = time.perf_counter()
+        page = await self.new_page()
+        ready_ms = (time.perf_counter() - started) * 1000
+        await page.goto(url, timeout=timeout)
+        record_navigation_soon(page, url=url)
+        logging.info(
+            f"Opened {url} in a pooled tab (tab ready in {ready_ms:.0f} ms)",
+            extra={"event": "browser.open", "duration_ms": (time.perf_counter() - started) * 1000}
+        )
+        return page
+
+    async def acquire_context(self):
+        """Returns an isolated context for an automation flow. Runs on the pool loop."""
+        await self._ensure_browser()
+        context = self._spare_contexts.popleft() if self._spare_contexts else await self._new_context()
+        self._schedule_replenish()
+        return context
+
+    async def release_context(self, context) -> None:
+        """Closes a context obtained from acquire_context(). Runs on the pool loop."""
+        try:
+            await context.close()
+        except Exception as e:
+            logging.debug(f"Failed to close browser context: {e}")
+
+    async def sync_session(self, page) -> bool:
+        """
+        Updates the saved sign-in state from a page that just loaded. Runs on the pool loop.
+
+        If the page shows the sign-in form, the saved state no longer works and is deleted.
+        Otherwise the page's state is saved if it holds a sign-in and the last save is older
+        than SESSION_SAVE_INTERVAL_SECONDS; the shared context then receives the sign-in
+        cookies, and spare contexts created from the old state are replaced.
+
+        Args:
+            page: Page whose navigation has finished
+
+        Returns:
+            bool: True if the page is not asking for a sign-in
+        """
+        try:
+            signed_out = await page.query_selector(LOGIN_FORM_SELECTOR) is not None
+        except Exception as e:
+            logging.debug(f"Could not check the page for a sign-in form: {e}")
+            return False
+        store = self.session_store
+        if store is None:
+            return not signed_out
+        if signed_out:
+            if store.auth_domain in page.url and store.load() is not None:
+                logging.info("Saved browser session was rejected; clearing it")
+                store.clear()
+            return False
+        if time.time() - store.saved_at < self.SESSION_SAVE_INTERVAL_SECONDS:
+            return True
+        try:
+            state = await page.context.storage_state()
+            if not store.save(state):
+                return True
+            if self._context is not None and page.context is not self._context:
+                await self._context.add_cookies(state["cookies"])
+        except Exception as e:
+            logging.warning(f"Failed to save browser session: {e}")
+            return True
+        stale = list(self._spare_contexts)
+        self._spare_contexts.clear()
+        for context in stale:
+            await self.release_context(context)
+        self._schedule_replenish()
+        return True
+
+    async def _start(self) -> None:
+        if self._health_task is None:
+            self._health_task = asyncio.get_running_loop().create_task(self._health_loop())
+        async with self._get_launch_lock():
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+
+    def _get_launch_lock(self) -> asyncio.Lock:
+        if self._launch_lock is None:
+            self._launch_lock = asyncio.Lock()
+        return self._launch_lock
+
+    async def _ensure_browser(self) -> None:
+        """Launches the browser if there is none or it has disconnected."""
+        self._started = True
+        async with self._get_launch_lock():
+            if self._browser is not None and self._browser.is_connected():
+                return
+            await self._discard_browser()
+            await self._launch()
+
+    async def _launch(self) -> None:
+        started = time.perf_counter()
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+        try:
+            browser = await self._launch_browser()
+        except Exception as e:
+            # The driver itself may have died along with the old browser; restart it once
+            logging.warning(f"Browser launch failed, restarting Playwright: {e}")
+            await self._stop_playwright()
+            self._playwright = await async_playwright().start()
+            browser = await self._launch_browser()
+
+        browser.on("disconnected", self._on_disconnected)
+        self._browser = browser
+        self._context = await self._new_context()
+        self.launch_count += 1
+        logging.info(
+            f"Browser launched (launch #{self.launch_count})",
+            extra={"event": "browser.launch", "duration_ms": (time.perf_counter() - started) * 1000}
+        )
+        self._schedule_replenish()
+
+    async def _new_context(self):
+        state = self.session_store.load() if self.session_store is not None else None
+        if state is None:
+            return await self._browser.new_context()
+        return await self._browser.new_context(storage_state=state)
+
+    async def _launch_browser(self):
+        return await self._playwright.chromium.launch(channel=self.channel, headless=self.headless, args=self.args)
+
+    def _on_disconnected(self, browser) -> None:
+        # A crash or the user closing the window; relaunch lazily on the next request
+        if browser is self._browser:
+            logging.warning("Browser disconnected; it will be relaunched on the next request")
+            self._browser = None
+            self._context = None
+            self._spare_pages.clear()
+            self._spare_contexts.clear()
+
+    def _schedule_replenish(self) -> None:
+        if self._replenish_task is None or self._replenish_task.done():
+            self._replenish_task = asyncio.get_running_loop().create_task(self._replenish())
+
+    async def _replenish(self) -> None:
+        """Tops up the spare tabs and contexts."""
+        try:
+            while self._context is not None and len(self._spare_pages) < self.spare_page_count:
+                self._spare_pages.append(await self._context.new_page())
+            while self._browser is not None and len(self._spare_contexts) < self.spare_context_count:
+                self._spare_contexts.append(await self._new_context())
+        except Exception as e:
+            logging.debug(f"Failed to replenish browser pool: {e}")
+
+    async def _health_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.HEALTH_INTERVAL_SECONDS)
+            if self._context is None:
+                continue
+            try:
+                # A round trip to the browser process; a hung browser never answers
+                await asyncio.wait_for(self._context.cookies(), self.PROBE_TIMEOUT_SECONDS)
+            except Exception as e:
+                logging.warning(f"Browser health check failed, relaunching: {e!r}")
+                try:
+                    async with self._get_launch_lock():
+                        await self._discard_browser()
+                        await self._launch()
+                except Exception as launch_error:
+                    logging.error(f"Browser relaunch failed: {launch_error}")
+
+    async def _discard_browser(self) -> None:
+        browser, self._browser, self._context = self._browser, None, None
+        self._spare_pages.clear()
+        self._spare_contexts.clear()
+        if browser is not None:
+            try:
+                await asyncio.wait_for(browser.close(), self.CLOSE_TIMEOUT_SECONDS)
+            except Exception as e:
+                logging.debug(f"Failed to close browser: {e}")
+
+    async def _stop_playwright(self) -> None:
+        playwright, self._playwright = self._playwright, None
+        if playwright is not None:
+            try:
+                await asyncio.wait_for(playwright.stop(), self.CLOSE_TIMEOUT_SECONDS)
+            except Exception as e:
+                logging.debug(f"Failed to stop Playwright: {e}")
+
+    async def _shutdown(self) -> None:
+        if self._health_task is not None:
+            self._health_task.cancel()
+        if self.session_store is not None and self._context is not None:
+            # Keep a sign-in made since the last save, e.g. by hand in an opened tab
+            try:
+                self.session_store.save(
+                    await asyncio.wait_for(self._context.storage_state(), self.CLOSE_TIMEOUT_SECONDS))
+            except Exception as e:
+                logging.debug(f"Failed to save browser session on shutdown: {e}")
+        await self._discard_browser()
+        await self._stop_playwright()
+        logging.info("Browser pool closed")
+
+
+_pool: Optional[BrowserPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool(**options) -> BrowserPool:
+    """
+    Returns the process-wide BrowserPool, creating it on first use.
+
+    Args:
+        options: BrowserPool arguments; only used by the call that creates the pool
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool(**options)
+        return _pool
@@ -0,0 +1,134 @@
+"""
+Persisted browser sign-in state.
+After a successful Midway sign-in, the browser's storage state (cookies and local storage)
+is saved to a file encrypted with Windows DPAPI for the current user, and new browser
+contexts start from it, so internal links skip the Midway round trip until the session
+expires.
+"""
+
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, Optional
+
+try:
+    import win32crypt
+except ImportError:
+    # Without DPAPI the state is never written; it is not stored unencrypted
+    win32crypt = None
+
+SESSION_FILE = os.path.join(os.path.dirname(__file__), "browser_session.bin")
+MIDWAY_DOMAIN = "midway-auth.amazon.com"
+LOGIN_FORM_SELECTOR = "#user_name"   # Present only while Midway is asking for credentials
+
+_ENTROPY = b"QuickLinks browser session"
+_CRYPTPROTECT_UI_FORBIDDEN = 0x1
+# Cookies this close to expiry are treated as expired, so a page does not start signed in and then bounce
+EXPIRY_MARGIN_SECONDS = 60
+
+
+class BrowserSessionStore:
+    """
+    Loads and saves the encrypted storage state.
+
+    A stored state counts as expired once it is older than max_age_hours or no unexpired
+    cookie for the sign-in domain is left in it; expired state is deleted so the next
+    sign-in starts clean.
+    """
+
+    def __init__(self, path: str = SESSION_FILE, auth_domain: str = MIDWAY_DOMAIN, max_age_hours: float = 12):
+        """
+        Args:
+            path: Encrypted state file
+            auth_domain: Domain whose cookies carry the sign-in
+            max_age_hours: Longest a saved state is reused, whatever its cookies say
+        """
+        self.path = path
+        self.auth_domain = auth_domain
+        self.max_age_seconds = max_age_hours * 3600
+        self.saved_at = 0.0
+        self._state: Optional[Dict[str, Any]] = None
+        self._loaded = False
+
+    @property
+    def available(self) -> bool:
+        """False where DPAPI is unavailable; nothing is persisted then."""
+        return win32crypt is not None
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """
+        Returns the stored storage state for browser.new_context(storage_state=...),
+        or None if there is none or it has expired.
+        """
+        if not self._loaded:
+            self._loaded = True
+            self._state, self.saved_at = self._read()
+        if self._state is not None and self.is_expired(self._state, self.saved_at):
+            logging.info("Stored browser session expired; sign-in will be required")
+            self.clear()
+        return self._state
+
+    def save(self, state: Dict[str, Any]) -> bool:
+        """
+        Encrypts and stores a storage state if it holds a sign-in.
+
+        Returns:
+            bool: True if the state was written
+        """
+        if not self.available or not self.has_auth_cookie(state):
+            return False
+        payload = json.dumps({"saved_at": time.time(), "state": state}, separators=(",", ":")).encode("utf-8")
+        try:
+            blob = win32crypt.CryptProtectData(payload, "QuickLinks browser session", _ENTROPY, None, None,
+                                               _CRYPTPROTECT_UI_FORBIDDEN)
+            temp_path = self.path + ".tmp"
+            with open(temp_path, "wb") as f:
+                f.write(blob)
+            os.replace(temp_path, self.path)
+        except Exception as e:
+            logging.error(f"Failed to save browser session: {e}")
+            return False
+        self._state, self.saved_at, self._loaded = state, time.time(), True
+        logging.info("Browser session saved")
+        return True
+
+    def clear(self) -> None:
+        """Forgets the stored state, e.g. after the site asked for a sign-in despite it."""
+        self._state, self.saved_at, self._loaded = None, 0.0, True
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logging.warning(f"Failed to delete browser session file: {e}")
+
+    def has_auth_cookie(self, state: Dict[str, Any], now: Optional[float] = None) -> bool:
+        """True if the state holds an unexpired cookie for the sign-in domain."""
+        deadline = (time.time() if now is None else now) + EXPIRY_MARGIN_SECONDS
+        for cookie in state.get("cookies", []):
+            if not cookie.get("domain", "").lstrip(".").endswith(self.auth_domain):
+                continue
+            expires = cookie.get("expires", -1)
+            # -1 marks a session cookie, which lives as long as the saved state does
+            if expires == -1 or expires > deadline:
+                return True
+        return False
+
+    def is_expired(self, state: Dict[str, Any], saved_at: float) -> bool:
+        now = time.time()
+        return now - saved_at > self.max_age_seconds or not self.has_auth_cookie(state, now)
+
+    def _read(self):
+        if not self.available or not os.path.exists(self.path):
+            return None, 0.0
+        try:
+            with open(self.path, "rb") as f:
+                _, payload = win32crypt.CryptUnprotectData(f.read(), _ENTROPY, None, None, _CRYPTPROTECT_UI_FORBIDDEN)
+            data = json.loads(payload)
+            return data["state"], float(data["saved_at"])
+        except Exception as e:
+            # Written by another user or machine, or corrupt; it cannot be used either way
+            logging.warning(f"Discarding unreadable browser session file: {e}")
+            self.clear()
+            return None, 0.0
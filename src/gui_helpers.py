@@ -13,9 +13,12 @@ def create_window_controls(root, on_closing_callback, on_minimize_callback):
     """
     pass  # No buttons will be created
 
-def create_button_frame(root, links, open_link_callback, handle_midway_access_callback, open_manage_zukey_callback, open_general_dashboard_callback, open_scanner_apw_callback=None):
+def create_button_frame(root, links, open_link_callback, handle_midway_access_callback, open_manage_zukey_callback, open_general_dashboard_callback, open_scanner_apw_callback=None, workspaces=None, open_workspace_callback=None, link_hover_callback=None):
     """
     Creates and packs the button frame with modern styled link buttons.
+    Workspace presets, if given, get a row of buttons that call open_workspace_callback(name).
+    Buttons for entries of `links` carry a health badge; see update_link_badge.
+    link_hover_callback, if given, is called when the pointer enters a button that opens the browser.
     """
     # Get compact mode setting from parent's settings
     compact_mode = False
@@ -80,6 +83,7 @@ def create_button_frame(root, links, open_link_callback, handle_midway_access_ca
     
     row = 0
     col = 0
+    button_container.link_badges = {}
     
     # Adjust button dimensions based on compact mode
     button_width = 280 if not compact_mode else 220
@@ -110,6 +114,21 @@ def create_button_frame(root, links, open_link_callback, handle_midway_access_ca
             anchor="center"
         )
         button.pack(expand=True, fill="both")
+        if name in links and link_hover_callback:
+            button.bind("<Enter>", lambda event: link_hover_callback(), add="+")
+
+        # Health badge in the button's top-right corner, filled in by update_link_badge
+        if name in links:
+            badge = ctk.CTkLabel(
+                button_container_frame,
+                text="",
+                font=("Segoe UI", 10 if not compact_mode else 9, "bold"),
+                fg_color=config['hover'],
+                text_color="white",
+                corner_radius=6,
+                height=16
+            )
+            button_container.link_badges[name] = badge
         
         # Update grid position
         col += 1
@@ -117,6 +136,30 @@ def create_button_frame(root, links, open_link_callback, handle_midway_access_ca
             col = 0
             row += 1
     
+    # Create one button per workspace preset
+    if workspaces and open_workspace_callback:
+        workspace_frame = ctk.CTkFrame(
+            button_container,
+            fg_color="transparent"
+        )
+        workspace_frame.pack(fill="x", padx=15, pady=(0, 10 if not compact_mode else 5))
+        for index, workspace_name in enumerate(workspaces):
+            workspace_frame.grid_columnconfigure(index, weight=1)
+            workspace_button = ctk.CTkButton(
+                master=workspace_frame,
+                text=f"▶ {workspace_name}",
+                command=lambda name=workspace_name: open_workspace_callback(name),
+                height=button_height,
+                corner_radius=8 if not compact_mode else 6,
+                fg_color="#45818e",  # Teal
+                hover_color="#335f69",
+                font=("Segoe UI", button_font_size, "bold"),
+                anchor="center"
+            )
+            workspace_button.grid(row=0, column=index, padx=button_padding, pady=button_padding, sticky="nsew")
+            if link_hover_callback:
+                workspace_button.bind("<Enter>", lambda event: link_hover_callback(), add="+")
+
     # Create Scanner APW button in its own container
     scanner_container = ctk.CTkFrame(
         button_container,
@@ -144,6 +187,28 @@ def create_button_frame(root, links, open_link_callback, handle_midway_access_ca
     
     return button_container
 
+LINK_BADGE_COLORS = {
+    "up": "#6aff8f",
+    "slow": "#ffd54a",
+    "down": "#ff8a80",
+}
+
+def update_link_badge(button_frame, status):
+    """
+    Shows a link's health (a LinkStatus from link_health) on its button's badge.
+    Links without a badge on this button frame are ignored.
+    """
+    badge = getattr(button_frame, "link_badges", {}).get(status.name)
+    if badge is None or not badge.winfo_exists():
+        return
+    if status.state not in LINK_BADGE_COLORS:
+        badge.place_forget()
+        return
+    text = "● down" if status.state == "down" else f"● {status.latency_ms:.0f} ms"
+    badge.configure(text=text, text_color=LINK_BADGE_COLORS[status.state])
+    badge.place(relx=1.0, rely=0.0, anchor="ne", x=-6, y=4)
+    badge.lift()
+
 def create_security_keys_list(root, on_key_double_click):
     """
     Creates a modern security keys list view.
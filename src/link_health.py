@@ -0,0 +1,213 @@
+"""
+Background HTTP health checks for the quick links.
+Every link is probed with a HEAD request (GET where HEAD is not allowed) through one pooled
+requests.Session, so repeated checks reuse connections instead of paying DNS, TCP and TLS
+each time. Checks run concurrently on a small thread pool on a fixed schedule; a host that
+cannot be reached is checked exponentially less often until it answers again.
+
+A link counts as up if its server answers with any status below 500, including the
+redirect to the sign-in page that internal tools send to an unauthenticated client.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from constants import LINKS
+
+UP, SLOW, DOWN, UNKNOWN = "up", "slow", "down", "unknown"
+
+
+class LinkStatus:
+    """Result of the latest check of one link."""
+
+    __slots__ = ("name", "url", "state", "status_code", "latency_ms", "error", "checked_at")
+
+    def __init__(self, name: str, url: str):
+        self.name = name
+        self.url = url
+        self.state = UNKNOWN
+        self.status_code: Optional[int] = None
+        self.latency_ms: Optional[float] = None
+        self.error: Optional[str] = None
+        self.checked_at = 0.0
+
+    def __str__(self):
+        if self.state == DOWN:
+            detail = f"HTTP {self.status_code}" if self.status_code else self.error
+            return f"{self.name}: down ({detail})"
+        if self.state == UNKNOWN:
+            return f"{self.name}: not checked yet"
+        return f"{self.name}: {self.state}, HTTP {self.status_code} in {self.latency_ms:.0f} ms"
+
+
+class LinkHealthChecker:
+    """Checks a set of links on a background thread and reports each result through a callback."""
+
+    def __init__(self, links: Optional[Dict[str, str]] = None, interval: float = 60, timeout: float = 5,
+                 slow_ms: float = 2000, max_workers: int = 4, max_backoff: float = 900,
+                 on_update: Optional[Callable[[LinkStatus], None]] = None,
+                 session: Optional[requests.Session] = None):
+        """
+        Args:
+            links: Name to URL mapping; defaults to LINKS
+            interval: Seconds between checks of a healthy host
+            timeout: Seconds before a check counts as failed
+            slow_ms: Latency above which a responding link is reported as slow
+            max_workers: Most checks in flight at once
+            max_backoff: Longest interval between checks of an unreachable host, in seconds
+            on_update: Called on a worker thread with each new LinkStatus
+            session: Session to send requests through; one with a connection pool is created if not given
+        """
+        self.links = dict(LINKS if links is None else links)
+        self.interval = interval
+        self.timeout = timeout
+        self.slow_ms = slow_ms
+        self.max_backoff = max_backoff
+        self.on_update = on_update
+
+        self.session = session or self._create_session(max_workers)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="LinkHealth")
+        self._statuses = {name: LinkStatus(name, url) for name, url in self.links.items()}
+        self._host_failures: Dict[str, int] = {}
+        self._host_next_check: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _create_session(self, max_workers: int) -> requests.Session:
+        session = requests.Session()
+        hosts = {urlsplit(url).hostname for url in self.links.values()}
+        adapter = HTTPAdapter(pool_connections=max(1, len(hosts)), pool_maxsize=max_workers, max_retries=0)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers["User-Agent"] = "QuickLinks-HealthCheck"
+        return session
+
+    def start(self) -> None:
+        """Starts the scheduled checks; the first round runs immediately."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="LinkHealthScheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stops the schedule without waiting, so it is safe to call from the Tk thread.
+        Checks still in flight finish in the background and are not reported.
+        """
+        self._stop.set()
+        self._wake.set()
+        if self._thread is None or not self._thread.is_alive():
+            self._close()
+
+    def check_now(self) -> None:
+        """Checks every link on the next round, ignoring backoff."""
+        with self._lock:
+            self._host_next_check.clear()
+        self._wake.set()
+
+    def statuses(self) -> List[LinkStatus]:
+        with self._lock:
+            return list(self._statuses.values())
+
+    def run_once(self) -> List[LinkStatus]:
+        """
+        Checks every link that is due now, concurrently, and waits for the results.
+
+        Returns:
+            list: The LinkStatus of each link checked in this round
+        """
+        now = time.time()
+        with self._lock:
+            due = [(name, url) for name, url in self.links.items()
+                   if self._host_next_check.get(self._host(url), 0) <= now]
+        futures = [self._executor.submit(self.check, name, url) for name, url in due]
+        results = [future.result() for future in futures]
+        self._schedule(results)
+        return results
+
+    def check(self, name: str, url: str) -> LinkStatus:
+        """Probes one link, records the result and reports it."""
+        status = LinkStatus(name, url)
+        started = time.perf_counter()
+        try:
+            response = self.session.head(url, timeout=self.timeout, allow_redirects=False)
+            if response.status_code in (405, 501):
+                # HEAD not supported; a streamed GET stops after the headers
+                response = self.session.get(url, timeout=self.timeout, allow_redirects=False, stream=True)
+                response.close()
+            status.latency_ms = (time.perf_counter() - started) * 1000
+            status.status_code = response.status_code
+            if response.status_code >= 500:
+                status.state = DOWN
+            else:
+                status.state = SLOW if status.latency_ms > self.slow_ms else UP
+        except requests.RequestException as e:
+            status.state = DOWN
+            status.error = type(e).__name__
+        status.checked_at = time.time()
+        self._record(status)
+        return status
+
+    def _record(self, status: LinkStatus) -> None:
+        with self._lock:
+            previous = self._statuses.get(status.name)
+            self._statuses[status.name] = status
+
+        # Log changes, and a link that is down from the first check
+        if previous is not None and previous.state != status.state and (previous.state != UNKNOWN or status.state == DOWN):
+            log = logging.warning if status.state == DOWN else logging.info
+            log(f"Link health changed: {status}", extra={"event": "link.health", "duration_ms": status.latency_ms})
+        if self.on_update is not None and not self._stop.is_set():
+            try:
+                self.on_update(status)
+            except Exception:
+                logging.exception("Error in link health callback")
+
+    def _schedule(self, results: List[LinkStatus]) -> None:
+        """Sets when each host checked in a round is due again, counting at most one failure per host."""
+        reachable: Dict[str, bool] = {}
+        for status in results:
+            # Unreachable means no answer at all (timeout, refused, DNS); a 5xx answer means the host is up
+            host = self._host(status.url)
+            reachable[host] = reachable.get(host, False) or status.error is None
+        now = time.time()
+        with self._lock:
+            for host, ok in reachable.items():
+                if ok:
+                    self._host_failures.pop(host, None)
+                    delay = self.interval
+                else:
+                    failures = self._host_failures.get(host, 0) + 1
+                    self._host_failures[host] = failures
+                    delay = min(self.interval * 2 ** failures, self.max_backoff)
+                self._host_next_check[host] = now + delay
+
+    def _close(self) -> None:
+        self._executor.shutdown(wait=False)
+        self.session.close()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception:
+                logging.exception("Link health round failed")
+            with self._lock:
+                next_due = min(self._host_next_check.values(), default=time.time() + self.interval)
+            self._wake.wait(max(1.0, next_due - time.time()))
+            self._wake.clear()
+        self._close()
+
+    @staticmethod
+    def _host(url: str) -> str:
+        return urlsplit(url).netloc.lower()
@@ -0,0 +1,180 @@
+"""
+Highlight rules for the dashboard log pane.
+A rule maps either a set of record levels or a text pattern to a text tag. Level rules are a
+dictionary lookup; pattern rules are compiled one by one, so a rule's groups and
+backreferences mean what its author wrote.
+
+A pattern rule can list `keywords`: plain strings of which every match contains at least
+one (compared case-insensitively). A line is only searched with the rule's pattern if one
+of its keywords occurs in it.
+
+Before any rule runs, a prefilter rejects most log lines in one pass: a pure-literal
+alternation over all keywords, plus one combined (?:p1)|(?:p2)... search over the patterns
+of rules without keywords. A pattern with backreferences or conditionals cannot be combined
+without changing its meaning; such a rule turns the prefilter off, with a warning, so every
+line is then searched rule by rule.
+"""
+
+import logging
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Level rules take precedence over pattern rules. Among pattern rules, the one whose match
+# starts earliest in the line wins, and ties go to the rule listed first.
+DEFAULT_HIGHLIGHT_RULES: List[Dict[str, Any]] = [
+    {"name": "error", "levels": ["ERROR", "CRITICAL"], "foreground": "#e5534b"},
+    {"name": "warning", "levels": ["WARNING"], "foreground": "#d4a72c"},
+    {"name": "vpn", "pattern": r"VPN connection (?:status changed|successful|failed)|VPN monitor",
+     "keywords": ["vpn "], "foreground": "#4493f8", "ignore_case": True},
+    {"name": "key_event", "pattern": r"Detected keys|Security keys? (?:changed|connected|disconnected)",
+     "keywords": ["detected keys", "security key"], "foreground": "green"},
+    {"name": "passcode", "pattern": r"scanner code|passcode", "keywords": ["scanner code", "passcode"],
+     "foreground": "#a371f7", "ignore_case": True}
+]
+
+TAG_PREFIX = "highlight_"
+
+# Group references whose numbering would shift inside a combined pattern
+_GROUP_REFERENCE = re.compile(r"\\(?:[1-9]|g<)|\(\?P=|\(\?\(")
+
+
+class HighlightRule:
+    """One rule: the levels or pattern it matches and the text tag options for those lines."""
+
+    __slots__ = ("name", "levels", "pattern", "ignore_case", "keywords", "search", "tag", "options")
+
+    def __init__(self, name: str, pattern: Optional[str] = None, levels: Optional[List[str]] = None,
+                 ignore_case: bool = False, keywords: Optional[List[str]] = None, **options: str):
+        """
+        Args:
+            name: Rule name; the text tag is TAG_PREFIX + name
+            pattern: Regular expression searched for in each formatted log line
+            levels: Level names matched instead of a pattern
+            ignore_case: Match the pattern case-insensitively
+            keywords: Strings of which every match of the pattern contains one, in any case;
+                lines without any of them are not searched
+            options: Tag options for tag_config, e.g. foreground or background
+
+        Raises:
+            ValueError: If the rule is incomplete or its pattern does not compile
+        """
+        if (pattern is None) == (levels is None):
+            raise ValueError("a rule needs exactly one of 'pattern' and 'levels'")
+        if keywords is not None and (pattern is None or not keywords):
+            raise ValueError("'keywords' needs a 'pattern' and at least one keyword")
+        self.name = name
+        self.levels = [level.upper() for level in levels] if levels is not None else []
+        self.pattern = pattern
+        self.ignore_case = ignore_case
+        self.keywords = [keyword.lower() for keyword in keywords] if keywords is not None else None
+        try:
+            self.search = re.compile(pattern, re.IGNORECASE if ignore_case else 0).search if pattern else None
+        except re.error as e:
+            raise ValueError(f"invalid pattern: {e}")
+        self.tag = TAG_PREFIX + name
+        self.options = options
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "HighlightRule":
+        return cls(**data)
+
+
+class LogHighlighter:
+    """Maps log records to text tags: level rules by lookup, pattern rules by searching each rule's pattern."""
+
+    def __init__(self, rules: Optional[Iterable[Dict[str, Any]]] = None):
+        """
+        Args:
+            rules: Rule dicts (name, pattern or levels, optional ignore_case, keywords and tag
+                options); defaults to DEFAULT_HIGHLIGHT_RULES. Invalid rules are logged and skipped.
+        """
+        self.rules: List[HighlightRule] = []
+        for data in DEFAULT_HIGHLIGHT_RULES if rules is None else rules:
+            try:
+                rule = HighlightRule.from_dict(data)
+            except (TypeError, ValueError) as e:
+                logging.warning(f"Ignoring invalid log highlight rule {data!r}: {e}")
+                continue
+            self.rules.append(rule)
+
+        self._level_tags: Dict[str, str] = {}
+        for rule in self.rules:
+            for level in rule.levels:
+                self._level_tags.setdefault(level, rule.tag)
+
+        self._pattern_rules = [rule for rule in self.rules if rule.pattern is not None]
+        self._keyword_prefilter = self._pattern_prefilter = None
+        self._prefiltered = self._build_prefilter()
+
+    def _build_prefilter(self) -> bool:
+        """Compiles the prefilter searches; returns False if some rule cannot be prefiltered."""
+        keywords = {keyword for rule in self._pattern_rules if rule.keywords for keyword in rule.keywords}
+        if keywords:
+            alternation = "|".join(re.escape(keyword) for keyword in sorted(keywords, key=len, reverse=True))
+            self._keyword_prefilter = re.compile(alternation).search
+
+        fragments = []
+        for rule in self._pattern_rules:
+            if rule.keywords is not None:
+                continue
+            if _GROUP_REFERENCE.search(rule.pattern):
+                logging.warning(
+                    f"Log highlight rule {rule.name!r} uses group references and has no keywords; "
+                    f"every log line is searched with each rule"
+                )
+                return False
+            fragments.append(f"(?{'i' if rule.ignore_case else ''}:{rule.pattern})")
+        if fragments:
+            try:
+                self._pattern_prefilter = re.compile("|".join(fragments)).search
+            except re.error as e:
+                logging.warning(f"Log highlight rules cannot be combined ({e}); every log line is searched with each rule")
+                return False
+        return True
+
+    def configure_tags(self, textbox) -> None:
+        """Creates the text tags for all rules on the textbox."""
+        for rule in self.rules:
+            textbox.tag_config(rule.tag, **rule.options)
+
+    def tag_for(self, line: str, level: Optional[str] = None) -> Optional[str]:
+        """Returns the tag of the rule matching a formatted line logged at `level`, or None."""
+        tag = self._level_tags.get(level)
+        if tag is not None:
+            return tag
+        if not self._pattern_rules:
+            return None
+        lowered = line.lower()
+        if self._prefiltered and not (
+                (self._keyword_prefilter is not None and self._keyword_prefilter(lowered))
+                or (self._pattern_prefilter is not None and self._pattern_prefilter(line))):
+            return None
+        # The match that starts earliest wins; ties go to the rule listed first
+        best_start, tag = len(line) + 1, None
+        for rule in self._pattern_rules:
+            if rule.keywords is not None and not any(keyword in lowered for keyword in rule.keywords):
+                continue
+            match = rule.search(line)
+            if match is not None and match.start() < best_start:
+                best_start, tag = match.start(), rule.tag
+        return tag
+
+    def runs(self, entries: Iterable[Tuple[str, str]]) -> List[Tuple[str, Optional[str]]]:
+        """
+        Tags a batch of log entries, merging consecutive lines with the same tag.
+
+        Args:
+            entries: (level name, formatted line) pairs
+
+        Returns:
+            list: (newline-terminated text, tag) pairs, in order
+        """
+        runs = []
+        tag_for = self.tag_for
+        for level, line in entries:
+            tag = tag_for(line, level)
+            if runs and runs[-1][1] == tag:
+                runs[-1][0].append(line)
+            else:
+                runs.append(([line], tag))
+        return [("\n".join(text) + "\n", tag) for text, tag in runs]
@@ -0,0 +1,360 @@
+"""
+Query tool for the structured (JSON-lines) log.
+
+Each log file, active or rotated and gzipped, gets a sidecar index in a .index directory beside it that
+summarises the file in blocks of whole lines: byte range, time range, the levels present and
+the modules present. Queries only read and parse the blocks that can match, so a time, level
+and module query stays fast on gigabytes of history. The index of the active file is
+extended incrementally as the file grows, and rebuilt when the file is rotated.
+
+Example:
+    python log_query.py --level ERROR --module vpn_manager --since 09:00 --until 10:00
+"""
+
+import argparse
+import glob
+import gzip
+import json
+import os
+import re
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional
+
+from logging_config import STRUCTURED_LOG_FILE
+
+INDEX_DIR_NAME = ".index"
+INDEX_VERSION = 1
+BLOCK_BYTES = 64 * 1024
+HEAD_BYTES = 64   # Leading bytes stored to recognise a file that replaced an indexed one
+
+LEVELS = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
+LEVEL_BITS = {name: 1 << i for i, name in enumerate(LEVELS)}
+
+# Matches the fixed ts/level/module prefix JsonLinesFormatter writes on every line
+HEAD_PATTERN = re.compile(rb'\{"ts":([0-9.eE+-]+),"level":"(\w+)","module":"((?:[^"\\]|\\.)*)"')
+
+
+class LogFileIndex:
+    """
+    Block index of one structured log file.
+
+    A block is [offset, length, min_ts, max_ts, level_mask, module_mask]; the offset and
+    length are in decompressed bytes for gzipped files, and module_mask has one bit per
+    entry of `modules`.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.index_path = os.path.join(index_dir(path), os.path.basename(path) + ".idx")
+        self.compressed = path.endswith(".gz")
+        self.identity: List[int] = []
+        self.head = ""
+        self.indexed = 0
+        self.modules: List[str] = []
+        self.blocks: List[List[Any]] = []
+        self._module_bits: Dict[str, int] = {}
+
+    def update(self) -> bool:
+        """
+        Loads the sidecar index and brings it up to date with the file.
+
+        Returns:
+            bool: True if the sidecar had to be extended or rebuilt
+        """
+        stat = os.stat(self.path)
+        # Rotated files never change, so size and mtime identify them; the active file keeps its inode as it grows
+        identity = [stat.st_size, int(stat.st_mtime)] if self.compressed else [stat.st_dev, stat.st_ino]
+        head = self._read_head()
+
+        if not self._load() or self.identity != identity or self.head != head or (
+                not self.compressed and stat.st_size < self.indexed):
+            self.identity, self.head, self.indexed = identity, head, 0
+            self.modules, self.blocks, self._module_bits = [], [], {}
+        elif self.compressed or stat.st_size == self.indexed:
+            return False
+
+        self._extend()
+        self._save()
+        return True
+
+    def candidate_blocks(self, start: Optional[float], end: Optional[float], level_mask: int,
+                         modules: Optional[List[str]]) -> List[List[Any]]:
+        """Returns the blocks that may hold lines matching the time range, levels and modules."""
+        module_mask = -1
+        if modules is not None:
+            module_mask = 0
+            for module in modules:
+                module_mask |= self._module_bits.get(module, 0)
+            if not module_mask:
+                return []
+        return [
+            block for block in self.blocks
+            if (start is None or block[3] >= start) and (end is None or block[2] <= end)
+            and block[4] & level_mask and block[5] & module_mask
+        ]
+
+    def read_blocks(self, blocks: List[List[Any]]) -> Iterator[bytes]:
+        """Yields the bytes of each block, in file order."""
+        opener = gzip.open if self.compressed else open
+        with opener(self.path, "rb") as f:
+            for offset, length, *_ in blocks:
+                # Forward seeks on a gzip stream decompress and discard, which is still cheaper than parsing
+                f.seek(offset)
+                yield f.read(length)
+
+    def _read_head(self) -> str:
+        opener = gzip.open if self.compressed else open
+        with opener(self.path, "rb") as f:
+            return f.read(HEAD_BYTES).hex()
+
+    def _extend(self) -> None:
+        """Indexes the complete lines after `indexed`, one block per BLOCK_BYTES of input."""
+        opener = gzip.open if self.compressed else open
+        with opener(self.path, "rb") as f:
+            f.seek(self.indexed)
+            pending = b""
+            while True:
+                chunk = f.read(BLOCK_BYTES)
+                if not chunk:
+                    break
+                data = pending + chunk
+                cut = data.rfind(b"\n") + 1
+                if cut == 0:
+                    pending = data
+                    continue
+                self._add_block(data[:cut])
+                pending = data[cut:]
+        # A trailing partial line is still being written; it is picked up by the next update
+
+    def _add_block(self, data: bytes) -> None:
+        min_ts, max_ts = float("inf"), float("-inf")
+        level_mask = module_mask = 0
+        for match in HEAD_PATTERN.finditer(data):
+            ts = float(match.group(1))
+            min_ts = min(min_ts, ts)
+            max_ts = max(max_ts, ts)
+            level_mask |= LEVEL_BITS.get(match.group(2).decode("ascii"), 0)
+            module_mask |= self._module_bit(match.group(3).decode("utf-8", errors="replace"))
+        if level_mask:
+            self.blocks.append([self.indexed, len(data), min_ts, max_ts, level_mask, module_mask])
+        self.indexed += len(data)
+
+    def _module_bit(self, module: str) -> int:
+        bit = self._module_bits.get(module)
+        if bit is None:
+            bit = self._module_bits[module] = 1 << len(self.modules)
+            self.modules.append(module)
+        return bit
+
+    def _load(self) -> bool:
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if data.get("version") != INDEX_VERSION:
+            return False
+        self.identity = data["identity"]
+        self.head = data["head"]
+        self.indexed = data["indexed"]
+        self.modules = data["modules"]
+        self.blocks = data["blocks"]
+        self._module_bits = {module: 1 << i for i, module in enumerate(self.modules)}
+        return True
+
+    def _save(self) -> None:
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        data = {
+            "version": INDEX_VERSION,
+            "path": self.path,
+            "identity": self.identity,
+            "head": self.head,
+            "indexed": self.indexed,
+            "modules": self.modules,
+            "blocks": self.blocks
+        }
+        temp_path = self.index_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(temp_path, self.index_path)
+
+
+def index_dir(log_file: str) -> str:
+    """Returns the directory holding the sidecar indexes of a log and its rotated files."""
+    return os.path.join(os.path.dirname(log_file) or ".", INDEX_DIR_NAME)
+
+
+def log_files(log_file: str = STRUCTURED_LOG_FILE) -> List[str]:
+    """Returns the rotated files of a log, oldest first, followed by the active file."""
+    rotated = [p for p in glob.glob(glob.escape(log_file) + ".*") if not p.endswith(".tmp")]
+    files = sorted(rotated, key=os.path.getmtime)
+    if os.path.exists(log_file):
+        files.append(log_file)
+    return files
+
+
+def prune_indexes(log_file: str = STRUCTURED_LOG_FILE) -> None:
+    """Deletes sidecar indexes whose log file was removed by the retention ceiling."""
+    existing = {os.path.basename(p) for p in log_files(log_file)}
+    prefix = os.path.basename(log_file)
+    for index_path in glob.glob(os.path.join(glob.escape(index_dir(log_file)), glob.escape(prefix) + "*.idx")):
+        if os.path.basename(index_path)[:-len(".idx")] not in existing:
+            os.remove(index_path)
+
+
+def query_logs(log_file: str = STRUCTURED_LOG_FILE, start: Optional[datetime] = None,
+               end: Optional[datetime] = None, min_level: str = "DEBUG", modules: Optional[List[str]] = None,
+               logger: Optional[str] = None, thread: Optional[str] = None, event: Optional[str] = None,
+               text: Optional[str] = None, stats: Optional[Dict[str, int]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Yields matching records, oldest first.
+
+    Time, level and module are resolved through the sidecar indexes; logger (name prefix),
+    thread, event and text (case-insensitive substring of the message) are checked on the
+    lines of the candidate blocks.
+
+    Args:
+        log_file: Active structured log file; its rotated archives are searched too
+        start: Earliest record time
+        end: Latest record time
+        min_level: Lowest level included
+        modules: Module names to include
+        logger: Logger name prefix
+        thread: Thread name
+        event: Event type
+        text: Substring of the message
+        stats: If given, receives counts of files, blocks and lines examined
+    """
+    start_ts = start.timestamp() if start else None
+    end_ts = end.timestamp() if end else None
+    min_bit = LEVEL_BITS[min_level.upper()]
+    level_mask = sum(bit for bit in LEVEL_BITS.values() if bit >= min_bit)
+    text = text.lower() if text else None
+    if stats is None:
+        stats = {}
+    for key in ("files", "indexed", "blocks", "lines"):
+        stats.setdefault(key, 0)
+
+    for path in log_files(log_file):
+        # A file last written before the range starts cannot contain it; skip without indexing
+        if start_ts is not None and os.path.getmtime(path) < start_ts:
+            continue
+        index = LogFileIndex(path)
+        try:
+            if index.update():
+                stats["indexed"] += 1
+        except OSError:
+            # Rotated or removed while the query ran
+            continue
+        stats["files"] += 1
+        blocks = index.candidate_blocks(start_ts, end_ts, level_mask, modules)
+        if not blocks:
+            continue
+
+        for data in index.read_blocks(blocks):
+            stats["blocks"] += 1
+            for line in data.splitlines():
+                stats["lines"] += 1
+                head = HEAD_PATTERN.match(line)
+                if head is None:
+                    continue
+                ts = float(head.group(1))
+                if (start_ts is not None and ts < start_ts) or (end_ts is not None and ts > end_ts):
+                    continue
+                if not LEVEL_BITS.get(head.group(2).decode("ascii"), 0) & level_mask:
+                    continue
+                if modules is not None and head.group(3).decode("utf-8", errors="replace") not in modules:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if logger and not record.get("logger", "").startswith(logger):
+                    continue
+                if thread and record.get("thread") != thread:
+                    continue
+                if event and record.get("event") != event:
+                    continue
+                if text and text not in record.get("message", "").lower():
+                    continue
+                yield record
+
+
+def format_record(record: Dict[str, Any]) -> str:
+    """Formats a record like the text log, with its thread and any event fields."""
+    created = datetime.fromtimestamp(record["ts"])
+    line = (f"{created:%Y-%m-%d %H:%M:%S},{created.microsecond // 1000:03d} - {record.get('module')} - "
+            f"{record.get('level')} - [{record.get('thread')}] {record.get('message')}")
+    extras = [str(record[key]) for key in ("event",) if key in record]
+    if "duration_ms" in record:
+        extras.append(f"{record['duration_ms']} ms")
+    if extras:
+        line += f" ({', '.join(extras)})"
+    if "exc" in record:
+        line += "\n" + record["exc"]
+    return line
+
+
+def parse_time(value: str, day: datetime) -> datetime:
+    """Parses HH:MM[:SS] on the given day, or a full ISO date/time."""
+    for fmt in ("%H:%M", "%H:%M:%S"):
+        try:
+            parsed = datetime.strptime(value, fmt)
+            return day.replace(hour=parsed.hour, minute=parsed.minute, second=parsed.second)
+        except ValueError:
+            pass
+    return datetime.fromisoformat(value)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Search the structured application log.")
+    parser.add_argument("--file", default=STRUCTURED_LOG_FILE, help="Active structured log file")
+    parser.add_argument("--since", help="Start time, HH:MM[:SS] or ISO date/time")
+    parser.add_argument("--until", help="End time, HH:MM[:SS] or ISO date/time")
+    parser.add_argument("--date", help="Day for HH:MM times (YYYY-MM-DD), default today")
+    parser.add_argument("--last", type=float, help="Only the last N minutes")
+    parser.add_argument("--level", default="DEBUG", choices=LEVELS, type=str.upper, help="Lowest level included")
+    parser.add_argument("--module", action="append", help="Module name; repeat for several")
+    parser.add_argument("--logger", help="Logger name prefix")
+    parser.add_argument("--thread", help="Thread name")
+    parser.add_argument("--event", help="Event type")
+    parser.add_argument("--grep", help="Case-insensitive text in the message")
+    parser.add_argument("--limit", type=int, help="Stop after N records")
+    parser.add_argument("--json", action="store_true", help="Print records as JSON lines")
+    parser.add_argument("--stats", action="store_true", help="Print timing and scan counts to stderr")
+    args = parser.parse_args(argv)
+
+    day = datetime.strptime(args.date, "%Y-%m-%d") if args.date else datetime.now()
+    day = day.replace(hour=0, minute=0, second=0, microsecond=0)
+    start = parse_time(args.since, day) if args.since else None
+    end = parse_time(args.until, day) if args.until else None
+    if args.last:
+        start = datetime.now() - timedelta(minutes=args.last)
+    if args.date and start is None and end is None:
+        start, end = day, day + timedelta(days=1)
+
+    began = time.perf_counter()
+    stats: Dict[str, int] = {}
+    count = 0
+    records = query_logs(
+        args.file, start=start, end=end, min_level=args.level, modules=args.module, logger=args.logger,
+        thread=args.thread, event=args.event, text=args.grep, stats=stats
+    )
+    for record in records:
+        print(json.dumps(record, ensure_ascii=False) if args.json else format_record(record))
+        count += 1
+        if args.limit and count >= args.limit:
+            break
+    prune_indexes(args.file)
+
+    if args.stats:
+        elapsed = (time.perf_counter() - began) * 1000
+        print(f"{count} records in {elapsed:.1f} ms; {stats['files']} files ({stats['indexed']} re-indexed), "
+              f"{stats['blocks']} blocks, {stats['lines']} lines parsed", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
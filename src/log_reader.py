@@ -0,0 +1,135 @@
+"""
+Memory-mapped reading of log files that are still being written.
+Finds the last N lines by scanning backwards from the end of the file, or the lines before
+or after any line offset, without reading the rest of the file.
+"""
+
+import logging
+import mmap
+import os
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple, Union
+
+# (byte offset of the line in the file, line bytes including the trailing newline)
+LogLine = Tuple[int, bytes]
+
+
+class LogTailReader:
+    """
+    Reads lines from a log file through a short-lived memory map per call.
+
+    The file is never held open between calls, so the writer can rotate or truncate it
+    freely (Windows refuses to rename or truncate a mapped file). Each call checks the file
+    identity and size; a new file or a shrunken one bumps `generation`, which invalidates
+    offsets obtained before.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.generation = 0
+        self._identity: Optional[Tuple[int, int]] = None
+        self._size = 0
+
+    @property
+    def size(self) -> int:
+        """File size at the last check; bytes the writer still buffers are not included."""
+        return self._size
+
+    def refresh(self) -> bool:
+        """
+        Re-checks the file identity and size.
+
+        Returns:
+            bool: True if the file was rotated or truncated since the last call
+        """
+        generation = self.generation
+        try:
+            self._check(os.stat(self.path))
+        except OSError:
+            # Between a rotation's rename and the next write there may be no file at all
+            pass
+        return self.generation != generation
+
+    def tail(self, count: int) -> Tuple[List[LogLine], int]:
+        """
+        Returns the last `count` complete lines.
+
+        Returns:
+            tuple: (lines oldest first, offset just past the last complete line)
+        """
+        try:
+            with self._mapped() as (data, size):
+                end = data.rfind(b"\n", 0, size) + 1
+                return self._scan_backward(data, end, count), end
+        except FileNotFoundError:
+            return [], 0
+
+    def lines_before(self, end: int, count: int) -> List[LogLine]:
+        """Returns up to `count` lines ending at line boundary `end`, oldest first."""
+        if end <= 0:
+            return []
+        try:
+            with self._mapped() as (data, size):
+                end = min(end, size)
+                lines = self._scan_backward(data, end, count)
+        except FileNotFoundError:
+            return []
+        return lines
+
+    def lines_after(self, start: int, count: int, end: Optional[int] = None) -> List[LogLine]:
+        """
+        Returns up to `count` complete lines starting at line boundary `start`, oldest first.
+
+        Args:
+            start: Offset of the first line
+            count: Maximum number of lines
+            end: Stop at this offset, e.g. where lines already shown begin
+        """
+        try:
+            with self._mapped() as (data, size):
+                stop = size if end is None else min(end, size)
+                lines = []
+                pos = start
+                while len(lines) < count and pos < stop:
+                    newline = data.find(b"\n", pos, stop)
+                    if newline < 0:
+                        # Partial line still being written
+                        break
+                    lines.append((pos, data[pos:newline + 1]))
+                    pos = newline + 1
+        except FileNotFoundError:
+            return []
+        return lines
+
+    @contextmanager
+    def _mapped(self) -> Iterator[Tuple[Union[mmap.mmap, bytes], int]]:
+        """Maps the whole file read-only for the duration of one read."""
+        with open(self.path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            self._check(stat)
+            if stat.st_size == 0:
+                # Zero-length files cannot be mapped
+                yield b"", 0
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                yield data, len(data)
+
+    def _check(self, stat: os.stat_result) -> None:
+        """Bumps the generation if the path now names a different or shorter file."""
+        identity = (stat.st_dev, stat.st_ino)
+        if self._identity is not None and (identity != self._identity or stat.st_size < self._size):
+            self.generation += 1
+            logging.debug(f"Log file {self.path} was rotated or truncated")
+        self._identity = identity
+        self._size = stat.st_size
+
+    @staticmethod
+    def _scan_backward(data: Union[mmap.mmap, bytes], end: int, count: int) -> List[LogLine]:
+        lines = []
+        pos = end
+        while len(lines) < count and pos > 0:
+            start = data.rfind(b"\n", 0, pos - 1) + 1
+            lines.append((start, data[start:pos]))
+            pos = start
+        lines.reverse()
+        return lines
@@ -0,0 +1,244 @@
+"""
+Bounded view over the dashboard log.
+Keeps at most a configured number of recent lines in the log textbox, trimming from the top
+in chunks, and pages older history back in from the log file when the user scrolls to the top.
+Paging back trims the newest lines instead, and scrolling down again pages them back in from
+the file until the view reaches the live tail.
+"""
+
+import logging
+from collections import deque
+from typing import List, Optional, Tuple
+
+from log_reader import LogLine, LogTailReader
+
+
+class LogView:
+    """
+    Wraps the log textbox and tracks where its contents come from in the log file.
+
+    The widget text is kept as segments of whole lines, each remembering the file offset
+    its first line starts at, so trimmed or never-loaded history can be read back from disk
+    on scroll-back. Live lines get their offset from the log record itself, as written by the
+    file handler, since the widget may show fewer lines than the file (e.g. no DEBUG). When
+    the log file is rotated or truncated, or an offset is not known, scroll-back stops at
+    the oldest line already shown.
+
+    Once scroll-back has trimmed the newest lines, the view is detached from the live tail:
+    live batches are held back (up to max_lines) and the lines below the view are read from
+    the file as the user scrolls down, until they meet the held batches.
+    """
+
+    PAGE_LINES = 200   # Lines read from disk per scroll-back page, and per startup segment
+    TRIM_CHUNK = 500   # Lines allowed above the cap before the top is trimmed
+
+    def __init__(self, textbox, log_file: str, max_lines: int = 2000):
+        """
+        Args:
+            textbox: The CTkTextbox showing the log
+            log_file: Log file backing the view
+            max_lines: Lines kept in the widget while following the live tail
+        """
+        self.textbox = textbox
+        self.log_file = log_file
+        self.reader = LogTailReader(log_file)
+        self.max_lines = max_lines
+        self._segments = deque()     # [line_count, file_offset or None], top to bottom
+        self._line_count = 0
+        self._tail_end = 0           # End of the file when the tail was loaded
+        self._detached = False
+        self._bottom_offset: Optional[int] = None   # While detached: file offset past the last line shown
+        self._held = deque()         # While detached: [runs, line_count, file_offset] live batches
+        self._held_lines = 0
+
+    @property
+    def top_offset(self) -> int:
+        """File offset of the oldest line in the widget; 0 once nothing older can be paged in."""
+        if not self._segments:
+            return self._tail_end
+        return self._segments[0][1] or 0
+
+    def load_tail(self) -> None:
+        """Replaces the widget contents with the last max_lines lines of the log file."""
+        self._segments.clear()
+        self._line_count = 0
+        self._detached = False
+        self._bottom_offset = None
+        self._held.clear()
+        self._held_lines = 0
+        self.textbox.configure(state="normal")
+        self.textbox.delete("0.0", "end")
+        try:
+            lines, self._tail_end = self.reader.tail(self.max_lines)
+            for start in range(0, len(lines), self.PAGE_LINES):
+                page = lines[start:start + self.PAGE_LINES]
+                self.textbox.insert("end", self._join(page))
+                self._segments.append([len(page), page[0][0]])
+                self._line_count += len(page)
+        except Exception as e:
+            logging.exception("Failed to load log file.")
+            self.textbox.insert("0.0", f"Failed to load log file.\nError: {e}")
+        self.textbox.configure(state="disabled")
+        self.textbox.see("end")
+
+    def append(self, runs: List[Tuple[str, Optional[str]]], file_offset: Optional[int] = None) -> None:
+        """
+        Appends live log text as one segment, with a single state toggle.
+        Scrolls to the end and trims the top only while the user is following the tail.
+
+        Args:
+            runs: (text, tag) pairs; each text is one or more newline-terminated lines
+            file_offset: Offset of the first line's record in the log file, if known
+        """
+        following = self.is_following()
+        lines = sum(text.count("\n") for text, _ in runs)
+        if self.reader.refresh():
+            self._forget_offsets()
+        if self._detached:
+            self._hold(runs, lines, file_offset)
+            return
+
+        self.textbox.configure(state="normal")
+        for text, tag in runs:
+            self.textbox.insert("end", text, tag)
+        if lines:
+            self._segments.append([lines, file_offset])
+            self._line_count += lines
+        if following:
+            self._trim_top()
+        self.textbox.configure(state="disabled")
+
+        if following:
+            self.textbox.see("end")
+
+    def page_older(self) -> bool:
+        """
+        Reads the page of history just above the widget contents if the view is at the top.
+        Trims the newest lines if that takes the widget past its cap.
+
+        Returns:
+            bool: True if lines were added
+        """
+        if self.top_offset <= 0 or self.textbox.yview()[0] > 0.0:
+            return False
+        if self.reader.refresh():
+            self._forget_offsets()
+            return False
+        if self.top_offset > self.reader.size:
+            # The lines just above are still in the writer's buffer
+            return False
+        try:
+            lines = self.reader.lines_before(self.top_offset, self.PAGE_LINES)
+        except Exception as e:
+            logging.error(f"Failed to page older log lines: {e}")
+            return False
+        if not lines:
+            return False
+
+        self.textbox.configure(state="normal")
+        self.textbox.insert("1.0", self._join(lines))
+        self._segments.appendleft([len(lines), lines[0][0]])
+        self._line_count += len(lines)
+        self._trim_bottom()
+        self.textbox.configure(state="disabled")
+        # Keep the previously top line in place rather than jumping to the new page
+        self.textbox.yview(f"{len(lines) + 1}.0")
+        return True
+
+    def page_newer(self) -> bool:
+        """
+        While detached, reads the page of history just below the widget contents if the view
+        is at the bottom, and reattaches to the live tail once the held live lines are reached.
+
+        Returns:
+            bool: True if lines were added
+        """
+        if not self._detached or not self.is_following():
+            return False
+        if self.reader.refresh() or self._bottom_offset is None:
+            # Where the view stopped can no longer be found in the file; jump back to the tail
+            self.load_tail()
+            return True
+        end = self._held[0][2] if self._held else None
+        if self._held and end is None:
+            self.load_tail()
+            return True
+        try:
+            lines = self.reader.lines_after(self._bottom_offset, self.PAGE_LINES, end)
+        except Exception as e:
+            logging.error(f"Failed to page newer log lines: {e}")
+            return False
+
+        self.textbox.configure(state="normal")
+        if lines:
+            self.textbox.insert("end", self._join(lines))
+            self._segments.append([len(lines), lines[0][0]])
+            self._line_count += len(lines)
+            self._bottom_offset = lines[-1][0] + len(lines[-1][1])
+        if end is None or self._bottom_offset >= end:
+            # Caught up with the live lines received while detached
+            for runs, count, file_offset in self._held:
+                for text, tag in runs:
+                    self.textbox.insert("end", text, tag)
+                self._segments.append([count, file_offset])
+                self._line_count += count
+            self._held.clear()
+            self._held_lines = 0
+            self._detached = False
+            self._bottom_offset = None
+        self._trim_top()
+        self.textbox.configure(state="disabled")
+        return bool(lines) or not self._detached
+
+    def is_following(self) -> bool:
+        """True if the view is scrolled to the end."""
+        return self.textbox.yview()[1] >= 1.0
+
+    def _trim_top(self) -> None:
+        """Drops whole segments from the top once the cap is exceeded by a chunk. Widget must be writable."""
+        if self._line_count <= self.max_lines + self.TRIM_CHUNK:
+            return
+        removed = 0
+        while len(self._segments) > 1 and self._line_count - removed - self._segments[0][0] >= self.max_lines:
+            removed += self._segments.popleft()[0]
+        if removed:
+            self.textbox.delete("1.0", f"{removed + 1}.0")
+            self._line_count -= removed
+
+    def _trim_bottom(self) -> None:
+        """
+        Drops whole segments from the bottom once the cap is exceeded by a chunk, detaching the
+        view from the live tail. Widget must be writable.
+        """
+        if self._line_count <= self.max_lines + self.TRIM_CHUNK:
+            return
+        removed = 0
+        while len(self._segments) > 1 and self._line_count - removed - self._segments[-1][0] >= self.max_lines:
+            count, self._bottom_offset = self._segments.pop()
+            removed += count
+        if removed:
+            self.textbox.delete(f"{self._line_count - removed + 1}.0", "end")
+            self._line_count -= removed
+            self._detached = True
+
+    def _hold(self, runs: List[Tuple[str, Optional[str]]], lines: int, file_offset: Optional[int]) -> None:
+        """Keeps a live batch for when the detached view scrolls back down, dropping the oldest past the cap."""
+        self._held.append([runs, lines, file_offset])
+        self._held_lines += lines
+        while len(self._held) > 1 and self._held_lines - self._held[0][1] >= self.max_lines:
+            # Dropped batches are still in the file and are paged in from there
+            self._held_lines -= self._held.popleft()[1]
+
+    def _forget_offsets(self) -> None:
+        """Detaches the shown lines from the log file after it was rotated or truncated."""
+        for segment in self._segments:
+            segment[1] = None
+        for batch in self._held:
+            batch[2] = None
+        self._bottom_offset = None
+        self._tail_end = 0
+
+    @staticmethod
+    def _join(lines: List[LogLine]) -> str:
+        text = b"".join(line for _, line in lines).decode("utf-8", errors="replace").replace("\r\n", "\n")
+        return text if text.endswith("\n") else text + "\n"
@@ -0,0 +1,659 @@
+"""
+Single logging configuration for the application.
+Every entry point calls configure_logging(); the first call installs a file handler that
+rotates on size and at midnight, compresses rotated files on a background thread and keeps
+the log directory under a disk-usage ceiling, plus a console handler. Only the main
+application rotates: helper processes that write to the same file pass rotate=False and
+append without keeping the file open, so they never race the main process's rotation.
+
+The root logger only has a QueueHandler; before records are queued, a LogFloodFilter
+collapses repeats of the same message from the same call site and rate-limits chatty
+sources. Formatting and writing happen on a QueueListener thread, and the file handler
+batches writes, flushing on size or interval. ERROR and above are flushed before the
+logging call returns.
+
+enable_structured_log() adds an optional JSON-lines sink next to the text log, which
+log_query.py indexes and searches. Records can carry `event` and `duration_ms` fields
+through `extra`.
+"""
+
+import atexit
+import gzip
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+LOG_DIR = "logs"
+LOG_FILE = os.path.join(LOG_DIR, "quicklinks.log")
+STRUCTURED_LOG_FILE = os.path.join(LOG_DIR, "quicklinks.jsonl")
+FILE_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+CONSOLE_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+# Rotation and retention defaults
+MAX_BYTES = 10 * 1024 * 1024
+MAX_TOTAL_BYTES = 200 * 1024 * 1024
+
+# Write batching defaults
+FLUSH_BYTES = 64 * 1024
+FLUSH_INTERVAL_SECONDS = 1.0
+
+# Longest an ERROR call waits for its record to reach the disk
+SYNC_FLUSH_TIMEOUT_SECONDS = 2.0
+
+# Flood control defaults: per-logger token bucket for records below WARNING, and how often a
+# long run of repeats is summarised while it is still going
+RATE_PER_SECOND = 20.0
+RATE_BURST = 100
+REPEAT_SUMMARY_SECONDS = 300.0
+# A run of repeats or rate-limited records that has gone quiet this long is summarised by a timer
+SUMMARY_IDLE_SECONDS = 10.0
+
+_configured = False
+_config_lock = threading.Lock()
+_listener: Optional["_FlushingQueueListener"] = None
+_flood_filter: Optional["LogFloodFilter"] = None
+_structured_handler: Optional[logging.Handler] = None
+_summary_stop = threading.Event()
+
+
+class LogArchiver:
+    """
+    Compresses rotated log files and enforces the disk-usage ceiling on a background thread,
+    so rotation never blocks the thread that happened to log the record that triggered it.
+    """
+
+    def __init__(self, log_file: str, max_total_bytes: int = MAX_TOTAL_BYTES):
+        """
+        Args:
+            log_file: Active log file; rotated files are its siblings named <log_file>.<suffix>
+            max_total_bytes: Ceiling for the active file plus all rotated files
+        """
+        self.log_file = log_file
+        self.max_total_bytes = max_total_bytes
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="LogArchiver", daemon=True)
+        self._thread.start()
+        # Finish work an earlier run left behind, e.g. rotated files it never compressed
+        for path in self.rotated_files():
+            if not path.endswith(".gz"):
+                self._queue.put(path)
+        self._queue.put(None)
+
+    def submit(self, rotated_path: str) -> None:
+        """Queues a freshly rotated file for compression."""
+        self._queue.put(rotated_path)
+
+    def rotated_files(self) -> List[str]:
+        """Returns rotated files belonging to the log, oldest first."""
+        directory = os.path.dirname(self.log_file) or "."
+        prefix = os.path.basename(self.log_file) + "."
+        paths = [
+            os.path.join(directory, name)
+            for name in os.listdir(directory)
+            if name.startswith(prefix) and not name.endswith(".tmp")
+        ]
+        return sorted(paths, key=os.path.getmtime)
+
+    def _run(self) -> None:
+        while True:
+            path = self._queue.get()
+            try:
+                if path is not None:
+                    self._compress(path)
+                self._enforce_ceiling()
+            except Exception as e:
+                # Logging from here could recurse into the handler that is rotating
+                print(f"Log archiver error: {e}", file=sys.stderr)
+
+    def _compress(self, path: str) -> None:
+        """Gzips a rotated file next to itself and removes the original."""
+        if not os.path.exists(path) or path.endswith(".gz"):
+            return
+        temp_path = path + ".gz.tmp"
+        with open(path, "rb") as src, gzip.open(temp_path, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.replace(temp_path, path + ".gz")
+        os.remove(path)
+
+    def _enforce_ceiling(self) -> None:
+        """Deletes the oldest rotated files until the log and its archives fit under the ceiling."""
+        rotated = self.rotated_files()
+        total = sum(os.path.getsize(p) for p in rotated)
+        if os.path.exists(self.log_file):
+            total += os.path.getsize(self.log_file)
+        for path in rotated:
+            if total <= self.max_total_bytes:
+                break
+            total -= os.path.getsize(path)
+            os.remove(path)
+
+
+class RotatingCompressedFileHandler(logging.handlers.BaseRotatingHandler):
+    """
+    File handler that rotates when the file reaches max_bytes and at local midnight.
+    Rotation only renames the file (to <file>.YYYYmmdd-HHMMSS); compression and cleanup
+    are handed to a LogArchiver.
+
+    Writes are batched: the stream is flushed once flush_bytes are pending, by a timer every
+    flush_interval seconds, and immediately for ERROR and above.
+
+    With record_offsets, each record is given a `log_offset` attribute: the byte offset its
+    line starts at in the current file (once flushed), so handlers after this one (the log
+    view) can find the line on disk without re-reading the file.
+    """
+
+    # After a failed rename (e.g. the file is briefly open elsewhere on Windows), retry after this delay
+    RETRY_SECONDS = 30
+
+    def __init__(self, filename: str, max_bytes: int = MAX_BYTES, rotate_daily: bool = True,
+                 archiver: Optional[LogArchiver] = None, encoding: str = "utf-8",
+                 flush_bytes: int = FLUSH_BYTES, flush_interval: float = FLUSH_INTERVAL_SECONDS,
+                 record_offsets: bool = False):
+        super().__init__(filename, "a", encoding=encoding)
+        self.max_bytes = max_bytes
+        self.record_offsets = record_offsets
+        self.rotate_daily = rotate_daily
+        self.archiver = archiver
+        self.flush_bytes = flush_bytes
+        self._next_midnight = self._compute_next_midnight()
+        self._retry_at = 0.0
+        # Tracked here because tell() on a text stream flushes its buffer
+        self._size = os.path.getsize(self.baseFilename) if os.path.exists(self.baseFilename) else 0
+        self._pending_bytes = 0
+        self._flusher_stop = threading.Event()
+        self._flusher = threading.Thread(
+            target=self._flush_periodically, args=(flush_interval,), name="LogFlusher", daemon=True
+        )
+        self._flusher.start()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            if self.shouldRollover(record):
+                self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+            msg = self.format(record) + self.terminator
+            if self.record_offsets:
+                record.log_offset = self._size
+            self.stream.write(msg)
+            # Bytes on disk: encoded length, with text mode writing each newline as os.linesep
+            size = len(msg.encode(self.encoding or "utf-8", errors="replace"))
+            size += msg.count("\n") * (len(os.linesep) - 1)
+            self._size += size
+            self._pending_bytes += size
+            if record.levelno >= logging.ERROR or self._pending_bytes >= self.flush_bytes:
+                self.flush()
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        super().flush()
+        self._pending_bytes = 0
+
+    def close(self) -> None:
+        self._flusher_stop.set()
+        super().close()
+
+    def _flush_periodically(self, interval: float) -> None:
+        while not self._flusher_stop.wait(interval):
+            self.acquire()
+            try:
+                if self._pending_bytes:
+                    self.flush()
+            finally:
+                self.release()
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        now = time.time()
+        if now < self._retry_at:
+            return False
+        if self.rotate_daily and now >= self._next_midnight:
+            return True
+        return self.max_bytes > 0 and self._size >= self.max_bytes
+
+    def doRollover(self) -> None:
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+
+        rotated = f"{self.baseFilename}.{datetime.now():%Y%m%d-%H%M%S}"
+        suffix = 1
+        while os.path.exists(rotated) or os.path.exists(rotated + ".gz"):
+            rotated = f"{self.baseFilename}.{datetime.now():%Y%m%d-%H%M%S}-{suffix}"
+            suffix += 1
+
+        try:
+            if os.path.exists(self.baseFilename):
+                self.rotate(self.baseFilename, rotated)
+        except OSError as e:
+            print(f"Log rotation failed, retrying later: {e}", file=sys.stderr)
+            self._retry_at = time.time() + self.RETRY_SECONDS
+            rotated = None
+
+        self._next_midnight = self._compute_next_midnight()
+        self.stream = self._open()
+        self._size = os.path.getsize(self.baseFilename)
+        self._pending_bytes = 0
+        if rotated and self.archiver is not None:
+            self.archiver.submit(rotated)
+
+    @staticmethod
+    def _compute_next_midnight() -> float:
+        tomorrow = datetime.now().date() + timedelta(days=1)
+        return datetime.combine(tomorrow, datetime.min.time()).timestamp()
+
+
+class AppendingFileHandler(logging.FileHandler):
+    """
+    Appends each record and closes the file again, for processes that share the log file
+    with the main application. Holding no handle lets the main process rename the file on
+    Windows; the next record then goes to the new file.
+    """
+
+    def __init__(self, filename: str, encoding: str = "utf-8"):
+        super().__init__(filename, "a", encoding=encoding, delay=True)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            super().emit(record)
+        finally:
+            self.close()
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """
+    Formats a record as one JSON object per line.
+
+    The line always starts with ts, level and module, in that order, so log_query.py can
+    index a file without fully parsing every line. `event` and `duration_ms` are included
+    when the record was logged with them in `extra`.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "module": record.module,
+            "logger": record.name,
+            "thread": record.threadName,
+            "func": record.funcName,
+            "line": record.lineno,
+            "message": record.getMessage()
+        }
+        event = getattr(record, "event", None)
+        if event:
+            data["event"] = event
+        duration_ms = getattr(record, "duration_ms", None)
+        if duration_ms is not None:
+            data["duration_ms"] = round(duration_ms, 1)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data["exc"] = record.exc_text
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+class _RepeatRun:
+    """Latest message from one call site and how many identical repeats were suppressed."""
+    __slots__ = ("message", "levelno", "func", "count", "summarized_at", "last_at")
+
+    def __init__(self, message: str, levelno: int, func: Optional[str], now: float):
+        self.message = message
+        self.levelno = levelno
+        self.func = func
+        self.count = 0
+        self.summarized_at = now
+        self.last_at = now
+
+
+class _TokenBucket:
+    __slots__ = ("tokens", "updated", "dropped")
+
+    def __init__(self, burst: float, now: float):
+        self.tokens = burst
+        self.updated = now
+        self.dropped = 0
+
+
+class LogFloodFilter(logging.Filter):
+    """
+    Suppresses repetitive log output and counts what it suppresses.
+
+    - Identical consecutive records from the same call site (logger, file and line) are collapsed;
+      a "last message repeated N times" record is emitted when the message changes, and every
+      summary_interval seconds while the run continues.
+    - Records below WARNING are rate-limited per source, a logger and the module logging through
+      it, with a token bucket; a summary of the dropped count is emitted once the source is back
+      under its limit. Most modules log through the root logger, so keying on the logger alone
+      would let one noisy module drop everyone else's records.
+
+    Summaries are passed to `on_summary` (normally the handler the filter is attached to)
+    before the record that ended the run. Runs that simply stop are summarised by
+    flush_summaries(), which configure_logging() calls from a timer and at shutdown.
+    """
+
+    def __init__(self, rate_per_second: float = RATE_PER_SECOND, burst: int = RATE_BURST,
+                 rate_limits: Optional[Dict[str, Tuple[float, int]]] = None,
+                 summary_interval: float = REPEAT_SUMMARY_SECONDS,
+                 on_summary: Optional[Callable[[logging.LogRecord], None]] = None):
+        """
+        Args:
+            rate_per_second: Default sustained rate per source
+            burst: Default bucket size per source
+            rate_limits: Overrides by module or logger name -> (rate_per_second, burst); a module entry wins
+            summary_interval: Seconds between summaries of a run that has not ended
+            on_summary: Receives the summary records
+        """
+        super().__init__()
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.rate_limits = rate_limits or {}
+        self.summary_interval = summary_interval
+        self.on_summary = on_summary
+        self._lock = threading.Lock()
+        self._runs: Dict[Tuple[str, str, int], _RepeatRun] = {}
+        self._buckets: Dict[Tuple[str, str], _TokenBucket] = {}
+        self.collapsed = Counter()      # (logger name, module) -> repeats collapsed
+        self.rate_limited = Counter()   # (logger name, module) -> records dropped by the rate limit
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, "flood_summary", False):
+            return True
+
+        # Resolve the message once; the queue handler would do it next anyway
+        record.msg = record.getMessage()
+        record.args = None
+        now = time.monotonic()
+        summaries = []
+        with self._lock:
+            allowed = self._check_repeat(record, now, summaries)
+            if allowed and record.levelno < logging.WARNING:
+                allowed = self._check_rate(record, now, summaries)
+
+        if self.on_summary is not None:
+            for summary in summaries:
+                self.on_summary(summary)
+        return allowed
+
+    def flush_summaries(self, idle_seconds: float = 0.0) -> int:
+        """
+        Emits the summaries still owed for runs of repeats and rate-limited loggers that have
+        been quiet for at least `idle_seconds`; 0 flushes everything, e.g. at shutdown.
+
+        Returns:
+            int: Number of summaries emitted
+        """
+        now = time.monotonic()
+        summaries = []
+        with self._lock:
+            for (name, pathname, lineno), run in self._runs.items():
+                if run.count and now - run.last_at >= idle_seconds:
+                    summaries.append(self._make_summary(
+                        name, pathname, lineno, run.func, run.levelno,
+                        f"Last message repeated {run.count} times: {run.message}"
+                    ))
+                    run.count = 0
+                    run.summarized_at = now
+            for (name, module), bucket in self._buckets.items():
+                if bucket.dropped and now - bucket.updated >= idle_seconds:
+                    summaries.append(self._make_summary(
+                        name, "", 0, None, logging.WARNING,
+                        f"Rate limit: {bucket.dropped} records from {module} (logger '{name}') were dropped"
+                    ))
+                    bucket.dropped = 0
+
+        if self.on_summary is not None:
+            for summary in summaries:
+                self.on_summary(summary)
+        return len(summaries)
+
+    def get_stats(self) -> Dict[str, object]:
+        """Returns suppressed record counts in total and for the noisiest (logger name, module) sources."""
+        with self._lock:
+            return {
+                "collapsed": sum(self.collapsed.values()),
+                "rate_limited": sum(self.rate_limited.values()),
+                "top_collapsed": self.collapsed.most_common(5),
+                "top_rate_limited": self.rate_limited.most_common(5)
+            }
+
+    def _check_repeat(self, record: logging.LogRecord, now: float, summaries: List[logging.LogRecord]) -> bool:
+        """Returns False if the record repeats its call site's previous message. Caller holds the lock."""
+        key = (record.name, record.pathname, record.lineno)
+        run = self._runs.get(key)
+        if run is not None and run.message == record.msg and run.levelno == record.levelno:
+            run.count += 1
+            run.last_at = now
+            self.collapsed[(record.name, record.module)] += 1
+            if now - run.summarized_at >= self.summary_interval:
+                summaries.append(self._repeat_summary(record, run))
+                run.count = 0
+                run.summarized_at = now
+            return False
+
+        if run is not None and run.count:
+            summaries.append(self._repeat_summary(record, run))
+        self._runs[key] = _RepeatRun(record.msg, record.levelno, record.funcName, now)
+        return True
+
+    def _check_rate(self, record: logging.LogRecord, now: float, summaries: List[logging.LogRecord]) -> bool:
+        """Returns False if the record's source is over its rate limit. Caller holds the lock."""
+        key = (record.name, record.module)
+        rate, burst = self.rate_limits.get(record.module) or self.rate_limits.get(
+            record.name, (self.rate_per_second, self.burst))
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = _TokenBucket(burst, now)
+        bucket.tokens = min(burst, bucket.tokens + (now - bucket.updated) * rate)
+        bucket.updated = now
+        if bucket.tokens < 1:
+            # updated doubles as the time of the latest drop, for flush_summaries
+            bucket.dropped += 1
+            self.rate_limited[key] += 1
+            return False
+
+        bucket.tokens -= 1
+        if bucket.dropped:
+            summaries.append(self._summary(
+                record, logging.WARNING,
+                f"Rate limit: {bucket.dropped} records from {record.module} (logger '{record.name}') were dropped"
+            ))
+            bucket.dropped = 0
+        return True
+
+    def _repeat_summary(self, record: logging.LogRecord, run: _RepeatRun) -> logging.LogRecord:
+        return self._summary(record, run.levelno, f"Last message repeated {run.count} times: {run.message}")
+
+    @classmethod
+    def _summary(cls, record: logging.LogRecord, levelno: int, message: str) -> logging.LogRecord:
+        return cls._make_summary(record.name, record.pathname, record.lineno, record.funcName, levelno, message)
+
+    @staticmethod
+    def _make_summary(name: str, pathname: str, lineno: int, func: Optional[str], levelno: int,
+                      message: str) -> logging.LogRecord:
+        summary = logging.LogRecord(name, levelno, pathname, lineno, message, None, None, func)
+        summary.flood_summary = True
+        return summary
+
+
+class _FlushingQueueHandler(logging.handlers.QueueHandler):
+    """Queues records for the listener; ERROR and above wait until the listener has handled them."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Resolves the message and exception text so the record can cross threads, without the
+        copy and full formatting the base class does: this is the only handler on the root logger.
+        """
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if record.levelno < logging.ERROR:
+            super().emit(record)
+            return
+        record.handled_event = threading.Event()
+        super().emit(record)
+        if threading.current_thread() is not getattr(_listener, "_thread", None):
+            record.handled_event.wait(SYNC_FLUSH_TIMEOUT_SECONDS)
+
+
+class _FlushingQueueListener(logging.handlers.QueueListener):
+    """Dispatches queued records to the real handlers and releases callers waiting on ERROR records."""
+
+    def handle(self, record: logging.LogRecord) -> None:
+        try:
+            super().handle(record)
+        finally:
+            event = getattr(record, "handled_event", None)
+            if event is not None:
+                event.set()
+
+
+def _flush_summaries_periodically(flood_filter: LogFloodFilter) -> None:
+    while not _summary_stop.wait(SUMMARY_IDLE_SECONDS):
+        try:
+            flood_filter.flush_summaries(SUMMARY_IDLE_SECONDS)
+        except Exception as e:
+            print(f"Log flood summary error: {e}", file=sys.stderr)
+
+
+def _shutdown() -> None:
+    """Emits outstanding flood summaries, then drains the queue and stops the listener."""
+    _summary_stop.set()
+    if _flood_filter is not None:
+        _flood_filter.flush_summaries()
+    if _listener is not None:
+        _listener.stop()
+
+
+def get_flood_stats() -> Dict[str, object]:
+    """Returns the flood filter's suppression counts, or an empty dict if logging is not configured."""
+    return _flood_filter.get_stats() if _flood_filter is not None else {}
+
+
+def enable_structured_log(log_file: str = STRUCTURED_LOG_FILE, level: int = logging.DEBUG,
+                          max_bytes: int = MAX_BYTES, max_total_bytes: int = MAX_TOTAL_BYTES) -> logging.Handler:
+    """
+    Adds the JSON-lines sink, rotated and compressed like the text log. Later calls return the same handler.
+
+    Args:
+        log_file: Structured log file
+        level: Minimum level written
+        max_bytes: Size at which the file is rotated
+        max_total_bytes: Disk-usage ceiling for the file and its rotated archives
+
+    Returns:
+        logging.Handler: The structured log handler
+    """
+    global _structured_handler
+    with _config_lock:
+        if _structured_handler is None:
+            os.makedirs(os.path.dirname(log_file) or ".", exist_ok=True)
+            handler = RotatingCompressedFileHandler(
+                log_file,
+                max_bytes=max_bytes,
+                archiver=LogArchiver(log_file, max_total_bytes=max_total_bytes)
+            )
+            handler.setLevel(level)
+            handler.setFormatter(JsonLinesFormatter())
+            add_handler(handler)
+            _structured_handler = handler
+            logging.info(f"Structured logging enabled: {log_file}")
+    return _structured_handler
+
+
+def add_handler(handler: logging.Handler) -> None:
+    """Attaches a handler behind the logging queue, or to the root logger if logging is not configured."""
+    if _listener is None:
+        logging.getLogger().addHandler(handler)
+    else:
+        _listener.handlers = _listener.handlers + (handler,)
+
+
+def remove_handler(handler: logging.Handler) -> None:
+    """Detaches a handler added with add_handler."""
+    if _listener is None:
+        logging.getLogger().removeHandler(handler)
+    else:
+        _listener.handlers = tuple(h for h in _listener.handlers if h is not handler)
+
+
+def configure_logging(log_file: str = LOG_FILE, level: int = logging.DEBUG, console_level: int = logging.INFO,
+                      max_bytes: int = MAX_BYTES, max_total_bytes: int = MAX_TOTAL_BYTES,
+                      rotate: bool = True) -> logging.Logger:
+    """
+    Configures the root logger once per process; later calls return it unchanged.
+
+    Args:
+        log_file: Active log file
+        level: Level for the log file
+        console_level: Level for the console
+        max_bytes: Size at which the log file is rotated
+        max_total_bytes: Disk-usage ceiling for the log file and its rotated archives
+        rotate: False in helper processes, which append to the main application's log
+            without rotating it (max_bytes and max_total_bytes are then unused)
+
+    Returns:
+        logging.Logger: The root logger
+    """
+    global _configured, _listener, _flood_filter
+    root = logging.getLogger()
+    with _config_lock:
+        if _configured:
+            return root
+
+        os.makedirs(os.path.dirname(log_file) or ".", exist_ok=True)
+        if rotate:
+            file_handler = RotatingCompressedFileHandler(
+                log_file,
+                max_bytes=max_bytes,
+                archiver=LogArchiver(log_file, max_total_bytes=max_total_bytes),
+                record_offsets=True
+            )
+        else:
+            file_handler = AppendingFileHandler(log_file)
+        file_handler.setLevel(level)
+        file_handler.setFormatter(logging.Formatter(FILE_FORMAT))
+
+        console_handler = logging.StreamHandler()
+        console_handler.setLevel(console_level)
+        console_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+
+        # Replace whatever basicConfig or an earlier setup installed
+        for handler in root.handlers[:]:
+            root.removeHandler(handler)
+            handler.close()
+
+        log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        _listener = _FlushingQueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+        _listener.start()
+
+        queue_handler = _FlushingQueueHandler(log_queue)
+        _flood_filter = LogFloodFilter(on_summary=queue_handler.handle)
+        queue_handler.addFilter(_flood_filter)
+        threading.Thread(
+            target=_flush_summaries_periodically, args=(_flood_filter,), name="LogFloodSummaries", daemon=True
+        ).start()
+        # Registered after logging's own shutdown hook, so it runs first: the last summaries
+        # are queued, then the queue is drained
+        atexit.register(_shutdown)
+
+        root.setLevel(min(level, console_level))
+        root.addHandler(queue_handler)
+        _configured = True
+
+    root.info("Logging system initialized")
+    return root
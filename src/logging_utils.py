@@ -4,10 +4,10 @@ Provides consistent logging across all modules with configurable output formats
 """
 
 import logging
-import os
-from datetime import datetime
 from typing import Optional
 
+from logging_config import configure_logging
+
 class AppLogger:
     _instance: Optional['AppLogger'] = None
     _initialized = False
@@ -23,24 +23,8 @@ class AppLogger:
             AppLogger._initialized = True
 
     def _setup_logging(self):
-        # Create logs directory if it doesn't exist
-        logs_dir = 'logs'
-        if not os.path.exists(logs_dir):
-            os.makedirs(logs_dir)
-
-        # Generate log filename with timestamp
-        log_filename = os.path.join(logs_dir, f'app_{datetime.now().strftime("%Y%m%d")}.log')
-
-        # Configure logging
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S',
-            handlers=[
-                logging.FileHandler(log_filename, encoding='utf-8'),
-                logging.StreamHandler()
-            ]
-        )
+        # One configuration for the whole process: rotation, compression and a disk ceiling
+        configure_logging()
 
         # Create logger instance
         self.logger = logging.getLogger('SolutionGUI')
@@ -9,10 +9,6 @@ import sys
 import hid
 import wmi
 
-# Configure logging
-logging.basicConfig(level=logging.INFO,
-                   format='%(asctime)s - %(levelname)s - %(message)s')
-
 # Security Key USB identifiers
 SECURITY_KEYS = {
     'ZUKEY': {
@@ -0,0 +1,385 @@
+"""
+Navigation timing history for opened links.
+After each automated navigation the page's Navigation Timing and Resource Timing entries
+are summarised (DNS, TLS, time to first byte, DOMContentLoaded, load, bytes) and stored in a
+local SQLite database. Each new sample is compared with the link's recent history: a load
+time far above the historical median (by a robust z-score on the median absolute
+deviation) is flagged as an outlier and logged together with the phase that got slower.
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from constants import LINKS
+
+DEFAULT_TIMING_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config", "nav_timing.sqlite3")
+
+BASELINE_DAYS = 14
+BASELINE_MAX_SAMPLES = 200
+MIN_BASELINE_SAMPLES = 10      # No outlier flagging until a link has this much history
+OUTLIER_Z = 3.5                # Robust z-score above which a load time is an outlier
+OUTLIER_MIN_EXCESS_MS = 500    # ...and it must also be at least this much slower than the median
+PERCENTILES = (50, 90, 95)
+
+# Metrics stored per navigation, in column order, with their display names
+METRICS = (
+    ("dns_ms", "DNS"),
+    ("tls_ms", "TLS"),
+    ("ttfb_ms", "TTFB"),
+    ("dcl_ms", "DOMContentLoaded"),
+    ("load_ms", "Load"),
+)
+
+# Runs in the page; all times are milliseconds relative to the start of the navigation
+_TIMING_SCRIPT = """() => {
+    const nav = performance.getEntriesByType('navigation')[0];
+    if (!nav) return null;
+    let resourceBytes = 0, slowest = null;
+    const resources = performance.getEntriesByType('resource');
+    for (const entry of resources) {
+        resourceBytes += entry.transferSize || 0;
+        if (!slowest || entry.duration > slowest.duration) slowest = entry;
+    }
+    const load = nav.loadEventEnd || nav.loadEventStart;
+    return {
+        dns_ms: nav.domainLookupEnd - nav.domainLookupStart,
+        tls_ms: nav.secureConnectionStart > 0 ? nav.connectEnd - nav.secureConnectionStart : 0,
+        ttfb_ms: nav.responseStart - nav.startTime,
+        dcl_ms: nav.domContentLoadedEventEnd ? nav.domContentLoadedEventEnd - nav.startTime : null,
+        load_ms: load ? load - nav.startTime : null,
+        transfer_bytes: nav.transferSize || 0,
+        resource_count: resources.length,
+        resource_bytes: resourceBytes,
+        slowest_resource_ms: slowest ? slowest.duration : null,
+        slowest_resource: slowest ? slowest.name : null
+    };
+}"""
+
+_LINK_NAMES = {url: name for name, url in LINKS.items()}
+
+
+class NavigationTiming:
+    """Timing summary of one navigation."""
+
+    __slots__ = ("ts", "link", "url", "dns_ms", "tls_ms", "ttfb_ms", "dcl_ms", "load_ms", "transfer_bytes",
+                 "resource_count", "resource_bytes", "slowest_resource_ms", "slowest_resource", "outlier")
+
+    def __init__(self, link: str, url: str, ts: Optional[float] = None, outlier: bool = False, **metrics):
+        self.ts = time.time() if ts is None else ts
+        self.link = link
+        self.url = url
+        self.outlier = outlier
+        for name in self.__slots__[3:-1]:
+            setattr(self, name, metrics.get(name))
+
+
+def percentile(sorted_values: List[float], p: float) -> Optional[float]:
+    """Nearest-rank percentile of an ascending list, or None if it is empty."""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * p // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def _median_and_mad(values: List[float]) -> Tuple[float, float]:
+    ordered = sorted(values)
+    median = ordered[len(ordered) // 2]
+    deviations = sorted(abs(value - median) for value in ordered)
+    return median, deviations[len(deviations) // 2]
+
+
+class TimingStore:
+    """SQLite store of NavigationTiming samples, safe to use from several threads."""
+
+    def __init__(self, path: str = DEFAULT_TIMING_DB, retention_days: int = 90):
+        """
+        Args:
+            path: Database file
+            retention_days: Samples older than this are deleted on startup
+        """
+        self.path = path
+        self.retention_days = retention_days
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS navigation ("
+            "ts REAL NOT NULL, link TEXT NOT NULL, url TEXT NOT NULL, "
+            "dns_ms REAL, tls_ms REAL, ttfb_ms REAL, dcl_ms REAL, load_ms REAL, "
+            "transfer_bytes INTEGER, resource_count INTEGER, resource_bytes INTEGER, "
+            "slowest_resource_ms REAL, slowest_resource TEXT, outlier INTEGER NOT NULL DEFAULT 0)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS navigation_link_ts ON navigation (link, ts)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS flow_runs ("
+            "ts REAL NOT NULL, flow TEXT NOT NULL, profile TEXT NOT NULL, elapsed_ms REAL NOT NULL, "
+            "bytes INTEGER NOT NULL, requests INTEGER NOT NULL, blocked INTEGER NOT NULL, stubbed INTEGER NOT NULL)"
+        )
+        self._conn.commit()
+        self.prune()
+
+    def add(self, timing: NavigationTiming) -> Optional[str]:
+        """
+        Stores a sample, flagging it if it is an outlier against the link's history.
+
+        Returns:
+            str: Description of the slowdown if the sample is an outlier, else None
+        """
+        message = self.check_outlier(timing)
+        timing.outlier = message is not None
+        columns = NavigationTiming.__slots__
+        with self._lock:
+            self._conn.execute(
+                f"INSERT INTO navigation ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                [getattr(timing, column) for column in columns]
+            )
+            self._conn.commit()
+        return message
+
+    def check_outlier(self, timing: NavigationTiming) -> Optional[str]:
+        """Compares a sample's load time with the link's recent history; see the module docstring."""
+        if timing.load_ms is None:
+            return None
+        history = self._history(timing.link, time.time() - BASELINE_DAYS * 86400, BASELINE_MAX_SAMPLES)
+        loads = [row["load_ms"] for row in history if row["load_ms"] is not None]
+        if len(loads) < MIN_BASELINE_SAMPLES:
+            return None
+        median, mad = _median_and_mad(loads)
+        # 1.4826 scales the MAD to a standard deviation for normally distributed data
+        threshold = median + max(OUTLIER_MIN_EXCESS_MS, OUTLIER_Z * 1.4826 * mad)
+        if timing.load_ms <= threshold:
+            return None
+
+        # Name the phase that grew the most against its own median. DNS, TLS and TTFB are
+        # nested in the load time, so the rest of the load is taken as the time after the first byte.
+        phases = [(label, lambda row, metric=metric: row[metric]) for metric, label in METRICS[:3]]
+        phases.append(("after first byte", lambda row: None if row["load_ms"] is None or row["ttfb_ms"] is None
+                       else row["load_ms"] - row["ttfb_ms"]))
+        current = {metric: getattr(timing, metric) for metric, _ in METRICS}
+        worst, worst_excess = None, 0.0
+        for label, phase in phases:
+            value = phase(current)
+            values = [v for v in map(phase, history) if v is not None]
+            if value is None or not values:
+                continue
+            phase_median = _median_and_mad(values)[0]
+            if value - phase_median > worst_excess:
+                worst, worst_excess = f"{label} {value:.0f} ms vs {phase_median:.0f} ms", value - phase_median
+        message = (f"{timing.link} loaded in {timing.load_ms / 1000:.1f}s, "
+                   f"{timing.load_ms / max(median, 1):.1f}x its {median / 1000:.1f}s median")
+        return f"{message} ({worst})" if worst else message
+
+    def percentiles(self, since: float) -> Dict[str, Dict[str, object]]:
+        """
+        Per-link percentiles of every metric over samples newer than `since`.
+
+        Returns:
+            dict: link -> {"count": n, "outliers": n, "last_ts": ts, metric: {p: value}}
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT link, outlier, ts, {', '.join(metric for metric, _ in METRICS)} "
+                f"FROM navigation WHERE ts >= ? ORDER BY link", (since,)
+            ).fetchall()
+        grouped: Dict[str, List[tuple]] = {}
+        for row in rows:
+            grouped.setdefault(row[0], []).append(row)
+
+        summary = {}
+        for link, link_rows in grouped.items():
+            stats = {
+                "count": len(link_rows),
+                "outliers": sum(row[1] for row in link_rows),
+                "last_ts": max(row[2] for row in link_rows)
+            }
+            for index, (metric, _) in enumerate(METRICS, start=3):
+                values = sorted(row[index] for row in link_rows if row[index] is not None)
+                stats[metric] = {p: percentile(values, p) for p in PERCENTILES}
+            summary[link] = stats
+        return summary
+
+    def add_flow_run(self, flow: str, profile: str, elapsed_ms: float, transferred: int,
+                     requests: int, blocked: int, stubbed: int) -> None:
+        """Stores the totals of one automation flow run (see route_profiles.FlowRun)."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO flow_runs VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (time.time(), flow, profile, elapsed_ms, transferred, requests, blocked, stubbed)
+            )
+            self._conn.commit()
+
+    def flow_summary(self, since: float) -> Dict[Tuple[str, str], Dict[str, float]]:
+        """
+        Median time, bytes and request counts per flow and routing profile over runs newer than `since`.
+
+        Returns:
+            dict: (flow, profile) -> {"runs", "elapsed_ms", "bytes", "requests", "blocked", "stubbed"}
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT flow, profile, elapsed_ms, bytes, requests, blocked, stubbed FROM flow_runs WHERE ts >= ?",
+                (since,)
+            ).fetchall()
+        grouped: Dict[Tuple[str, str], List[tuple]] = {}
+        for row in rows:
+            grouped.setdefault((row[0], row[1]), []).append(row[2:])
+        summary = {}
+        for key, runs in grouped.items():
+            medians = [_median_and_mad([run[i] for run in runs])[0] for i in range(5)]
+            summary[key] = dict(zip(("elapsed_ms", "bytes", "requests", "blocked", "stubbed"), medians), runs=len(runs))
+        return summary
+
+    def recent_outliers(self, since: float, limit: int = 20) -> List[NavigationTiming]:
+        """Outlier samples newer than `since`, newest first."""
+        columns = NavigationTiming.__slots__
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(columns)} FROM navigation WHERE outlier = 1 AND ts >= ? "
+                f"ORDER BY ts DESC LIMIT ?", (since, limit)
+            ).fetchall()
+        return [NavigationTiming(**dict(zip(columns, row))) for row in rows]
+
+    def prune(self) -> None:
+        """Deletes samples past the retention period."""
+        with self._lock:
+            cutoff = time.time() - self.retention_days * 86400
+            deleted = self._conn.execute("DELETE FROM navigation WHERE ts < ?", (cutoff,)).rowcount
+            self._conn.execute("DELETE FROM flow_runs WHERE ts < ?", (cutoff,))
+            self._conn.commit()
+        if deleted:
+            logging.info(f"Pruned {deleted} navigation timing samples")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _history(self, link: str, since: float, limit: int) -> List[Dict[str, Optional[float]]]:
+        metrics = [metric for metric, _ in METRICS]
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(metrics)} FROM navigation "
+                f"WHERE link = ? AND ts >= ? ORDER BY ts DESC LIMIT ?", (link, since, limit)
+            ).fetchall()
+        return [dict(zip(metrics, row)) for row in rows]
+
+
+def link_name(url: str) -> str:
+    """Returns the LINKS name of a URL, or the URL itself for other pages."""
+    return _LINK_NAMES.get(url, url)
+
+
+async def read_navigation_timing(page, name: str) -> Optional[NavigationTiming]:
+    """
+    Reads the timing entries of the page's current document.
+
+    Args:
+        page: Page whose navigation has finished
+        name: Link name the sample is stored under
+
+    Returns:
+        NavigationTiming: The summary, or None if the page exposes no navigation entry
+    """
+    try:
+        metrics = await page.evaluate(_TIMING_SCRIPT)
+    except Exception as e:
+        logging.debug(f"Could not read navigation timing from {page.url}: {e}")
+        return None
+    if not metrics:
+        return None
+    return NavigationTiming(name, page.url, **metrics)
+
+
+async def record_navigation(page, name: Optional[str] = None, url: Optional[str] = None) -> Optional[NavigationTiming]:
+    """
+    Reads a page's navigation timing and stores it in the shared TimingStore. Runs on the
+    browser loop; the database write happens on a worker thread. Does nothing if timing
+    capture is disabled.
+
+    Args:
+        page: Page whose navigation has finished
+        name: Link name; if not given, looked up from LINKS by `url`
+        url: URL that was requested, which may differ from page.url after redirects
+
+    Returns:
+        NavigationTiming: The stored sample, or None
+    """
+    store = get_timing_store()
+    if store is None:
+        return None
+    timing = await read_navigation_timing(page, name or link_name(url or page.url))
+    if timing is None:
+        return None
+    try:
+        outlier = await asyncio.get_running_loop().run_in_executor(None, store.add, timing)
+    except Exception as e:
+        logging.warning(f"Failed to store navigation timing for {timing.link}: {e}")
+        return timing
+    logging.debug(
+        f"Navigation timing for {timing.link}: TTFB {timing.ttfb_ms or 0:.0f} ms, load {timing.load_ms or 0:.0f} ms",
+        extra={"event": "nav.timing", "duration_ms": timing.load_ms}
+    )
+    if outlier:
+        logging.warning(f"Slow page load: {outlier}", extra={"event": "nav.outlier", "duration_ms": timing.load_ms})
+    return timing
+
+
+def record_navigation_soon(page, name: Optional[str] = None, url: Optional[str] = None) -> asyncio.Task:
+    """
+    Runs record_navigation as a task on the running loop, so a navigation does not wait for
+    its timing to be read and stored. A reference to the task is kept until it finishes.
+    Only for pages left to the user: navigating or closing the page before the task has read
+    the timing loses the sample or records the next document's. Code that drives the page
+    further should await record_navigation.
+
+    Returns:
+        asyncio.Task: The task, resolving to what record_navigation returns
+    """
+    task = asyncio.get_running_loop().create_task(record_navigation(page, name, url))
+    _recording.add(task)
+    task.add_done_callback(_recording.discard)
+    return task
+
+
+_recording: Set[asyncio.Task] = set()
+_store: Optional[TimingStore] = None
+_store_enabled = True
+_store_lock = threading.Lock()
+
+
+def configure_timing_store(enabled: bool = True, **options) -> None:
+    """
+    Enables or disables timing capture and sets TimingStore options before first use.
+
+    Args:
+        enabled: Whether record_navigation stores anything
+        options: TimingStore arguments
+    """
+    global _store, _store_enabled
+    with _store_lock:
+        _store_enabled = enabled
+        if not enabled or _store is not None:
+            return
+        try:
+            _store = TimingStore(**options)
+        except sqlite3.Error as e:
+            logging.error(f"Navigation timing store unavailable: {e}")
+            _store_enabled = False
+
+
+def get_timing_store() -> Optional[TimingStore]:
+    """Returns the process-wide TimingStore, creating it on first use, or None if capture is disabled."""
+    global _store, _store_enabled
+    with _store_lock:
+        if _store is None and _store_enabled:
+            try:
+                _store = TimingStore()
+            except sqlite3.Error as e:
+                logging.error(f"Navigation timing store unavailable: {e}")
+                _store_enabled = False
+        return _store if _store_enabled else None
@@ -0,0 +1,105 @@
+"""
+Dashboard window with per-link page load percentiles, recent slow loads and automation
+flow totals, read from the navigation timing store.
+"""
+
+import logging
+import time
+from datetime import datetime
+
+import customtkinter as ctk
+
+from nav_timing import PERCENTILES, TimingStore
+
+RANGES = {"24 hours": 1, "7 days": 7, "30 days": 30}
+
+
+def _ms(value) -> str:
+    return "-" if value is None else f"{value:,.0f}"
+
+
+class LinkTimingWindow:
+    """Toplevel window summarising navigation timing per link."""
+
+    COLUMNS = ("Link", "Runs", "Slow") + tuple(f"Load p{p}" for p in PERCENTILES) + ("TTFB p50", "TTFB p95",
+                                                                                   "DNS p50", "TLS p50")
+    COLUMN_WIDTHS = (24, 6, 6, 10, 10, 10, 10, 10, 9, 9)
+
+    def __init__(self, root, store: TimingStore):
+        """
+        Args:
+            root: Parent window
+            store: Timing store to read from
+        """
+        self.root = root
+        self.store = store
+
+        self.window = ctk.CTkToplevel(root)
+        self.window.title("Link Performance")
+        self.window.geometry("980x520")
+        self.window.transient(root)
+
+        header = ctk.CTkFrame(self.window, fg_color="transparent")
+        header.pack(fill="x", padx=15, pady=(15, 5))
+        ctk.CTkLabel(header, text="Link Performance", font=("Segoe UI", 20, "bold"), anchor="w").pack(side="left")
+        ctk.CTkButton(header, text="Refresh", width=80, command=self.refresh,
+                      fg_color=("gray70", "gray30"), hover_color=("gray60", "gray40")).pack(side="right", padx=(10, 0))
+        self.range_selector = ctk.CTkSegmentedButton(header, values=list(RANGES), command=lambda _: self.refresh())
+        self.range_selector.set("7 days")
+        self.range_selector.pack(side="right")
+
+        self.table = ctk.CTkTextbox(self.window, font=("Consolas", 12), wrap="none")
+        self.table.pack(fill="both", expand=True, padx=15, pady=(5, 15))
+        self.table.tag_config("heading", foreground="#4493f8")
+        self.table.tag_config("slow", foreground="#e5534b")
+
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Re-reads the store for the selected range."""
+        since = time.time() - RANGES[self.range_selector.get()] * 86400
+        try:
+            summary = self.store.percentiles(since)
+            outliers = self.store.recent_outliers(since)
+            flows = self.store.flow_summary(since)
+        except Exception as e:
+            logging.error(f"Failed to read navigation timing: {e}")
+            summary, outliers, flows = {}, [], {}
+
+        self.table.configure(state="normal")
+        self.table.delete("1.0", "end")
+        self._insert_row(self.COLUMNS, "heading")
+        if not summary:
+            self.table.insert("end", "\nNo page loads recorded in this period.\n")
+        for link, stats in sorted(summary.items()):
+            load, ttfb = stats["load_ms"], stats["ttfb_ms"]
+            row = (link, stats["count"], stats["outliers"]) + tuple(_ms(load[p]) for p in PERCENTILES) + (
+                _ms(ttfb[50]), _ms(ttfb[95]), _ms(stats["dns_ms"][50]), _ms(stats["tls_ms"][50]))
+            self._insert_row(row, "slow" if stats["outliers"] else None)
+
+        if outliers:
+            self.table.insert("end", "\nRecent slow loads (ms)\n", "heading")
+            for timing in outliers:
+                when = datetime.fromtimestamp(timing.ts).strftime("%Y-%m-%d %H:%M")
+                detail = f"{when}  {timing.link[:24]:<24}  load {_ms(timing.load_ms):>8}  TTFB {_ms(timing.ttfb_ms):>7}"
+                if timing.slowest_resource:
+                    detail += f"  slowest resource {_ms(timing.slowest_resource_ms)} ({timing.slowest_resource[:60]})"
+                self.table.insert("end", detail + "\n", "slow")
+
+        if flows:
+            # One row per flow and routing profile, so runs with and without a profile compare side by side
+            self.table.insert("end", "\nAutomation flows (medians)\n", "heading")
+            self._insert_row(("Flow", "Runs", "", "Profile", "Time ms", "KB", "Requests", "Blocked", "Stubbed"),
+                             "heading")
+            for (flow, profile), stats in sorted(flows.items()):
+                self._insert_row((flow, stats["runs"], "", profile, _ms(stats["elapsed_ms"]),
+                                  _ms(stats["bytes"] / 1024), _ms(stats["requests"]), _ms(stats["blocked"]),
+                                  _ms(stats["stubbed"])))
+        self.table.configure(state="disabled")
+
+    def _insert_row(self, values, tag=None) -> None:
+        cells = []
+        for index, (value, width) in enumerate(zip(values, self.COLUMN_WIDTHS)):
+            text = str(value)[:width - 1]
+            cells.append(text.ljust(width) if index == 0 else text.rjust(width))
+        self.table.insert("end", "".join(cells) + "\n", tag)
@@ -0,0 +1,141 @@
+"""
+Retention and archival for notification history.
+Notifications past the configured age or count limits are rolled into gzip-compressed
+monthly JSON-lines archives that can still be queried on demand.
+"""
+
+import gzip
+import logging
+import os
+import re
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from notification_record import NotificationRecord
+
+DEFAULT_ARCHIVE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config", "archive")
+ARCHIVE_NAME_PATTERN = re.compile(r"^notifications-(\d{4}-\d{2})\.jsonl\.gz$")
+
+
+class NotificationArchive:
+    """
+    Splits notification lists by retention policy and stores the expired part
+    in one gzip archive per calendar month (notifications-YYYY-MM.jsonl.gz).
+    """
+
+    def __init__(self, archive_dir: str = DEFAULT_ARCHIVE_DIR, max_age_days: int = 30, max_count: int = 1000):
+        """
+        Args:
+            archive_dir: Directory holding the monthly archives
+            max_age_days: Notifications older than this are archived
+            max_count: At most this many of the newest notifications are kept live
+        """
+        self.archive_dir = archive_dir
+        self.max_age_days = max_age_days
+        self.max_count = max_count
+        self._write_lock = threading.Lock()
+
+    def split(self, notifications: List[NotificationRecord]) -> Tuple[List[NotificationRecord], List[NotificationRecord]]:
+        """
+        Splits notifications (oldest first) into the ones to keep and the ones to archive.
+
+        Returns:
+            tuple: (keep, expired), both in their original order
+        """
+        cutoff = self.cutoff()
+        overflow = max(0, len(notifications) - self.max_count)
+        keep, expired = [], []
+        for index, notification in enumerate(notifications):
+            if index < overflow or self.is_expired(notification, cutoff):
+                expired.append(notification)
+            else:
+                keep.append(notification)
+        return keep, expired
+
+    def cutoff(self) -> datetime:
+        """Returns the time before which notifications are past the age limit."""
+        return datetime.now() - timedelta(days=self.max_age_days)
+
+    @staticmethod
+    def is_expired(notification: NotificationRecord, cutoff: datetime) -> bool:
+        """Returns True if the notification is older than the cutoff."""
+        return notification.timestamp < cutoff.timestamp()
+
+    def append(self, notifications: Iterable[NotificationRecord]) -> int:
+        """
+        Appends notifications to their monthly archives.
+        Each call adds a new gzip member, so existing archives are never rewritten.
+
+        Returns:
+            int: Number of notifications archived
+        """
+        by_month: Dict[str, List[NotificationRecord]] = {}
+        for notification in notifications:
+            by_month.setdefault(notification.created.strftime("%Y-%m"), []).append(notification)
+
+        if not by_month:
+            return 0
+
+        os.makedirs(self.archive_dir, exist_ok=True)
+        archived = 0
+        with self._write_lock:
+            for month, items in by_month.items():
+                with gzip.open(self._path_for(month), "ab") as f:
+                    f.write(b"".join(notification.to_json() for notification in items))
+                archived += len(items)
+        logging.info(f"Archived {archived} notifications into {len(by_month)} monthly archive(s)")
+        return archived
+
+    def months(self) -> List[str]:
+        """Returns the archived months, newest first."""
+        if not os.path.isdir(self.archive_dir):
+            return []
+        months = []
+        for name in os.listdir(self.archive_dir):
+            match = ARCHIVE_NAME_PATTERN.match(name)
+            if match:
+                months.append(match.group(1))
+        return sorted(months, reverse=True)
+
+    def load_month(self, month: str) -> List[NotificationRecord]:
+        """Reads one monthly archive, oldest first."""
+        notifications = []
+        try:
+            with gzip.open(self._path_for(month), "rb") as f:
+                for line in f:
+                    if line.strip():
+                        notifications.append(NotificationRecord.from_json(line))
+        except Exception as e:
+            logging.error(f"Failed to read notification archive {month}: {e}")
+        return notifications
+
+    def query(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+              level: Optional[str] = None, limit: Optional[int] = None) -> List[NotificationRecord]:
+        """
+        Returns archived notifications, newest first, optionally filtered by time range and level.
+        Only the months overlapping the time range are decompressed.
+        """
+        results = []
+        start_epoch = start.timestamp() if start is not None else None
+        end_epoch = end.timestamp() if end is not None else None
+        for month in self.months():
+            month_start = datetime.strptime(month, "%Y-%m")
+            if start is not None and month_start < start.replace(day=1, hour=0, minute=0, second=0, microsecond=0):
+                break
+            if end is not None and month_start > end:
+                continue
+            for notification in reversed(self.load_month(month)):
+                if level is not None and notification.level.value != level:
+                    continue
+                if start_epoch is not None and notification.timestamp < start_epoch:
+                    continue
+                if end_epoch is not None and notification.timestamp > end_epoch:
+                    continue
+                results.append(notification)
+                if limit is not None and len(results) >= limit:
+                    return results
+        return results
+
+    def _path_for(self, month: str) -> str:
+        return os.path.join(self.archive_dir, f"notifications-{month}.jsonl.gz")
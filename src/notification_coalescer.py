@@ -0,0 +1,109 @@
+"""
+Coalescing and rate limiting for repetitive notifications.
+Folds repeats of the same notification into one entry and throttles desktop toasts per category.
+"""
+
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+from notification_record import NotificationLevel, NotificationRecord
+
+
+class NotificationCoalescer:
+    """
+    Fingerprints notifications and folds repeats seen within a sliding window
+    into the original entry, tracking a repeat count and last-seen time.
+    Also rate-limits desktop toasts per category and counts everything it suppresses.
+    """
+
+    def __init__(self, window_seconds: float = 60.0, toast_interval_seconds: float = 30.0):
+        """
+        Args:
+            window_seconds: Repeats arriving within this many seconds of the last occurrence are folded
+            toast_interval_seconds: Minimum time between two desktop toasts of the same category
+        """
+        self.window_seconds = window_seconds
+        self.toast_interval_seconds = toast_interval_seconds
+        self._lock = threading.Lock()
+        # fingerprint -> (notification, monotonic time last seen), oldest first
+        self._recent: "OrderedDict[Tuple[NotificationLevel, str], Tuple[NotificationRecord, float]]" = OrderedDict()
+        self._last_toast: Dict[str, float] = {}
+        self.suppressed_notifications = 0
+        self.suppressed_toasts = 0
+
+    @staticmethod
+    def fingerprint(notification: NotificationRecord) -> Tuple[NotificationLevel, str]:
+        """Returns the identity used to detect repeats: level plus whitespace-normalised message."""
+        message = re.sub(r"\s+", " ", notification.message).strip().lower()
+        return notification.level, message
+
+    def coalesce(self, notification: NotificationRecord) -> NotificationRecord:
+        """
+        Folds a notification into a recent identical one if there is one.
+
+        Returns:
+            The existing notification (updated in place) if this was a repeat,
+            otherwise the notification that was passed in.
+        """
+        key = self.fingerprint(notification)
+        now = time.monotonic()
+
+        with self._lock:
+            self._prune(now)
+            entry = self._recent.get(key)
+            if entry is not None:
+                existing = entry[0]
+                existing.count += 1
+                existing.last_seen = notification.timestamp
+                self._recent[key] = (existing, now)
+                self._recent.move_to_end(key)
+                self.suppressed_notifications += 1
+                return existing
+
+            self._recent[key] = (notification, now)
+            return notification
+
+    def allow_toast(self, category: str) -> bool:
+        """Returns True if a desktop toast for this category may be shown now."""
+        now = time.monotonic()
+        with self._lock:
+            last = self._last_toast.get(category)
+            if last is not None and now - last < self.toast_interval_seconds:
+                self.suppressed_toasts += 1
+                return False
+            self._last_toast[category] = now
+            return True
+
+    def forget(self) -> None:
+        """Drops all coalescing state, e.g. after the notification list is cleared."""
+        with self._lock:
+            self._recent.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Returns how many notifications and toasts have been suppressed."""
+        with self._lock:
+            return {
+                "suppressed_notifications": self.suppressed_notifications,
+                "suppressed_toasts": self.suppressed_toasts,
+                "tracked_fingerprints": len(self._recent),
+            }
+
+    def log_stats(self) -> None:
+        """Logs a one-line summary of suppressed events."""
+        stats = self.get_stats()
+        logging.info(
+            f"Notification coalescing: {stats['suppressed_notifications']} repeats folded, "
+            f"{stats['suppressed_toasts']} toasts rate-limited"
+        )
+
+    def _prune(self, now: float) -> None:
+        """Evicts fingerprints whose last occurrence is outside the window. Caller holds the lock."""
+        while self._recent:
+            key, (_, last_seen) = next(iter(self._recent.items()))
+            if now - last_seen <= self.window_seconds:
+                break
+            del self._recent[key]
@@ -1,15 +1,219 @@
 """
 Enhanced notification manager with better error handling, type hints, and class-based structure.
 Uses plyer by default with win10toast as fallback on Windows.
+Toasts are delivered asynchronously by a single long-lived dispatcher thread.
 """
 
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Callable
 import logging
 import platform
 import threading
+import time
+from collections import deque
 from datetime import datetime
 from plyer import notification
-from win10toast import ToastNotifier
+
+try:
+    from win10toast import ToastNotifier
+except ImportError:
+    ToastNotifier = None
+
+
+class _HistoryRecord:
+    """Compact history entry; the timestamp is kept as epoch seconds."""
+
+    __slots__ = ("seq", "title", "message", "created", "status")
+
+    def __init__(self, seq: int, title: str, message: str, status: str):
+        self.seq = seq
+        self.title = title
+        self.message = message
+        self.created = time.time()
+        self.status = status
+
+    def as_dict(self) -> Dict[str, str]:
+        """Returns the record in the historical dict format."""
+        return {
+            "title": self.title,
+            "message": self.message,
+            "timestamp": datetime.fromtimestamp(self.created).isoformat(),
+            "status": self.status
+        }
+
+
+class NotificationHistory:
+    """
+    Fixed-capacity ring buffer of history records, oldest overwritten first.
+    Keeps a secondary index of failed entries so failure queries never scan the buffer.
+    Not thread-safe; NotificationManager guards it with its history lock.
+    """
+
+    def __init__(self, capacity: int = 500):
+        self.capacity = capacity
+        self._slots: List[Optional[_HistoryRecord]] = [None] * capacity
+        # Sequence numbers stay monotonic across clear(), so a record from before a clear
+        # can never be mistaken for a newer record that took its slot
+        self._next_seq = 0
+        self._first_seq = 0
+        self._failed: Dict[int, _HistoryRecord] = {}
+
+    def append(self, title: str, message: str, status: str = "pending") -> _HistoryRecord:
+        """Adds a record, evicting the oldest one when the buffer is full."""
+        record = _HistoryRecord(self._next_seq, title, message, status)
+        index = self._next_seq % self.capacity
+        evicted = self._slots[index]
+        if evicted is not None:
+            self._failed.pop(evicted.seq, None)
+        self._slots[index] = record
+        self._next_seq += 1
+        return record
+
+    def set_status(self, record: _HistoryRecord, status: str) -> None:
+        """Updates a record's status and the failed index."""
+        record.status = status
+        if status == "failed" and self._is_live(record):
+            self._failed[record.seq] = record
+        elif self._failed.get(record.seq) is record:
+            del self._failed[record.seq]
+
+    def recent(self, limit: int) -> List[_HistoryRecord]:
+        """Returns up to `limit` records, newest first, without sorting."""
+        oldest = self._oldest_seq()
+        records = []
+        seq = self._next_seq - 1
+        while seq >= oldest and len(records) < limit:
+            records.append(self._slots[seq % self.capacity])
+            seq -= 1
+        return records
+
+    def failed(self) -> List[_HistoryRecord]:
+        """Returns the failed records still held in the buffer."""
+        return list(self._failed.values())
+
+    def clear(self) -> None:
+        self._slots = [None] * self.capacity
+        self._first_seq = self._next_seq
+        self._failed.clear()
+
+    def __len__(self) -> int:
+        return self._next_seq - self._oldest_seq()
+
+    def __iter__(self):
+        """Iterates records oldest first."""
+        for seq in range(self._oldest_seq(), self._next_seq):
+            record = self._slots[seq % self.capacity]
+            if record is not None:
+                yield record
+
+    def _oldest_seq(self) -> int:
+        return max(self._first_seq, self._next_seq - self.capacity)
+
+    def _is_live(self, record: _HistoryRecord) -> bool:
+        return self._slots[record.seq % self.capacity] is record
+
+
+class ToastRequest:
+    """A queued desktop toast."""
+
+    __slots__ = ("title", "message", "app_icon", "app_name", "timeout", "entry", "enqueued_at")
+
+    def __init__(self, title: str, message: str, app_icon: Optional[str], app_name: str,
+                 timeout: int, entry: _HistoryRecord):
+        self.title = title
+        self.message = message
+        self.app_icon = app_icon
+        self.app_name = app_name
+        self.timeout = timeout
+        self.entry = entry
+        self.enqueued_at = time.monotonic()
+
+
+class ToastDispatcher:
+    """
+    Delivers toasts from a bounded queue on a single worker thread.
+    Producers never block on delivery; when the queue is full the oldest pending toast is dropped.
+    """
+
+    def __init__(self, deliver: Callable[[ToastRequest], bool], max_queue: int = 32, latency_window: int = 256):
+        """
+        Args:
+            deliver: Blocking function that shows one toast and returns whether it was shown; runs on the worker thread
+            max_queue: Maximum number of pending toasts before the oldest is dropped
+            latency_window: Number of recent delivery latencies kept for metrics
+        """
+        self._deliver = deliver
+        self._max_queue = max_queue
+        self._queue: deque = deque()
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._latencies: deque = deque(maxlen=latency_window)
+        self.delivered = 0
+        self.failed = 0
+        self.dropped = 0
+        self._worker = threading.Thread(target=self._run, name="ToastDispatcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, request: ToastRequest) -> Optional[ToastRequest]:
+        """
+        Queues a toast for delivery without blocking.
+
+        Returns:
+            The request that was dropped to make room, if any
+        """
+        dropped = None
+        with self._condition:
+            if len(self._queue) >= self._max_queue:
+                dropped = self._queue.popleft()
+                self.dropped += 1
+            self._queue.append(request)
+            self._condition.notify()
+        return dropped
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """Stops the worker after the toast currently being delivered."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        self._worker.join(timeout=timeout)
+
+    def get_metrics(self) -> Dict[str, float]:
+        """Returns queue depth, counters and the latency (enqueue to shown) of delivered toasts in milliseconds."""
+        with self._condition:
+            latencies = sorted(self._latencies)
+            metrics = {
+                "queued": len(self._queue),
+                "delivered": self.delivered,
+                "failed": self.failed,
+                "dropped": self.dropped,
+            }
+        if latencies:
+            metrics["latency_p50_ms"] = latencies[len(latencies) // 2] * 1000
+            metrics["latency_p95_ms"] = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000
+            metrics["latency_max_ms"] = latencies[-1] * 1000
+        return metrics
+
+    def _run(self) -> None:
+        """Worker loop: delivers queued toasts one at a time."""
+        while True:
+            with self._condition:
+                while not self._queue and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                request = self._queue.popleft()
+
+            try:
+                shown = self._deliver(request)
+            except Exception as e:
+                logging.error(f"Toast delivery failed: {e}")
+                shown = False
+
+            with self._condition:
+                if shown:
+                    self.delivered += 1
+                    self._latencies.append(time.monotonic() - request.enqueued_at)
+                else:
+                    self.failed += 1
 
 
 class NotificationManager:
@@ -18,81 +222,85 @@ class NotificationManager:
     Maintains a history of notifications and provides thread-safe operations.
     """
 
-    def __init__(self):
-        """Initializes the NotificationManager with platform-specific notifiers."""
+    def __init__(self, max_queue: int = 32, history_capacity: int = 500):
+        """Initializes the NotificationManager with platform-specific notifiers and a toast dispatcher."""
         self.system = platform.system()
-        self.toaster = ToastNotifier() if self.system == "Windows" else None
-        self.history: List[Dict[str, str]] = []
+        self.toaster = ToastNotifier() if self.system == "Windows" and ToastNotifier else None
+        self.history = NotificationHistory(history_capacity)
         self.history_lock = threading.Lock()
+        self.dispatcher = ToastDispatcher(self._deliver, max_queue=max_queue)
         logging.info("NotificationManager initialized")
 
-    def show_notification(self, title: str, message: str, app_icon: Optional[str] = None, timeout: int = 5) -> None:
+    def show_notification(self, title: str, message: str, app_icon: Optional[str] = None, timeout: int = 5,
+                          app_name: str = "") -> None:
         """
-        Displays a system notification and records it in history.
+        Queues a system notification for asynchronous delivery and records it in history.
+        Never blocks on the toast itself.
 
         Args:
             title: The title of the notification
             message: The message body of the notification
             app_icon: Path to the icon file (optional)
             timeout: Duration in seconds for which the notification is displayed
+            app_name: Application name shown by the notifier (optional)
         """
         # Record notification in history
-        notification_entry = {
-            "title": title,
-            "message": message,
-            "timestamp": datetime.now().isoformat(),
-            "status": "pending"
-        }
-
         with self.history_lock:
-            self.history.append(notification_entry)
+            notification_entry = self.history.append(title, message)
 
+        dropped = self.dispatcher.submit(
+            ToastRequest(title, message, app_icon, app_name, timeout, notification_entry)
+        )
+        if dropped is not None:
+            self._update_notification_status(dropped.entry, "dropped")
+            logging.warning(f"Toast queue full, dropped notification: {dropped.title}")
+
+    def _deliver(self, request: ToastRequest) -> bool:
+        """Shows a queued notification and returns whether it was shown. Runs on the dispatcher thread."""
+        title, message, timeout = request.title, request.message, request.timeout
+        notification_entry = request.entry
         try:
             # Try plyer first
             notification.notify(
                 title=title,
                 message=message,
-                app_icon=app_icon,
+                app_name=request.app_name,
+                app_icon=request.app_icon,
                 timeout=timeout
             )
             self._update_notification_status(notification_entry, "success")
             logging.info(f"Notification shown using plyer: {title}")
+            return True
 
         except Exception as e:
-            # Fall back to win10toast on Windows
+            # Fall back to win10toast on Windows; already off the caller's thread
             if self.system == "Windows" and self.toaster:
-                try:
-                    threading.Thread(
-                        target=self._show_with_win10toast,
-                        args=(title, message, timeout, notification_entry),
-                        daemon=True
-                    ).start()
-                except Exception as e:
-                    self._update_notification_status(notification_entry, "failed")
-                    logging.error(f"Failed to show notification using win10toast: {e}")
-            else:
-                self._update_notification_status(notification_entry, "failed")
-                logging.error(f"No supported notification system available: {e}")
-
-    def _show_with_win10toast(self, title: str, message: str, timeout: int, entry: Dict[str, str]) -> None:
-        """Shows a notification using win10toast."""
+                return self._show_with_win10toast(title, message, timeout, notification_entry)
+            self._update_notification_status(notification_entry, "failed")
+            logging.error(f"No supported notification system available: {e}")
+            return False
+
+    def _show_with_win10toast(self, title: str, message: str, timeout: int, entry: _HistoryRecord) -> bool:
+        """Shows a notification using win10toast and returns whether it was shown."""
         try:
             self.toaster.show_toast(title, message, duration=timeout, threaded=True)
             self._update_notification_status(entry, "success")
             logging.info(f"Notification shown using win10toast: {title}")
+            return True
         except Exception as e:
             self._update_notification_status(entry, "failed")
             logging.error(f"Failed to show notification using win10toast: {e}")
+            return False
 
-    def _update_notification_status(self, entry: Dict[str, str], status: str) -> None:
+    def _update_notification_status(self, entry: _HistoryRecord, status: str) -> None:
         """Updates the status of a notification entry."""
         with self.history_lock:
-            entry["status"] = status
+            self.history.set_status(entry, status)
 
     def get_notification_history(self) -> List[Dict[str, str]]:
-        """Returns a copy of the notification history."""
+        """Returns a copy of the notification history, oldest first."""
         with self.history_lock:
-            return list(self.history)
+            return [record.as_dict() for record in self.history]
 
     def clear_notification_history(self) -> None:
         """Clears the notification history."""
@@ -103,23 +311,46 @@ class NotificationManager:
     def get_recent_notifications(self, limit: int = 5) -> List[Dict[str, str]]:
         """Returns the most recent notifications, up to the specified limit."""
         with self.history_lock:
-            return list(sorted(
-                self.history,
-                key=lambda x: x["timestamp"],
-                reverse=True
-            ))[:limit]
+            return [record.as_dict() for record in self.history.recent(limit)]
 
     def get_failed_notifications(self) -> List[Dict[str, str]]:
-        """Returns all failed notifications."""
+        """Returns all failed notifications still held in history."""
         with self.history_lock:
-            return [n for n in self.history if n["status"] == "failed"]
+            return [record.as_dict() for record in self.history.failed()]
+
+
+_manager: Optional[NotificationManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_notification_manager() -> NotificationManager:
+    """Returns the process-wide NotificationManager, creating it on first use."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = NotificationManager()
+        return _manager
+
+
+def stop_notification_manager() -> Optional[Dict[str, float]]:
+    """
+    Stops the toast dispatcher of the process-wide NotificationManager, if one was created.
+
+    Returns:
+        dict: The dispatcher's final metrics, or None if there is no manager
+    """
+    with _manager_lock:
+        manager = _manager
+    if manager is None:
+        return None
+    manager.dispatcher.stop()
+    return manager.dispatcher.get_metrics()
 
 
 # For backwards compatibility
 def show_notification(title: str, message: str, app_icon: Optional[str] = None, timeout: int = 5) -> None:
     """
     Legacy function for backwards compatibility.
-    Displays a system notification using the NotificationManager.
+    Queues a system notification on the shared NotificationManager.
     """
-    manager = NotificationManager()
-    manager.show_notification(title, message, app_icon, timeout)
+    get_notification_manager().show_notification(title, message, app_icon, timeout)
@@ -1,8 +1,135 @@
-import os
-import json
-import logging
+import threading
+from datetime import datetime, timedelta
+from operator import attrgetter
+
 import customtkinter as ctk
 
+from notification_archive import NotificationArchive
+from notification_search import NotificationIndex
+
+
+class _NotificationRow:
+    """A reusable notification row whose widgets are created once and rebound on scroll."""
+
+    def __init__(self, popover, master):
+        self.popover = popover
+        self.notification = None
+
+        self.frame = ctk.CTkFrame(
+            master,
+            fg_color=("gray92", "gray17"),
+            corner_radius=10,
+            height=popover.ROW_HEIGHT - 8
+        )
+        self.frame.grid_propagate(False)
+        self.frame.grid_columnconfigure(1, weight=1)
+
+        # Icon with background
+        self.icon_frame = ctk.CTkFrame(
+            self.frame,
+            corner_radius=8,
+            width=32,
+            height=32
+        )
+        self.icon_frame.grid(row=0, column=0, rowspan=2, padx=(10, 8), pady=10, sticky="ns")
+        self.icon_frame.grid_propagate(False)
+
+        self.icon_label = ctk.CTkLabel(
+            self.icon_frame,
+            text="",
+            font=("Segoe UI", 14)
+        )
+        self.icon_label.place(relx=0.5, rely=0.5, anchor="center")
+
+        # Message with improved typography
+        self.message_label = ctk.CTkLabel(
+            self.frame,
+            text="",
+            font=("Segoe UI", 12),
+            justify="left",
+            anchor="w"
+        )
+        self.message_label.grid(row=0, column=1, padx=(0, 10), pady=(8, 0), sticky="w")
+
+        # Info container
+        info_frame = ctk.CTkFrame(self.frame, fg_color="transparent")
+        info_frame.grid(row=1, column=1, padx=(0, 10), pady=(2, 8), sticky="w")
+
+        # Category pill
+        self.category_frame = ctk.CTkFrame(
+            info_frame,
+            corner_radius=12,
+            height=22
+        )
+        self.category_frame.pack(side="left", padx=(0, 8))
+
+        self.category_label = ctk.CTkLabel(
+            self.category_frame,
+            text="",
+            font=("Segoe UI", 10)
+        )
+        self.category_label.pack(padx=8, pady=2)
+
+        # Timestamp
+        self.time_label = ctk.CTkLabel(
+            info_frame,
+            text="",
+            font=("Segoe UI", 10),
+            text_color=("gray45", "gray65")
+        )
+        self.time_label.pack(side="left")
+
+        # Bindings are made once and always act on the currently bound notification
+        for widget in [self.frame, self.message_label, self.time_label, self.category_frame, self.icon_frame]:
+            widget.bind("<Enter>", self._on_enter)
+            widget.bind("<Leave>", self._on_leave)
+            widget.bind("<Button-1>", self._on_click)
+            popover._bind_scroll(widget)
+
+    def bind(self, notification):
+        """Rebinds the row widgets to display the given notification."""
+        if notification is self.notification:
+            # Same record still in this slot; only its read state or repeat count can have changed
+            self.refresh_state()
+            return
+        self.notification = notification
+        level = notification.level.value
+        style = self.popover.NOTIFICATION_ICONS.get(level, self.popover.NOTIFICATION_ICONS["info"])
+        tint = self.popover._get_tint(style["color"])
+
+        self.icon_frame.configure(fg_color=tint)
+        self.icon_label.configure(text=style["symbol"], text_color=style["color"])
+        self.message_label.configure(text=self.popover._truncate(notification.message))
+        self.category_frame.configure(fg_color=tint)
+        self.category_label.configure(text=level.capitalize(), text_color=style["color"])
+        self.refresh_state()
+
+    def refresh_state(self):
+        """Updates the row background and timestamp to reflect read state and repeats."""
+        if self.notification is not None:
+            self.frame.configure(fg_color=self.popover._row_color(self.notification))
+            self.time_label.configure(text=self.popover._format_time(self.notification))
+
+    def show(self):
+        self.frame.pack(fill="x", padx=8, pady=4)
+
+    def hide(self):
+        self.notification = None
+        self.frame.pack_forget()
+
+    def _on_enter(self, event):
+        if self.notification is not None:
+            self.frame.configure(fg_color=("gray88", "gray22"))
+
+    def _on_leave(self, event):
+        if self.notification is not None:
+            self.frame.configure(fg_color=self.popover._row_color(self.notification))
+
+    def _on_click(self, event):
+        if self.notification is not None:
+            self.popover._mark_notification_as_read(self.notification, self)
+
+
 class NotificationPopover:
     NOTIFICATION_ICONS = {
         "error": {"symbol": "⛔", "color": "#EF4444"},
@@ -11,6 +138,29 @@ class NotificationPopover:
         "success": {"symbol": "✅", "color": "#10B981"}
     }
 
+    # Virtualized list geometry: rows have a fixed height so the visible
+    # slice can be computed from the scroll offset alone.
+    ROW_HEIGHT = 72
+    VISIBLE_ROWS = 4
+    MAX_MESSAGE_LENGTH = 70
+
+    # Incremental patches arriving within one frame are applied in a single UI pass
+    PATCH_FLUSH_MS = 16
+
+    # Most archived notifications loaded when the "archived" filter is selected
+    ARCHIVE_QUERY_LIMIT = 1000
+
+    # Search runs once typing pauses and shows at most this many hits
+    SEARCH_DEBOUNCE_MS = 150
+    SEARCH_RESULT_LIMIT = 500
+    SEARCH_TIME_RANGES = {
+        "any time": None,
+        "last hour": timedelta(hours=1),
+        "last 24h": timedelta(days=1),
+        "last 7 days": timedelta(days=7),
+        "last 30 days": timedelta(days=30)
+    }
+
     def __init__(self, root, app):
         self.root = root
         self.app = app
@@ -18,6 +168,22 @@ class NotificationPopover:
         self.window = None
         self.current_filter = "all"  # Filter state
         self.sort_order = "newest"   # Sort state
+        self._view = []              # Filtered and sorted notifications
+        self._first_index = 0        # Index into _view of the top visible row
+        self._rows = []              # Fixed pool of row widgets
+        self._tint_cache = {}
+        self._pending_patches = []   # (op, notification) queued by producer threads
+        self._patch_lock = threading.Lock()
+        self._flush_scheduled = False
+        self._archived = []          # Archived notifications, loaded on demand
+        self._loading_older = False  # A page of older notifications is being read
+        self.search_query = ""       # Full-text query over the whole history
+        self.time_range = "any time" # Key into SEARCH_TIME_RANGES
+        self._search_after_id = None
+        
+        # Changes are pushed from the store as incremental patches
+        self.store = app.notification_store
+        self.store.subscribe(self._on_store_event)
         
         # Create the popover window
         self.create_popover()
@@ -55,25 +221,16 @@ class NotificationPopover:
         
         # Filter and Sort Controls
         self._create_filter_controls()
+
+        # Search box and time range
+        self._create_search_controls()
         
         # Separator
         self._create_separator()
         
-        # Scrollable notification container
-        self.notification_container = ctk.CTkScrollableFrame(
-            self.main_frame,
-            fg_color="transparent",
-            height=300
-        )
-        self.notification_container.pack(fill="both", expand=True, padx=10, pady=5)
-        
-        # Empty state label
-        self.empty_label = ctk.CTkLabel(
-            self.notification_container,
-            text="No notifications",
-            font=("Segoe UI", 12),
-            text_color=("gray60", "gray50")
-        )
+        # Virtualized notification list: a fixed pool of row widgets is
+        # rebound to whichever slice of the filtered list is in view.
+        self._create_notification_list()
 
     def _create_header_frame(self):
         """Creates the header frame with modern styling."""
@@ -134,7 +291,7 @@ class NotificationPopover:
         filter_frame.pack(fill="x", padx=10, pady=5)
         
         # Filter dropdown
-        filter_values = ["all", "unread", "error", "warning", "info", "success"]
+        filter_values = ["all", "unread", "error", "warning", "info", "success", "archived"]
         self.filter_var = ctk.StringVar(value="all")
         filter_dropdown = ctk.CTkOptionMenu(
             filter_frame,
@@ -161,6 +318,38 @@ class NotificationPopover:
         )
         sort_dropdown.pack(side="right", padx=5)
 
+    def _create_search_controls(self):
+        """Creates the search box and time range selector."""
+        search_frame = ctk.CTkFrame(
+            self.main_frame,
+            fg_color="transparent",
+            height=30
+        )
+        search_frame.pack(fill="x", padx=10, pady=(0, 5))
+
+        self.search_var = ctk.StringVar(value="")
+        self.search_var.trace_add("write", self._on_search_change)
+        search_entry = ctk.CTkEntry(
+            search_frame,
+            textvariable=self.search_var,
+            placeholder_text="Search notifications",
+            height=24,
+            font=("Segoe UI", 12)
+        )
+        search_entry.pack(side="left", fill="x", expand=True, padx=5)
+
+        self.time_range_var = ctk.StringVar(value="any time")
+        time_range_dropdown = ctk.CTkOptionMenu(
+            search_frame,
+            values=list(self.SEARCH_TIME_RANGES),
+            variable=self.time_range_var,
+            command=self._on_time_range_change,
+            width=100,
+            height=24,
+            font=("Segoe UI", 12)
+        )
+        time_range_dropdown.pack(side="right", padx=5)
+
     def _create_separator(self):
         """Creates a separator line."""
         separator = ctk.CTkFrame(
@@ -170,11 +359,151 @@ class NotificationPopover:
         )
         separator.pack(fill="x", padx=10, pady=5)
 
+    def _create_notification_list(self):
+        """Creates the virtualized notification list and its row pool."""
+        list_frame = ctk.CTkFrame(self.main_frame, fg_color="transparent")
+        list_frame.pack(fill="both", expand=True, padx=10, pady=5)
+
+        self.scrollbar = ctk.CTkScrollbar(list_frame, command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.notification_container = ctk.CTkFrame(
+            list_frame,
+            fg_color="transparent",
+            height=self.ROW_HEIGHT * self.VISIBLE_ROWS
+        )
+        self.notification_container.pack(side="left", fill="both", expand=True)
+        self.notification_container.pack_propagate(False)
+        self._bind_scroll(self.notification_container)
+
+        # Empty state label
+        self.empty_label = ctk.CTkLabel(
+            self.notification_container,
+            text="No notifications",
+            font=("Segoe UI", 12),
+            text_color=("gray60", "gray50")
+        )
+
+        self._rows = [_NotificationRow(self, self.notification_container) for _ in range(self.VISIBLE_ROWS)]
+
+    def _bind_scroll(self, widget):
+        """Routes mouse wheel events on a widget to the virtualized list."""
+        widget.bind("<MouseWheel>", self._on_mouse_wheel)
+        widget.bind("<Button-4>", lambda e: self._scroll_to(self._first_index - 1))
+        widget.bind("<Button-5>", lambda e: self._scroll_to(self._first_index + 1))
+
+    def _on_mouse_wheel(self, event):
+        """Scrolls one row per wheel notch."""
+        self._scroll_to(self._first_index - (1 if event.delta > 0 else -1))
+
+    def _on_scrollbar(self, action, value, unit=None):
+        """Handles scrollbar drags ('moveto') and arrow/page clicks ('scroll')."""
+        if action == "moveto":
+            self._scroll_to(int(round(float(value) * len(self._view))))
+        elif action == "scroll":
+            step = self.VISIBLE_ROWS if unit == "pages" else 1
+            self._scroll_to(self._first_index + int(value) * step)
+
+    def _scroll_to(self, index):
+        """Moves the top visible row to the given index and rebinds the pool."""
+        max_first = max(0, len(self._view) - self.VISIBLE_ROWS)
+        index = max(0, min(index, max_first))
+        if index != self._first_index:
+            self._first_index = index
+            self._render_rows()
+
+    def _render_rows(self):
+        """Binds the pooled rows to the visible slice of the current view."""
+        visible = self._view[self._first_index:self._first_index + self.VISIBLE_ROWS]
+        for i, row in enumerate(self._rows):
+            if i < len(visible):
+                if row.notification is None:
+                    row.show()
+                row.bind(visible[i])
+            elif row.notification is not None:
+                row.hide()
+
+        total = len(self._view)
+        if total:
+            self.scrollbar.set(self._first_index / total,
+                               min(1.0, (self._first_index + self.VISIBLE_ROWS) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+        self._maybe_load_older()
+
+    def _maybe_load_older(self):
+        """Requests the next page of persisted notifications when the view nears its older end."""
+        if self._loading_older or not self.store.has_older or self.current_filter == "archived":
+            return
+        if self._search_active():
+            # Search results already cover the whole history
+            return
+        if self.sort_order == "newest":
+            near_end = self._first_index + 2 * self.VISIBLE_ROWS >= len(self._view)
+        else:
+            near_end = self._first_index == 0
+        if not near_end:
+            return
+
+        def load():
+            try:
+                self.store.load_older()
+            finally:
+                self._loading_older = False
+
+        self._loading_older = True
+        threading.Thread(target=load, daemon=True).start()
+
     def _on_filter_change(self, value):
         """Handles filter change."""
         self.current_filter = value
+        if value == "archived":
+            self._load_archived()
+        self.update_notifications()
+
+    def _load_archived(self):
+        """Reads archived notifications on a background thread and shows them when ready."""
+        def load():
+            archived = self.store.load_archived(limit=self.ARCHIVE_QUERY_LIMIT)
+            self.root.after(0, lambda: self._show_archived(archived))
+
+        threading.Thread(target=load, daemon=True).start()
+
+    def _show_archived(self, archived):
+        """Displays archived notifications if the archived filter is still selected."""
+        self._archived = archived
+        if self.current_filter == "archived":
+            self.update_notifications()
+
+    def _on_search_change(self, *args):
+        """Debounces typing in the search box."""
+        if self._search_after_id is not None:
+            self.root.after_cancel(self._search_after_id)
+        self._search_after_id = self.root.after(self.SEARCH_DEBOUNCE_MS, self._apply_search)
+
+    def _apply_search(self):
+        """Runs the search for the current query."""
+        self._search_after_id = None
+        query = self.search_var.get().strip()
+        if query != self.search_query:
+            self.search_query = query
+            self.update_notifications()
+
+    def _on_time_range_change(self, value):
+        """Handles time range change."""
+        self.time_range = value
         self.update_notifications()
 
+    def _search_active(self):
+        """Returns True if a query or time range narrows the view."""
+        return bool(self.search_query) or self.SEARCH_TIME_RANGES.get(self.time_range) is not None
+
+    def _search_start(self):
+        """Returns the start of the selected time range, or None for any time."""
+        span = self.SEARCH_TIME_RANGES.get(self.time_range)
+        return datetime.now() - span if span is not None else None
+
     def _on_sort_change(self, value):
         """Handles sort order change."""
         self.sort_order = value
@@ -182,152 +511,222 @@ class NotificationPopover:
 
     def mark_all_as_read(self):
         """Marks all notifications as read."""
-        for notification in self.app.notifications:
-            notification["read"] = True
-        self.app.unread_notifications.clear()
-        self.update_notifications()
-        self.app.update_notification_button()
-        self._save_notifications()
-
-    def _save_notifications(self):
-        """Saves notifications to file."""
-        try:
-            config_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config")
-            notification_file = os.path.join(config_dir, "notifications.json")
-            os.makedirs(config_dir, exist_ok=True)
-            with open(notification_file, 'w') as f:
-                json.dump(self.app.notifications, f)
-        except Exception as e:
-            logging.error(f"Failed to save notifications: {e}")
-
-    def update_notifications(self):
-        """Updates the notification list based on current filter and sort settings."""
+        self.store.mark_all_read()
+
+    def update_notifications(self, preserve_scroll=False):
+        """
+        Updates the notification list based on current filter and sort settings.
+
+        Args:
+            preserve_scroll (bool): Keep the current top row in view instead of scrolling to the top.
+        """
         if not self.window or not self.notification_container:
             return
-            
-        # Clear existing notifications
-        for widget in self.notification_container.winfo_children():
-            widget.destroy()
-            
-        # Filter notifications
+
+        anchor = None
+        if preserve_scroll and self._first_index < len(self._view):
+            anchor = self._view[self._first_index]
+
+        # Filter and sort into the view backing the row pool
         filtered_notifications = self._get_filtered_notifications()
-        
-        if not filtered_notifications:
+        self._view = self._sort_notifications(filtered_notifications)
+        self._first_index = 0
+        if anchor is not None:
+            for index, item in enumerate(self._view):
+                if item is anchor:
+                    self._first_index = max(0, min(index, len(self._view) - self.VISIBLE_ROWS))
+                    break
+
+        if not self._view:
             self.empty_label.pack(pady=20)
-            self.title_label.configure(text=f"Notifications (0/{len(self.app.notifications)})")
+        else:
+            self.empty_label.pack_forget()
+        self._update_title()
+
+        self._render_rows()
+
+    def _update_title(self):
+        """Shows the row count, and whether search results are still limited to loaded notifications."""
+        text = f"Notifications ({len(self._view)}/{self.store.total_count})"
+        if self._search_active() and self.current_filter != "archived" and not self.store.search_complete:
+            text += " · indexing…"
+        self.title_label.configure(text=text)
+
+    def _on_store_event(self, event, notification):
+        """Translates notification store changes into list patches."""
+        if event == "added":
+            self.notification_added(notification)
+        elif event == "updated":
+            self.notification_updated(notification)
+        elif event == "read":
+            self.notification_read(notification)
+        elif event == "cleared":
+            self.notifications_cleared()
+        elif event == "loaded":
+            self._queue_patch("reload", None)
+        elif event == "indexed" and self._search_active():
+            # Results so far only covered the loaded notifications
+            self._queue_patch("reload", None)
+
+    def notification_added(self, notification):
+        """Queues an incremental insert of a newly added notification."""
+        self._queue_patch("add", notification)
+
+    def notification_updated(self, notification):
+        """Queues a refresh of a notification folded by the coalescer."""
+        self._queue_patch("update", notification)
+
+    def notification_read(self, notification):
+        """Queues an in-place read state update for a notification."""
+        self._queue_patch("read", notification)
+
+    def notifications_cleared(self):
+        """Queues removal of every row from the list."""
+        self._queue_patch("clear", None)
+
+    def _queue_patch(self, op, notification):
+        """Records a patch and schedules a single flush for the current frame."""
+        with self._patch_lock:
+            self._pending_patches.append((op, notification))
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+        self.root.after(self.PATCH_FLUSH_MS, self._flush_patches)
+
+    def _flush_patches(self):
+        """Applies all queued patches to the view, then rebinds the rows once."""
+        with self._patch_lock:
+            patches = self._pending_patches
+            self._pending_patches = []
+            self._flush_scheduled = False
+
+        if not self.window or not self.visible:
+            # The full view is rebuilt in show(), so patches can be dropped
             return
+
+        if self._search_active() or any(op == "reload" for op, _ in patches):
+            # The whole list was replaced, or search results must be recomputed
+            self.update_notifications(preserve_scroll=True)
+            return
+
+        read_ids = set()
+        for op, notification in patches:
+            if op == "clear":
+                self._view = []
+                self._first_index = 0
+            elif op == "add":
+                if self._matches_filter(notification):
+                    self._insert_into_view(notification)
+            elif op == "read":
+                read_ids.add(id(notification))
+            elif op == "update":
+                # A repeat makes a read notification unread again
+                if self._matches_filter(notification) and not any(n is notification for n in self._view):
+                    self._insert_into_view(notification)
+
+        if read_ids and self.current_filter == "unread":
+            # Drop newly read rows in one pass; rows elsewhere are restyled on rebind
+            self._view = [n for n in self._view if id(n) not in read_ids]
+            self._first_index = max(0, min(self._first_index, len(self._view) - self.VISIBLE_ROWS))
+
+        if not self._view:
+            self.empty_label.pack(pady=20)
         else:
             self.empty_label.pack_forget()
-            self.title_label.configure(text=f"Notifications ({len(filtered_notifications)}/{len(self.app.notifications)})")
-            
-        # Sort notifications
-        sorted_notifications = self._sort_notifications(filtered_notifications)
-        
-        # Add notifications
-        for notification in sorted_notifications:
-            self.create_notification_item(notification)
+        self._update_title()
+
+        self._render_rows()
+
+    def _matches_filter(self, notification):
+        """Returns True if the notification belongs in the current filtered view."""
+        if self.current_filter == "all":
+            return True
+        elif self.current_filter == "unread":
+            return not notification.read
+        elif self.current_filter == "archived":
+            return False
+        else:
+            return notification.level.value == self.current_filter
+
+    def _insert_into_view(self, notification):
+        """Inserts a notification at its sorted position, keeping scrolled rows stable."""
+        key = notification.timestamp
+        newest = self.sort_order == "newest"
+        lo, hi = 0, len(self._view)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            mid_key = self._view[mid].timestamp
+            if (mid_key >= key) if newest else (mid_key <= key):
+                lo = mid + 1
+            else:
+                hi = mid
+        self._view.insert(lo, notification)
+        if lo < self._first_index:
+            self._first_index += 1
 
     def _get_filtered_notifications(self):
-        """Returns filtered notifications based on current filter."""
+        """Returns filtered notifications based on current filter and search."""
+        if self.current_filter == "archived":
+            return self._search_archived() if self._search_active() else self._archived
+        if self._search_active():
+            return self._search_history()
         if self.current_filter == "all":
             return self.app.notifications
         elif self.current_filter == "unread":
             return self.app.unread_notifications
         else:
-            return [n for n in self.app.notifications if n.get("level") == self.current_filter]
+            return [n for n in self.app.notifications if n.level.value == self.current_filter]
+
+    def _search_history(self):
+        """Returns search hits from the whole history, narrowed by the current filter."""
+        level = None if self.current_filter in ("all", "unread") else self.current_filter
+        results = self.store.search(
+            self.search_query,
+            level=level,
+            start=self._search_start(),
+            limit=self.SEARCH_RESULT_LIMIT
+        )
+        if self.current_filter == "unread":
+            results = [n for n in results if not n.read]
+        return results
+
+    def _search_archived(self):
+        """Filters the loaded archived notifications by query and time range."""
+        terms = NotificationIndex.tokenize(self.search_query)
+        start = self._search_start()
+        return [
+            n for n in self._archived
+            if (start is None or not NotificationArchive.is_expired(n, start))
+            and NotificationIndex.matches(n, terms)
+        ]
 
     def _sort_notifications(self, notifications):
         """Sorts notifications based on current sort order."""
         return sorted(notifications, 
-                     key=lambda x: x.get("timestamp", ""),
+                     key=attrgetter("timestamp"),
                      reverse=(self.sort_order == "newest"))
 
-    def create_notification_item(self, notification):
-        """Creates a single notification item with enhanced modern styling."""
-        frame = ctk.CTkFrame(
-            self.notification_container,
-            fg_color=("gray92", "gray17") if not notification.get("read", False) else ("gray95", "gray13"),
-            corner_radius=10
-        )
-        frame.pack(fill="x", padx=8, pady=4)
-        
-        level = notification.get("level", "info")
-        style = self.NOTIFICATION_ICONS.get(level, self.NOTIFICATION_ICONS["info"])
-        
-        # Content grid layout
-        frame.grid_columnconfigure(1, weight=1)
-        
-        # Icon with background
-        icon_frame = ctk.CTkFrame(
-            frame,
-            fg_color=self._adjust_color(style["color"], 0.15),
-            corner_radius=8,
-            width=32,
-            height=32
-        )
-        icon_frame.grid(row=0, column=0, rowspan=2, padx=(10, 8), pady=10, sticky="ns")
-        icon_frame.grid_propagate(False)
-        
-        icon_label = ctk.CTkLabel(
-            icon_frame,
-            text=style["symbol"],
-            font=("Segoe UI", 14),
-            text_color=style["color"]
-        )
-        icon_label.place(relx=0.5, rely=0.5, anchor="center")
-        
-        # Message with improved typography
-        message_label = ctk.CTkLabel(
-            frame,
-            text=notification["message"],
-            font=("Segoe UI", 12),
-            justify="left",
-            wraplength=220,
-            anchor="w"
-        )
-        message_label.grid(row=0, column=1, padx=(0, 10), pady=(8, 0), sticky="w")
-        
-        # Info container
-        info_frame = ctk.CTkFrame(frame, fg_color="transparent")
-        info_frame.grid(row=1, column=1, padx=(0, 10), pady=(2, 8), sticky="w")
-        
-        # Category pill
-        category_frame = ctk.CTkFrame(
-            info_frame,
-            fg_color=self._adjust_color(style["color"], 0.15),
-            corner_radius=12,
-            height=22
-        )
-        category_frame.pack(side="left", padx=(0, 8))
-        
-        category_label = ctk.CTkLabel(
-            category_frame,
-            text=level.capitalize(),
-            font=("Segoe UI", 10),
-            text_color=style["color"]
-        )
-        category_label.pack(padx=8, pady=2)
-        
-        # Timestamp
-        time_label = ctk.CTkLabel(
-            info_frame,
-            text=notification["timestamp"],
-            font=("Segoe UI", 10),
-            text_color=("gray45", "gray65")
-        )
-        time_label.pack(side="left")
-        
-        # Hover effects
-        def on_enter(e):
-            frame.configure(fg_color=("gray88", "gray22"))
-            
-        def on_leave(e):
-            frame.configure(fg_color=("gray92", "gray17") if not notification.get("read", False) else ("gray95", "gray13"))
-        
-        for widget in [frame, message_label, time_label, category_frame, icon_frame]:
-            widget.bind("<Enter>", on_enter)
-            widget.bind("<Leave>", on_leave)
-            widget.bind("<Button-1>", lambda e, n=notification: self._mark_notification_as_read(n, frame))
+    def _row_color(self, notification):
+        """Returns the row background for a notification's read state."""
+        return ("gray92", "gray17") if not notification.read else ("gray95", "gray13")
+
+    def _format_time(self, notification):
+        """Returns the timestamp text, including the repeat count for coalesced notifications."""
+        if notification.count > 1:
+            return f"{notification.format_time(notification.last_seen or None)} · ×{notification.count}"
+        return notification.format_time()
+
+    def _get_tint(self, hex_color):
+        """Returns the cached icon/pill background tint for a level color."""
+        if hex_color not in self._tint_cache:
+            self._tint_cache[hex_color] = self._adjust_color(hex_color, 0.15)
+        return self._tint_cache[hex_color]
+
+    def _truncate(self, message):
+        """Clips a message so it fits in a fixed-height row."""
+        if len(message) <= self.MAX_MESSAGE_LENGTH:
+            return message
+        return message[:self.MAX_MESSAGE_LENGTH - 1] + "…"
 
     def _adjust_color(self, hex_color, alpha):
         """Adjusts color opacity by blending with the background color."""
@@ -361,15 +760,14 @@ class NotificationPopover:
         """Blend two RGB colors using alpha value."""
         return tuple(int(c1 * alpha + c2 * (1 - alpha)) for c1, c2 in zip(color1, color2))
 
-    def _mark_notification_as_read(self, notification, frame):
+    def _mark_notification_as_read(self, notification, row):
         """Marks a notification as read with visual feedback."""
-        if not notification.get("read", False):
-            notification["read"] = True
-            if notification in self.app.unread_notifications:
-                self.app.unread_notifications.remove(notification)
-            frame.configure(fg_color=("gray95", "gray13"))
-            self.app.update_notification_button()
-            self._save_notifications()
+        if self.current_filter == "archived":
+            # Archived notifications are read-only
+            return
+        if not notification.read:
+            self.store.mark_read(notification)
+            row.refresh_state()
 
     def show(self):
         """Shows the notification popover."""
@@ -381,7 +779,7 @@ class NotificationPopover:
         x = button.winfo_rootx() - self.window.winfo_width() + button.winfo_width()
         y = button.winfo_rooty() + button.winfo_height() + 5
         
-        self.window.geometry(f"300x400+{x}+{y}")
+        self.window.geometry(f"300x430+{x}+{y}")
         self.window.deiconify()
         self.visible = True
         
@@ -396,20 +794,7 @@ class NotificationPopover:
         
     def clear_all_notifications(self):
         """Clears all notifications."""
-        self.app.notifications.clear()
-        self.app.unread_notifications.clear()
-        self.update_notifications()
-        self.app.update_notification_button()
-        
-        # Save empty notifications
-        try:
-            config_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config")
-            notification_file = os.path.join(config_dir, "notifications.json")
-            os.makedirs(config_dir, exist_ok=True)
-            with open(notification_file, 'w') as f:
-                json.dump([], f)
-        except Exception as e:
-            logging.error(f"Failed to save empty notifications: {e}")
+        self.store.clear()
             
     def is_click_inside(self, x, y):
         """Checks if a click is inside the popover window."""
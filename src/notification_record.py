@@ -0,0 +1,113 @@
+"""
+Typed notification records.
+A compact record with an epoch timestamp, an enum level and a read bit, plus the one
+canonical JSON serialisation used by the store, the archive and the legacy helpers.
+"""
+
+import json
+import time
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, Optional, Union
+
+DISPLAY_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class NotificationLevel(Enum):
+    """Notification severity. Members are singletons, so records share them instead of strings."""
+    ERROR = "error"
+    WARNING = "warning"
+    INFO = "info"
+    SUCCESS = "success"
+
+    @classmethod
+    def parse(cls, value: Union[str, "NotificationLevel", None]) -> "NotificationLevel":
+        """Returns the level for a name, falling back to INFO for unknown names."""
+        if isinstance(value, cls):
+            return value
+        try:
+            return cls(value)
+        except ValueError:
+            return cls.INFO
+
+
+def parse_epoch(value: Any) -> Optional[int]:
+    """
+    Converts a stored timestamp to epoch seconds.
+    Accepts epoch numbers as well as the older dashboard ("%Y-%m-%d %H:%M:%S") and ISO strings.
+    """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return int(value)
+    try:
+        return int(datetime.fromisoformat(value).timestamp())
+    except (TypeError, ValueError):
+        return None
+
+
+class NotificationRecord:
+    """A single dashboard notification."""
+
+    __slots__ = ("message", "level", "timestamp", "read", "count", "last_seen")
+
+    def __init__(self, message: str, level: Union[str, NotificationLevel] = NotificationLevel.INFO,
+                 timestamp: Optional[int] = None, read: bool = False, count: int = 1, last_seen: int = 0):
+        """
+        Args:
+            message: Notification text
+            level: Severity, as a NotificationLevel or its name
+            timestamp: Creation time in epoch seconds; defaults to now
+            read: Whether the user has seen it
+            count: Occurrences folded into this record by the coalescer
+            last_seen: Epoch seconds of the latest folded occurrence, 0 if none
+        """
+        self.message = message
+        self.level = NotificationLevel.parse(level)
+        self.timestamp = int(time.time()) if timestamp is None else timestamp
+        self.read = read
+        self.count = count
+        self.last_seen = last_seen
+
+    def __repr__(self) -> str:
+        return (f"NotificationRecord({self.message!r}, {self.level.value}, "
+                f"{self.format_time()}, read={self.read}, count={self.count})")
+
+    @property
+    def created(self) -> datetime:
+        return datetime.fromtimestamp(self.timestamp)
+
+    def format_time(self, epoch: Optional[int] = None) -> str:
+        """Formats the creation time, or the given epoch, for display."""
+        return datetime.fromtimestamp(self.timestamp if epoch is None else epoch).strftime(DISPLAY_TIME_FORMAT)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the canonical serialisable form; repeat fields are omitted for single occurrences."""
+        data = {
+            "message": self.message,
+            "level": self.level.value,
+            "timestamp": self.timestamp,
+            "read": self.read
+        }
+        if self.count > 1:
+            data["count"] = self.count
+            data["last_seen"] = self.last_seen
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "NotificationRecord":
+        """Builds a record from the canonical form or from any older dict format."""
+        return cls(
+            data.get("message", ""),
+            data.get("level"),
+            timestamp=parse_epoch(data.get("timestamp")) or 0,
+            read=bool(data.get("read", False)),
+            count=data.get("count", 1),
+            last_seen=parse_epoch(data.get("last_seen")) or 0
+        )
+
+    def to_json(self) -> bytes:
+        """Returns the record as one newline-terminated JSON line."""
+        return (json.dumps(self.to_dict(), separators=(",", ":")) + "\n").encode("utf-8")
+
+    @classmethod
+    def from_json(cls, line: Union[bytes, str]) -> "NotificationRecord":
+        return cls.from_dict(json.loads(line))
@@ -0,0 +1,162 @@
+"""
+Full-text search over notification history.
+An inverted index over message tokens, with level and time-range facets, maintained
+incrementally as notifications are added and the history head is archived.
+"""
+
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Dict, List, Optional, Union
+
+from notification_record import NotificationLevel, NotificationRecord
+
+TOKEN_PATTERN = re.compile(r"\w+")
+LEVEL_CODES = {level: code for code, level in enumerate(NotificationLevel)}
+
+
+class NotificationIndex:
+    """
+    Indexes notifications by position in the history (oldest first).
+
+    Each posting list is a sorted array of document ids, where a document id is the
+    position plus a base that advances when the head of the history is dropped.
+    Timestamps are assumed to be non-decreasing in position order, which holds for an
+    append-only history, so time ranges resolve to position ranges by bisection.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, array] = {}
+        self._vocabulary: List[str] = []   # Sorted tokens, for prefix lookups
+        self._timestamps = array("q")      # Epoch seconds per position
+        self._levels = bytearray()         # LEVEL_CODES value per position
+        self._offsets = array("q")         # Byte offset in the history file, or -1 if not known
+        self._base = 0
+
+    def __len__(self) -> int:
+        return len(self._timestamps)
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        """Splits text into lowercase word tokens."""
+        return TOKEN_PATTERN.findall(text.lower())
+
+    @classmethod
+    def matches(cls, notification: NotificationRecord, terms: List[str]) -> bool:
+        """Returns True if every term is a prefix of some token in the message, without an index."""
+        tokens = cls.tokenize(notification.message)
+        return all(any(token.startswith(term) for token in tokens) for term in terms)
+
+    def add(self, notification: NotificationRecord, offset: int = -1) -> None:
+        """
+        Indexes a notification at the next position.
+
+        Args:
+            notification: Notification to index
+            offset: Byte offset of its line in the history file, if known
+        """
+        doc_id = self._base + len(self._timestamps)
+        for token in set(self.tokenize(notification.message)):
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = array("q")
+                self._vocabulary.insert(bisect_left(self._vocabulary, token), token)
+            postings.append(doc_id)
+
+        self._timestamps.append(notification.timestamp)
+        self._levels.append(LEVEL_CODES[notification.level])
+        self._offsets.append(offset)
+
+    def offset(self, position: int) -> int:
+        """Returns the file offset recorded for a position, or -1."""
+        return self._offsets[position]
+
+    def drop_head(self, count: int, byte_count: int) -> None:
+        """
+        Removes the oldest `count` documents, e.g. after they were archived.
+
+        Args:
+            count: Number of documents removed from the head
+            byte_count: Bytes removed from the head of the history file
+        """
+        count = min(count, len(self._timestamps))
+        if count <= 0:
+            return
+        self._base += count
+        del self._timestamps[:count]
+        del self._levels[:count]
+        self._offsets = array("q", (o - byte_count if o >= 0 else o for o in self._offsets[count:]))
+
+        for token in list(self._postings):
+            postings = self._postings[token]
+            del postings[:bisect_left(postings, self._base)]
+            if not postings:
+                del self._postings[token]
+                self._vocabulary.pop(bisect_left(self._vocabulary, token))
+
+    def search(self, query: str = "", level: Optional[Union[str, NotificationLevel]] = None,
+               start: Optional[datetime] = None, end: Optional[datetime] = None,
+               limit: Optional[int] = None) -> List[int]:
+        """
+        Finds notifications whose message contains every query term as a token prefix.
+
+        The rarest term drives the scan from newest to oldest, the other terms are checked
+        by bisection in their posting lists, and the scan stops once `limit` hits are found.
+
+        Returns:
+            list: Matching positions, newest first
+        """
+        lo = 0 if start is None else bisect_left(self._timestamps, int(start.timestamp()))
+        hi = len(self._timestamps) if end is None else bisect_right(self._timestamps, int(end.timestamp()))
+        if lo >= hi:
+            return []
+
+        level_code = LEVEL_CODES[NotificationLevel.parse(level)] if level is not None else None
+
+        term_postings = []
+        for term in dict.fromkeys(self.tokenize(query)):
+            postings = self._postings_for_prefix(term)
+            if not postings:
+                return []
+            term_postings.append(postings)
+        term_postings.sort(key=len)
+
+        if term_postings:
+            driver, others = term_postings[0], term_postings[1:]
+            first = bisect_left(driver, self._base + lo)
+            last = bisect_left(driver, self._base + hi)
+            candidates = (driver[i] - self._base for i in range(last - 1, first - 1, -1))
+        else:
+            others = []
+            candidates = range(hi - 1, lo - 1, -1)
+
+        results = []
+        for position in candidates:
+            if level_code is not None and self._levels[position] != level_code:
+                continue
+            doc_id = self._base + position
+            if all(self._contains(postings, doc_id) for postings in others):
+                results.append(position)
+                if limit is not None and len(results) >= limit:
+                    break
+        return results
+
+    def _postings_for_prefix(self, term: str) -> array:
+        """Returns the sorted ids of documents with a token starting with `term`."""
+        index = bisect_left(self._vocabulary, term)
+        tokens = []
+        while index < len(self._vocabulary) and self._vocabulary[index].startswith(term):
+            tokens.append(self._vocabulary[index])
+            index += 1
+        if len(tokens) == 1:
+            return self._postings[tokens[0]]
+        merged = set()
+        for token in tokens:
+            merged.update(self._postings[token])
+        return array("q", sorted(merged))
+
+    @staticmethod
+    def _contains(postings: array, doc_id: int) -> bool:
+        index = bisect_left(postings, doc_id)
+        return index < len(postings) and postings[index] == doc_id
@@ -0,0 +1,815 @@
+"""
+Observable store for dashboard notifications.
+Owns the notification list and its persistence, keeps the unread count incrementally
+and pushes changes to observers instead of having the UI poll for them.
+
+Notifications are persisted as JSON lines (oldest first) with a small metadata sidecar
+holding the total and unread counts. Startup reads only the newest page from the end of
+the file; older pages are loaded on demand. A search index over the whole history is
+built once on a background thread and then kept up to date incrementally.
+
+Records are addressed by sequence number, counted from the first record ever written.
+Later changes to a record (read, repeat counts) are appended to a small change journal
+instead of rewriting the file, and "mark all read" only moves a read-up-to watermark in
+the sidecar. The journal is folded back into the file once it grows past a threshold.
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Tuple
+
+from datetime import datetime
+
+from notification_archive import NotificationArchive
+from notification_record import NotificationLevel, NotificationRecord
+from notification_search import NotificationIndex
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config")
+DEFAULT_NOTIFICATION_FILE = os.path.join(CONFIG_DIR, "notifications.jsonl")
+LEGACY_NOTIFICATION_FILE = os.path.join(CONFIG_DIR, "notifications.json")
+
+
+def read_lines_backward(f: BinaryIO, end: int, count: int, block_size: int = 64 * 1024) -> List[Tuple[int, bytes]]:
+    """
+    Reads up to `count` newline-terminated lines that end at byte offset `end`, scanning backwards.
+
+    Args:
+        f: File opened in binary mode
+        end: Offset just past the last line to read; must be a line boundary
+        count: Maximum number of lines to return
+        block_size: Bytes read per backward step
+
+    Returns:
+        list: (offset, line) pairs, oldest first
+    """
+    lines = []
+    pos = end
+    buffer = b""
+    while len(lines) < count:
+        # Newline that terminates the line before the last one in the buffer
+        index = buffer.rfind(b"\n", 0, len(buffer) - 1)
+        if index >= 0:
+            lines.append((pos + index + 1, buffer[index + 1:]))
+            buffer = buffer[:index + 1]
+            continue
+        if pos == 0:
+            if buffer:
+                lines.append((0, buffer))
+            break
+        read_size = min(block_size, pos)
+        pos -= read_size
+        f.seek(pos)
+        buffer = f.read(read_size) + buffer
+    lines.reverse()
+    return lines
+
+
+class NotificationStore:
+    """
+    Holds the loaded notifications (the newest part of the history) and counts the unread ones.
+
+    Observers registered with subscribe() receive (event, notification) for every change,
+    where event is one of "added", "updated", "read", "cleared" or "loaded", and "indexed"
+    once the search index covers the whole history.
+    Observers registered with subscribe_unread() receive the unread count, only when it changes.
+    Observers are called on the thread that made the change.
+    """
+
+    # Notifications read at startup and per lazily loaded page
+    INITIAL_LOAD_COUNT = 50
+    PAGE_SIZE = 100
+    # Journal lines folded into the file by the retention thread, and inline as a last resort
+    COMPACT_AFTER_CHANGES = 1000
+    COMPACT_LIMIT_CHANGES = 10000
+    # Repeat counts from touch() are written to the journal in one batch this often
+    TOUCH_FLUSH_SECONDS = 5.0
+
+    def __init__(self, notification_file: str = DEFAULT_NOTIFICATION_FILE,
+                 archive: Optional[NotificationArchive] = None,
+                 legacy_file: Optional[str] = LEGACY_NOTIFICATION_FILE):
+        self.notification_file = notification_file
+        self.meta_file = os.path.splitext(notification_file)[0] + ".meta.json"
+        self.changes_file = os.path.splitext(notification_file)[0] + ".changes.jsonl"
+        self.legacy_file = legacy_file
+        self.archive = archive
+        self._retention_stop = threading.Event()
+        self.notifications: List[NotificationRecord] = []
+        self._loaded_unread = 0
+        self._lock = threading.RLock()
+        self._listeners: List[Callable[[str, Optional[NotificationRecord]], None]] = []
+        self._unread_listeners: List[Callable[[int], None]] = []
+        self._last_unread_count = 0
+        # Persisted notifications before the loaded tail: [0, _prefix_end) in the file
+        self._prefix_end = 0
+        self._unloaded_count = 0
+        self._unloaded_unread = 0
+        # Sequence number of the first line in the file, and the end of the archived range;
+        # records below _archived_upto are already in the archive even if still in the file
+        self._base_seq = 0
+        self._archived_upto = 0
+        self._archived_bytes = 0
+        # Changed fields per sequence number not yet folded into the file, and the read watermark:
+        # every record below _read_upto is read unless a later change says otherwise
+        self._changes: Dict[int, Dict[str, Any]] = {}
+        self._change_lines = 0
+        self._read_upto = 0
+        # Sequence numbers touched since the last flush, and the timer that will flush them
+        self._pending_touches: set = set()
+        self._touch_timer: Optional[threading.Timer] = None
+        # Search index over the whole history; rebuilt whenever the history is replaced
+        self.search_index = NotificationIndex()
+        self._index_ready = True
+        self._index_building = False
+        self._index_version = 0
+        # Bumped whenever the file is rewritten, which moves the offsets held by the index
+        self._file_generation = 0
+
+    @property
+    def unread_count(self) -> int:
+        """Unread notifications across the whole history, loaded or not."""
+        return self._loaded_unread + self._unloaded_unread
+
+    @property
+    def total_count(self) -> int:
+        """Notifications across the whole history, loaded or not."""
+        return len(self.notifications) + self._unloaded_count
+
+    @property
+    def unread_notifications(self) -> List[NotificationRecord]:
+        """The loaded notifications that are still unread, oldest first."""
+        return [n for n in self.notifications if not n.read]
+
+    @property
+    def search_complete(self) -> bool:
+        """True once search covers the whole history rather than only the loaded notifications."""
+        return self._index_ready
+
+    @property
+    def has_older(self) -> bool:
+        """True if older notifications are persisted but not loaded yet."""
+        return self._unloaded_count > 0
+
+    def subscribe(self, listener: Callable[[str, Optional[NotificationRecord]], None]) -> None:
+        """Registers an observer for notification changes."""
+        self._listeners.append(listener)
+
+    def subscribe_unread(self, listener: Callable[[int], None]) -> None:
+        """Registers an observer for unread count changes."""
+        self._unread_listeners.append(listener)
+
+    def load(self, count: Optional[int] = None) -> None:
+        """
+        Loads the newest `count` persisted notifications, replacing the current contents.
+        Reads from the end of the file, so the cost does not depend on history length.
+        """
+        count = count or self.INITIAL_LOAD_COUNT
+        try:
+            with self._lock:
+                self.flush()
+                self._migrate_legacy_file()
+                if not os.path.exists(self.notification_file):
+                    return
+                self._load_changes()
+                meta = self._read_meta()
+                self._base_seq = meta.get("base_seq", 0)
+                self._archived_upto = meta.get("archived_upto", 0)
+                self._read_upto = max(self._read_upto, meta.get("read_upto", 0))
+                with open(self.notification_file, 'rb') as f:
+                    lines = read_lines_backward(f, meta["size"], count)
+                loaded = self._decode_lines(lines)
+
+                self.notifications = loaded
+                self._prefix_end = lines[0][0] if lines else 0
+                self._unloaded_count = max(0, meta["count"] - len(loaded))
+                self._apply_changes(loaded, self._base_seq + self._unloaded_count)
+                self._loaded_unread = sum(1 for n in loaded if not n.read)
+                self._unloaded_unread = max(0, meta["unread"] - self._loaded_unread)
+                self._invalidate_index()
+        except Exception as e:
+            logging.error(f"Failed to load persistent notifications: {e}")
+            return
+        self._start_index_build()
+        self._emit("loaded", None)
+
+    def load_older(self, count: Optional[int] = None) -> int:
+        """
+        Loads the next page of older notifications in front of the loaded ones.
+
+        Returns:
+            int: Number of notifications loaded
+        """
+        count = count or self.PAGE_SIZE
+        with self._lock:
+            if not self.has_older:
+                return 0
+            try:
+                loaded = self._load_older_locked(count)
+            except Exception as e:
+                logging.error(f"Failed to load older notifications: {e}")
+                return 0
+        self._emit("loaded", None)
+        return loaded
+
+    def add(self, notification: NotificationRecord) -> None:
+        """Appends a new notification to the list and to the end of the file."""
+        with self._lock:
+            self.notifications.append(notification)
+            if not notification.read:
+                self._loaded_unread += 1
+            if self._index_ready:
+                self.search_index.add(notification)
+            self._append(notification)
+        self._emit("added", notification)
+
+    def touch(self, notification: NotificationRecord) -> None:
+        """
+        Announces a repeat folded into a loaded notification by the coalescer. A repeat is news,
+        so a notification that was already read becomes unread again. The new count is written
+        to the journal in a batch, within TOUCH_FLUSH_SECONDS or on flush().
+        """
+        with self._lock:
+            seq = self._seq_of(notification)
+            if seq is not None:
+                change = {"count": notification.count, "last_seen": notification.last_seen}
+                if notification.read:
+                    notification.read = False
+                    self._loaded_unread += 1
+                    change["read"] = False
+                self._changes.setdefault(seq, {}).update(change)
+                self._pending_touches.add(seq)
+                if self._touch_timer is None:
+                    self._touch_timer = threading.Timer(self.TOUCH_FLUSH_SECONDS, self.flush)
+                    self._touch_timer.daemon = True
+                    self._touch_timer.start()
+        self._emit("updated", notification)
+
+    def flush(self) -> None:
+        """Writes repeat counts still waiting from touch(). Call before the application exits."""
+        with self._lock:
+            if self._touch_timer is not None:
+                self._touch_timer.cancel()
+                self._touch_timer = None
+            pending = sorted(seq for seq in self._pending_touches if seq in self._changes)
+            self._pending_touches.clear()
+            if not pending:
+                return
+            try:
+                with open(self.changes_file, 'ab') as f:
+                    for seq in pending:
+                        f.write(self._change_line(seq, self._changes[seq]))
+                self._change_lines += len(pending)
+                self._write_meta()
+            except Exception as e:
+                logging.error(f"Failed to save notification changes: {e}")
+
+    def mark_read(self, notification: NotificationRecord) -> None:
+        """Marks a single notification as read."""
+        with self._lock:
+            if notification.read:
+                return
+            seq = self._seq_of(notification)
+            if seq is None:
+                # Search hits from the unloaded part of the history are read-only snapshots
+                return
+            notification.read = True
+            self._loaded_unread -= 1
+            self._record_change(seq, read=True)
+        self._emit("read", notification)
+
+    def mark_all_read(self) -> None:
+        """
+        Marks every notification as read. Only the loaded ones are touched; the rest of the
+        history is covered by moving the read watermark, so no older pages are loaded.
+        """
+        with self._lock:
+            newly_read = self.unread_notifications
+            if not newly_read and not self._unloaded_unread:
+                return
+            for notification in newly_read:
+                notification.read = True
+            self._loaded_unread = 0
+            self._unloaded_unread = 0
+            self._read_upto = self._base_seq + self.total_count
+            # Read flags in the journal are now implied by the watermark
+            for change in self._changes.values():
+                change.pop("read", None)
+            self._changes = {seq: change for seq, change in self._changes.items() if change}
+            try:
+                self._rewrite_changes()
+                self._write_meta()
+            except Exception as e:
+                logging.error(f"Failed to save notification read state: {e}")
+        for notification in newly_read:
+            self._emit("read", notification)
+
+    def clear(self) -> None:
+        """Removes all notifications."""
+        with self._lock:
+            self._base_seq += self.total_count
+            self.notifications.clear()
+            self._loaded_unread = 0
+            self._prefix_end = 0
+            self._unloaded_count = 0
+            self._unloaded_unread = 0
+            self._index_version += 1
+            self.search_index = NotificationIndex()
+            self._index_ready = True
+            self._changes.clear()
+            self.save()
+        self._emit("cleared", None)
+
+    def apply_retention(self) -> int:
+        """
+        Moves notifications past the archive's age and count limits into the archive.
+        Expired notifications are the oldest, so they are streamed from the start of the file
+        without loading the rest. Archives are written before the file is trimmed.
+
+        Returns:
+            int: Number of notifications archived
+        """
+        if self.archive is None:
+            return 0
+        try:
+            with self._lock:
+                archived = self._apply_retention_locked()
+                if self._change_lines > self.COMPACT_AFTER_CHANGES:
+                    self._compact_locked()
+        except Exception as e:
+            logging.error(f"Failed to archive notifications: {e}")
+            return 0
+        if archived:
+            self._emit("loaded", None)
+        return archived
+
+    def start_retention(self, interval_seconds: float = 3600) -> None:
+        """Applies retention now and then periodically on a background thread."""
+        def run():
+            while not self._retention_stop.is_set():
+                self.apply_retention()
+                self._retention_stop.wait(interval_seconds)
+
+        threading.Thread(target=run, name="NotificationRetention", daemon=True).start()
+
+    def stop_retention(self) -> None:
+        self._retention_stop.set()
+
+    def load_archived(self, limit: Optional[int] = None, **filters) -> List[NotificationRecord]:
+        """Returns archived notifications, newest first. See NotificationArchive.query for filters."""
+        if self.archive is None:
+            return []
+        return self.archive.query(limit=limit, **filters)
+
+    def search(self, query: str = "", level: Optional[str] = None,
+               start: Optional[datetime] = None, end: Optional[datetime] = None,
+               limit: Optional[int] = None) -> List[NotificationRecord]:
+        """
+        Searches the whole history, loaded or not. See NotificationIndex.search for matching.
+        Hits that are loaded are returned as the live notification objects; older hits are
+        read from the file by offset and are read-only snapshots.
+
+        Never waits for the index: while it is still being built only the loaded notifications
+        are searched, search_complete is False, and an "indexed" event follows when it is done.
+
+        Returns:
+            list: Matching notifications, newest first
+        """
+        with self._lock:
+            ready = self._index_ready
+            if not ready:
+                hits = self._search_loaded(query, level, start, end, limit)
+        if not ready:
+            self._start_index_build()
+            return hits
+
+        try:
+            for _ in range(3):
+                with self._lock:
+                    positions = self.search_index.search(query, level=level, start=start, end=end, limit=limit)
+                    generation = self._file_generation
+                    plan = [
+                        (position, None, self.notifications[position - self._unloaded_count])
+                        if position >= self._unloaded_count else (position, self.search_index.offset(position), None)
+                        for position in positions
+                    ]
+                # Older hits are read without holding the lock; retried if the file was rewritten meanwhile
+                lines = self._read_lines_at([offset for _, offset, loaded in plan if loaded is None])
+                with self._lock:
+                    if self._file_generation != generation:
+                        continue
+                    return self._materialize(plan, lines)
+            logging.warning("Notification history kept changing during search; returning loaded hits only")
+            with self._lock:
+                return self._search_loaded(query, level, start, end, limit)
+        except Exception as e:
+            logging.error(f"Failed to read notification search results: {e}")
+            return []
+
+    def save(self) -> None:
+        """Rewrites the file with the change journal folded in, then empties the journal."""
+        try:
+            with self._lock:
+                self._compact_locked()
+        except Exception as e:
+            logging.error(f"Failed to save notifications: {e}")
+
+    def _compact_locked(self) -> None:
+        """
+        Folds the change journal and the read watermark into the file. Only changed lines are
+        re-serialised; the rest are copied as-is. Caller holds the lock.
+        """
+        os.makedirs(os.path.dirname(self.notification_file), exist_ok=True)
+        temp_file = self.notification_file + ".tmp"
+        seq = self._base_seq
+        written = 0
+        prefix_end = 0
+        with open(temp_file, 'wb') as out:
+            if os.path.exists(self.notification_file) and self.total_count:
+                with open(self.notification_file, 'rb') as src:
+                    for line in src:
+                        if not line.strip():
+                            continue
+                        if seq in self._changes or (seq < self._read_upto and b'"read":false' in line):
+                            record = NotificationRecord.from_json(line)
+                            self._apply_changes([record], seq)
+                            line = record.to_json()
+                        out.write(line)
+                        written += len(line)
+                        seq += 1
+                        if seq - self._base_seq == self._unloaded_count:
+                            prefix_end = written
+        os.replace(temp_file, self.notification_file)
+        self._file_generation += 1
+        self._prefix_end = prefix_end
+        self._changes.clear()
+        self._read_upto = 0
+        self._rewrite_changes()
+        self._write_meta()
+        if self._index_ready and len(self.search_index):
+            # Line offsets moved; rebuild the index in the background
+            self._invalidate_index()
+            self._start_index_build()
+
+    def _seq_of(self, notification: NotificationRecord) -> Optional[int]:
+        """Returns the sequence number of a loaded notification, or None. Caller holds the lock."""
+        for index in range(len(self.notifications) - 1, -1, -1):
+            if self.notifications[index] is notification:
+                return self._base_seq + self._unloaded_count + index
+        return None
+
+    def _apply_changes(self, notifications: List[NotificationRecord], first_seq: int) -> None:
+        """Applies the read watermark and journalled changes to records read from the file."""
+        for seq, notification in enumerate(notifications, first_seq):
+            if seq < self._read_upto:
+                notification.read = True
+            change = self._changes.get(seq)
+            if change:
+                for field, value in change.items():
+                    setattr(notification, field, value)
+
+    def _record_change(self, seq: int, **fields) -> None:
+        """Journals changed fields of one record and updates the sidecar. Caller holds the lock."""
+        self._changes.setdefault(seq, {}).update(fields)
+        try:
+            with open(self.changes_file, 'ab') as f:
+                f.write(self._change_line(seq, fields))
+            self._change_lines += 1
+            self._write_meta()
+            if self._change_lines > self.COMPACT_LIMIT_CHANGES:
+                self._compact_locked()
+        except Exception as e:
+            logging.error(f"Failed to save notification change: {e}")
+
+    def _load_changes(self) -> None:
+        """Reads the change journal, keeping the latest value of each field. Caller holds the lock."""
+        self._changes = {}
+        self._change_lines = 0
+        self._read_upto = 0
+        if not os.path.exists(self.changes_file):
+            return
+        with open(self.changes_file, 'rb') as f:
+            for line in f:
+                try:
+                    fields = json.loads(line)
+                    if "read_upto" in fields:
+                        self._read_upto = max(self._read_upto, fields["read_upto"])
+                        continue
+                    seq = fields.pop("seq")
+                except (ValueError, KeyError):
+                    # A write cut short by a crash
+                    continue
+                self._changes.setdefault(seq, {}).update(fields)
+                self._change_lines += 1
+
+    def _rewrite_changes(self) -> None:
+        """Replaces the journal with one line per changed record. Caller holds the lock."""
+        temp_file = self.changes_file + ".tmp"
+        with open(temp_file, 'wb') as f:
+            if self._read_upto:
+                # Kept here as well as in the sidecar, which is only a cache
+                f.write((json.dumps({"read_upto": self._read_upto}) + "\n").encode("utf-8"))
+            for seq, change in self._changes.items():
+                f.write(self._change_line(seq, change))
+        os.replace(temp_file, self.changes_file)
+        self._change_lines = len(self._changes)
+        # Everything in memory is on disk now
+        self._pending_touches.clear()
+
+    @staticmethod
+    def _change_line(seq: int, fields: Dict[str, Any]) -> bytes:
+        return (json.dumps(dict(seq=seq, **fields), separators=(",", ":")) + "\n").encode("utf-8")
+
+    def _append(self, notification: NotificationRecord) -> None:
+        """Appends one record to the file. Caller holds the lock."""
+        try:
+            os.makedirs(os.path.dirname(self.notification_file), exist_ok=True)
+            with open(self.notification_file, 'ab') as f:
+                f.write(notification.to_json())
+            self._write_meta()
+        except Exception as e:
+            logging.error(f"Failed to save notification: {e}")
+
+    def _load_older_locked(self, count: int) -> int:
+        """Prepends up to `count` older notifications. Caller holds the lock."""
+        with open(self.notification_file, 'rb') as f:
+            lines = read_lines_backward(f, self._prefix_end, count)
+        older = self._decode_lines(lines)
+        self._apply_changes(older, self._base_seq + self._unloaded_count - len(older))
+        older_unread = sum(1 for n in older if not n.read)
+
+        self.notifications = older + self.notifications
+        self._loaded_unread += older_unread
+        self._prefix_end = lines[0][0] if lines else 0
+        self._unloaded_count = 0 if self._prefix_end == 0 else max(0, self._unloaded_count - len(older))
+        self._unloaded_unread = 0 if self._prefix_end == 0 else max(0, self._unloaded_unread - older_unread)
+        return len(older)
+
+    def _apply_retention_locked(self) -> int:
+        """Archives and drops the expired head of the file. Caller holds the lock."""
+        if not os.path.exists(self.notification_file):
+            return 0
+        overflow = max(0, self.total_count - self.archive.max_count)
+        cutoff = self.archive.cutoff()
+
+        expired = []
+        head_end = 0
+        with open(self.notification_file, 'rb') as f:
+            for line in f:
+                if line.strip():
+                    notification = NotificationRecord.from_json(line)
+                    if len(expired) >= overflow and not self.archive.is_expired(notification, cutoff):
+                        break
+                    expired.append(notification)
+                head_end += len(line)
+        if not expired:
+            return 0
+        self._apply_changes(expired, self._base_seq)
+
+        # A run that crashed after archiving but before trimming left its records at the head;
+        # archive only the ones past the recorded high-water mark
+        already_archived = min(len(expired), max(0, self._archived_upto - self._base_seq))
+        if already_archived < len(expired):
+            self.archive.append(expired[already_archived:])
+        self._archived_upto = self._base_seq + len(expired)
+        self._archived_bytes = head_end
+        self._write_meta()
+        if self._index_ready:
+            self.search_index.drop_head(len(expired), head_end)
+        else:
+            self._index_version += 1
+
+        # Drop the archived head from the unloaded prefix first, then from the loaded list
+        dropped_unloaded = min(len(expired), self._unloaded_count)
+        dropped_loaded = len(expired) - dropped_unloaded
+        self._unloaded_count -= dropped_unloaded
+        self._unloaded_unread = max(0, self._unloaded_unread - sum(
+            1 for n in expired[:dropped_unloaded] if not n.read
+        ))
+        if dropped_loaded:
+            self._loaded_unread -= sum(1 for n in self.notifications[:dropped_loaded] if not n.read)
+            self.notifications = self.notifications[dropped_loaded:]
+        self._prefix_end = max(0, self._prefix_end - head_end)
+
+        temp_file = self.notification_file + ".tmp"
+        with open(self.notification_file, 'rb') as src, open(temp_file, 'wb') as out:
+            src.seek(head_end)
+            shutil.copyfileobj(src, out)
+        os.replace(temp_file, self.notification_file)
+        self._file_generation += 1
+        self._base_seq += len(expired)
+        self._archived_bytes = 0
+        self._changes = {seq: change for seq, change in self._changes.items() if seq >= self._base_seq}
+        self._pending_touches = {seq for seq in self._pending_touches if seq >= self._base_seq}
+        self._write_meta()
+        return len(expired)
+
+    def _invalidate_index(self) -> None:
+        """Marks the search index stale after the history was replaced. Caller holds the lock."""
+        self._index_version += 1
+        self.search_index = NotificationIndex()
+        self._index_ready = False
+
+    def _start_index_build(self) -> None:
+        """Starts building the search index on a background thread unless it is ready or already building."""
+        with self._lock:
+            if self._index_ready or self._index_building:
+                return
+            self._index_building = True
+        threading.Thread(target=self._build_index, name="NotificationIndex", daemon=True).start()
+
+    def _build_index(self) -> None:
+        """
+        Builds the search index if it is stale.
+        Only the unloaded prefix is read from disk, under the lock; it is parsed outside the lock,
+        and the loaded notifications are indexed from memory when the result is installed.
+        The build restarts if the history was replaced or trimmed in the meantime.
+        """
+        try:
+            while True:
+                with self._lock:
+                    if self._index_ready:
+                        return
+                    version = self._index_version
+                    prefix_count = self._unloaded_count
+                    data = b""
+                    if self._prefix_end:
+                        with open(self.notification_file, 'rb') as f:
+                            data = f.read(self._prefix_end)
+
+                started = time.perf_counter()
+                index = NotificationIndex()
+                offset = 0
+                for line in data.splitlines(keepends=True):
+                    if line.strip():
+                        index.add(NotificationRecord.from_json(line), offset)
+                    offset += len(line)
+
+                with self._lock:
+                    if self._index_ready:
+                        return
+                    if self._index_version != version:
+                        continue
+                    # Pages loaded since the prefix was read are already indexed from disk
+                    for notification in self.notifications[prefix_count - self._unloaded_count:]:
+                        index.add(notification)
+                    self.search_index = index
+                    self._index_ready = True
+                logging.info(
+                    f"Indexed {len(index)} notifications for search in "
+                    f"{(time.perf_counter() - started) * 1000:.0f} ms"
+                )
+                break
+        except Exception as e:
+            logging.error(f"Failed to build notification search index: {e}")
+            return
+        finally:
+            with self._lock:
+                self._index_building = False
+        self._emit("indexed", None)
+
+    def _search_loaded(self, query: str, level: Optional[str], start: Optional[datetime],
+                       end: Optional[datetime], limit: Optional[int]) -> List[NotificationRecord]:
+        """Searches only the loaded notifications, newest first. Caller holds the lock."""
+        terms = NotificationIndex.tokenize(query)
+        level = NotificationLevel.parse(level) if level is not None else None
+        start_ts = int(start.timestamp()) if start is not None else None
+        end_ts = int(end.timestamp()) if end is not None else None
+        hits = []
+        for notification in reversed(self.notifications):
+            if limit is not None and len(hits) >= limit:
+                break
+            if level is not None and notification.level != level:
+                continue
+            if (start_ts is not None and notification.timestamp < start_ts) or \
+                    (end_ts is not None and notification.timestamp > end_ts):
+                continue
+            if NotificationIndex.matches(notification, terms):
+                hits.append(notification)
+        return hits
+
+    def _read_lines_at(self, offsets: List[int]) -> List[bytes]:
+        """Reads the line starting at each byte offset of the history file."""
+        if not offsets:
+            return []
+        lines = []
+        with open(self.notification_file, 'rb') as f:
+            for offset in offsets:
+                f.seek(offset)
+                lines.append(f.readline())
+        return lines
+
+    def _materialize(self, plan: List[Tuple[int, Optional[int], Optional[NotificationRecord]]],
+                     lines: List[bytes]) -> List[NotificationRecord]:
+        """
+        Resolves search hits to notifications: loaded ones as they are, older ones decoded from
+        the lines read at their offsets, with journalled changes applied. Caller holds the lock.
+        """
+        results = []
+        older = iter(lines)
+        for position, _, loaded in plan:
+            if loaded is not None:
+                results.append(loaded)
+                continue
+            notification = NotificationRecord.from_json(next(older))
+            self._apply_changes([notification], self._base_seq + position)
+            results.append(notification)
+        return results
+
+    def _read_meta(self) -> Dict[str, int]:
+        """
+        Returns the sidecar counts, rebuilding them with one full scan if stale or missing.
+        The change journal must already be loaded.
+        """
+        size = os.path.getsize(self.notification_file)
+        changes_size = os.path.getsize(self.changes_file) if os.path.exists(self.changes_file) else 0
+        stale: Dict[str, int] = {}
+        try:
+            with open(self.meta_file, 'r') as f:
+                stale = json.load(f)
+            if stale.get("size") == size and stale.get("changes_size", 0) == changes_size:
+                return stale
+        except (OSError, ValueError):
+            pass
+
+        logging.info("Notification metadata missing or stale; rebuilding counts")
+        base_seq = stale.get("base_seq", 0)
+        archived_upto = stale.get("archived_upto", 0)
+        if stale.get("archived_bytes") and size == stale.get("size", 0) - stale["archived_bytes"]:
+            # Retention trimmed the archived head but stopped before recording it
+            base_seq = archived_upto
+        self._read_upto = max(self._read_upto, stale.get("read_upto", 0))
+        count = unread = 0
+        with open(self.notification_file, 'rb') as f:
+            for line in f:
+                if line.strip():
+                    notification = NotificationRecord.from_json(line)
+                    self._apply_changes([notification], base_seq + count)
+                    count += 1
+                    if not notification.read:
+                        unread += 1
+        meta = {"count": count, "unread": unread, "size": size, "changes_size": changes_size,
+                "base_seq": base_seq, "archived_upto": archived_upto, "archived_bytes": 0,
+                "read_upto": self._read_upto}
+        self._write_meta_values(meta)
+        return meta
+
+    def _write_meta(self) -> None:
+        """Writes the sidecar counts for the current state. Caller holds the lock."""
+        self._write_meta_values({
+            "count": self.total_count,
+            "unread": self.unread_count,
+            "size": os.path.getsize(self.notification_file) if os.path.exists(self.notification_file) else 0,
+            "base_seq": self._base_seq,
+            "archived_upto": self._archived_upto,
+            "archived_bytes": self._archived_bytes,
+            "read_upto": self._read_upto,
+            "changes_size": os.path.getsize(self.changes_file) if os.path.exists(self.changes_file) else 0
+        })
+
+    def _write_meta_values(self, meta: Dict[str, int]) -> None:
+        temp_file = self.meta_file + ".tmp"
+        with open(temp_file, 'w') as f:
+            json.dump(meta, f)
+        os.replace(temp_file, self.meta_file)
+
+    def _migrate_legacy_file(self) -> None:
+        """Converts the old single-array notifications.json into the JSON-lines store once."""
+        if not self.legacy_file or not os.path.exists(self.legacy_file) or os.path.exists(self.notification_file):
+            return
+        try:
+            with open(self.legacy_file, 'r') as f:
+                legacy = json.load(f)
+            os.makedirs(os.path.dirname(self.notification_file), exist_ok=True)
+            with open(self.notification_file, 'wb') as out:
+                for notification in legacy:
+                    out.write(NotificationRecord.from_dict(notification).to_json())
+            os.replace(self.legacy_file, self.legacy_file + ".migrated")
+            logging.info(f"Migrated {len(legacy)} notifications to {self.notification_file}")
+        except Exception as e:
+            logging.error(f"Failed to migrate legacy notifications: {e}")
+
+    @staticmethod
+    def _decode_lines(lines: List[Tuple[int, bytes]]) -> List[NotificationRecord]:
+        return [NotificationRecord.from_json(line) for _, line in lines if line.strip()]
+
+    def _emit(self, event: str, notification: Optional[NotificationRecord]) -> None:
+        """Notifies observers of a change and of the unread count if it moved."""
+        for listener in list(self._listeners):
+            try:
+                listener(event, notification)
+            except Exception as e:
+                logging.error(f"Notification observer failed on {event}: {e}")
+
+        with self._lock:
+            count = self.unread_count
+            changed = count != self._last_unread_count
+            self._last_unread_count = count
+        if changed:
+            for listener in list(self._unread_listeners):
+                try:
+                    listener(count)
+                except Exception as e:
+                    logging.error(f"Unread count observer failed: {e}")
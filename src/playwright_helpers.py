@@ -1,26 +1,23 @@
-import asyncio
 import logging
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from browser_pool import get_browser_pool
 
 async def open_page(url, timeout=60000):
     """
-    Opens a URL using Playwright and returns the page object.
+    Opens a URL in a new tab of the shared browser pool and returns the page.
+    Must run on the shared AsyncRunner loop.
 
     Args:
         url (str): The URL to open.
         timeout (int): The timeout for page loading in milliseconds.
 
     Returns:
-        tuple: (page, context, browser, playwright)
+        Page: The Playwright Page object.
     """
     try:
-        playwright = await async_playwright().start()
-        browser = await playwright.chromium.launch(channel="chrome", headless=False, args=["--start-maximized"])
-        context = await browser.new_context()
-        page = await context.new_page()
-        await page.goto(url, timeout=timeout)
+        page = await get_browser_pool().open_page(url, timeout=timeout)
         logging.info(f"Opened URL: {url}")
-        return page, context, browser, playwright
+        return page
     except PlaywrightTimeoutError:
         logging.error(f"Timeout while loading the page: {url}")
         raise
@@ -28,25 +25,20 @@ async def open_page(url, timeout=60000):
         logging.exception(f"Failed to open URL: {url}")
         raise
 
-async def close_resources(page, context, browser, playwright):
+async def close_resources(page, context=None):
     """
-    Closes the resources opened by Playwright.
+    Closes a page, and a context taken from the pool with acquire_context.
+    The shared browser and Playwright driver keep running.
 
     Args:
         page (Page): The Playwright Page object.
-        context (Context): The Playwright BrowserContext.
-        browser (Browser): The Playwright Browser.
-        playwright (Playwright): The Playwright instance.
+        context (Context): An isolated BrowserContext from the pool, if any.
     """
     try:
         if page:
             await page.close()
         if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if playwright:
-            await playwright.stop()
+            await get_browser_pool().release_context(context)
         logging.info("Playwright resources closed.")
     except Exception as e:
-        logging.exception("Error closing Playwright resources.") 
\ No newline at end of file
+        logging.exception("Error closing Playwright resources.")
\ No newline at end of file
@@ -0,0 +1,220 @@
+"""
+Request routing profiles for background automation flows.
+A profile decides, per request, whether it goes to the network, is aborted, or is answered
+with an empty stub, based on the resource type and whether the host is first-party. Flows
+that only need the DOM skip images, fonts, media and third-party beacons this way.
+
+Each flow run also counts requests and response bytes and times the flow; the totals are
+logged and stored with the navigation timing history so runs with and without a profile
+can be compared.
+
+Playwright disables the HTTP cache of a context that has routes, so a profiled flow does
+not use the browser's disk cache; the savings come from the requests it never makes.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from nav_timing import get_timing_store
+
+CONTINUE, ABORT, STUB = "continue", "abort", "stub"
+
+DEFAULT_FIRST_PARTY = ["amazon.com", "amazon.dev", "a2z.com"]
+
+DEFAULT_ROUTE_PROFILES: Dict[str, Dict[str, Any]] = {
+    # The sign-in form needs its own scripts and styles, but nothing else
+    "MIDWAY ACCESS": {
+        "block_types": ["image", "media", "font"],
+        "stub_types": ["ping"],
+        "third_party": STUB
+    },
+    "REPORTS": {
+        "block_types": ["image", "media", "font"],
+        "stub_types": ["ping"],
+        "third_party": ABORT
+    }
+}
+
+# Status, content type and body per resource type; JSON stubs carry an empty object so
+# callers that parse the response do not fail on an empty body
+_STUB_RESPONSES = {
+    "script": (200, "application/javascript", ""),
+    "stylesheet": (200, "text/css", ""),
+    "xhr": (200, "application/json", "{}"),
+    "fetch": (200, "application/json", "{}"),
+}
+
+
+def _host_matches(host: str, suffixes: List[str]) -> bool:
+    return any(host == suffix or host.endswith("." + suffix) for suffix in suffixes)
+
+
+class RouteProfile:
+    """Per-request routing decision for one flow."""
+
+    def __init__(self, name: str, block_types: Optional[List[str]] = None, stub_types: Optional[List[str]] = None,
+                 third_party: str = CONTINUE, first_party: Optional[List[str]] = None,
+                 block_hosts: Optional[List[str]] = None):
+        """
+        Args:
+            name: Profile name, normally the flow's link name
+            block_types: Resource types to abort, e.g. image, font, media
+            stub_types: Resource types answered with an empty response instead
+            third_party: What to do with requests to hosts outside first_party: continue, abort or stub
+            first_party: Host suffixes treated as first-party
+            block_hosts: Host suffixes always aborted
+        """
+        if third_party not in (CONTINUE, ABORT, STUB):
+            raise ValueError(f"third_party must be one of {CONTINUE}, {ABORT}, {STUB}")
+        self.name = name
+        self.block_types = frozenset(block_types or ())
+        self.stub_types = frozenset(stub_types or ())
+        self.third_party = third_party
+        self.first_party = DEFAULT_FIRST_PARTY if first_party is None else list(first_party)
+        self.block_hosts = list(block_hosts or ())
+
+    @classmethod
+    def from_dict(cls, name: str, data: Dict[str, Any]) -> "RouteProfile":
+        return cls(name, **data)
+
+    def decide(self, url: str, resource_type: str, is_navigation: bool = False) -> str:
+        """Returns CONTINUE, ABORT or STUB for a request."""
+        if is_navigation:
+            return CONTINUE
+        host = (urlsplit(url).hostname or "").lower()
+        if self.block_hosts and _host_matches(host, self.block_hosts):
+            return ABORT
+        if self.third_party != CONTINUE and host and not _host_matches(host, self.first_party):
+            return self.third_party
+        if resource_type in self.block_types:
+            return ABORT
+        if resource_type in self.stub_types:
+            return STUB
+        return CONTINUE
+
+
+class FlowRun:
+    """Routing, request counts and timing of one automation flow run."""
+
+    def __init__(self, flow: str, profile: Optional[RouteProfile] = None):
+        self.flow = flow
+        self.profile = profile
+        self.started = time.perf_counter()
+        self.requests = 0
+        self.blocked = 0
+        self.stubbed = 0
+        self.bytes = 0
+        self._size_tasks: List[asyncio.Task] = []
+
+    async def attach(self, context) -> None:
+        """Routes a context's requests through the profile and starts counting them."""
+        context.on("requestfinished", self._on_request_finished)
+        if self.profile is not None:
+            await context.route("**/*", self._handle_route)
+
+    async def finish(self) -> None:
+        """Collects the outstanding response sizes, then logs and stores the run."""
+        elapsed_ms = (time.perf_counter() - self.started) * 1000
+        if self._size_tasks:
+            await asyncio.gather(*self._size_tasks, return_exceptions=True)
+        profile = "routed" if self.profile is not None else "none"
+        logging.info(
+            f"Flow {self.flow}: {elapsed_ms / 1000:.1f}s, {self.requests} requests, "
+            f"{self.bytes / 1024:,.0f} KB transferred, {self.blocked} blocked, {self.stubbed} stubbed "
+            f"(profile: {profile})",
+            extra={"event": "flow.complete", "duration_ms": elapsed_ms}
+        )
+        store = get_timing_store()
+        if store is None:
+            return
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                None, store.add_flow_run, self.flow, profile, elapsed_ms, self.bytes,
+                self.requests, self.blocked, self.stubbed
+            )
+        except Exception as e:
+            logging.warning(f"Failed to store flow run for {self.flow}: {e}")
+
+    async def _handle_route(self, route) -> None:
+        request = route.request
+        try:
+            action = self.profile.decide(request.url, request.resource_type, request.is_navigation_request())
+            if action == ABORT:
+                self.blocked += 1
+                await route.abort("blockedbyclient")
+            elif action == STUB:
+                self.stubbed += 1
+                status, content_type, body = _STUB_RESPONSES.get(request.resource_type, (204, "text/plain", ""))
+                await route.fulfill(status=status, content_type=content_type, body=body)
+            else:
+                await route.continue_()
+        except Exception as e:
+            # The page or context may have closed while the request was pending
+            logging.debug(f"Route handling failed for {request.url}: {e}")
+
+    def _on_request_finished(self, request) -> None:
+        self.requests += 1
+        self._size_tasks.append(asyncio.get_running_loop().create_task(self._add_size(request)))
+
+    async def _add_size(self, request) -> None:
+        try:
+            sizes = await request.sizes()
+        except Exception:
+            return
+        self.bytes += sizes.get("responseBodySize", 0) + sizes.get("responseHeadersSize", 0)
+
+
+_profiles: Dict[str, Dict[str, Any]] = DEFAULT_ROUTE_PROFILES
+_profiles_enabled = True
+_profiles_lock = threading.Lock()
+
+
+def configure_route_profiles(profiles: Optional[Dict[str, Dict[str, Any]]] = None, enabled: bool = True) -> None:
+    """
+    Sets the profiles used by start_flow.
+
+    Args:
+        profiles: Flow name to profile dict (RouteProfile arguments); defaults to DEFAULT_ROUTE_PROFILES
+        enabled: If False, flows are measured but not routed
+    """
+    global _profiles, _profiles_enabled
+    with _profiles_lock:
+        _profiles = DEFAULT_ROUTE_PROFILES if profiles is None else profiles
+        _profiles_enabled = enabled
+
+
+def get_route_profile(flow: str) -> Optional[RouteProfile]:
+    """Returns the configured profile for a flow, or None if it has none or profiles are disabled."""
+    with _profiles_lock:
+        data = _profiles.get(flow) if _profiles_enabled else None
+    if data is None:
+        return None
+    try:
+        return RouteProfile.from_dict(flow, data)
+    except (TypeError, ValueError) as e:
+        logging.warning(f"Ignoring invalid route profile for {flow}: {e}")
+        return None
+
+
+async def start_flow(flow: str, context) -> FlowRun:
+    """
+    Applies the flow's routing profile to a context and starts measuring the flow.
+    Call before the first navigation; pass the result to finish_flow when done.
+    """
+    run = FlowRun(flow, get_route_profile(flow))
+    await run.attach(context)
+    return run
+
+
+async def finish_flow(run: Optional[FlowRun]) -> None:
+    """Reports a flow run started with start_flow; does nothing for None."""
+    if run is None:
+        return
+    try:
+        await run.finish()
+    except Exception as e:
+        logging.debug(f"Failed to report flow run: {e}")
@@ -5,15 +5,10 @@ import subprocess
 import os
 import logging
 from vpn_settings import get_cisco_anyconnect_status
+from logging_config import configure_logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler()
-    ]
-)
+# Configure logging; this runs as its own process, so it appends to the app log without rotating it
+configure_logging(rotate=False)
 
 class PasscodeApp(ctk.CTk):
     def __init__(self):
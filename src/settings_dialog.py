@@ -4,6 +4,10 @@ import json
 import os
 import logging
 
+from log_highlight import DEFAULT_HIGHLIGHT_RULES
+from route_profiles import DEFAULT_ROUTE_PROFILES
+from workspace import DEFAULT_CONCURRENCY, DEFAULT_WORKSPACES
+
 class SettingsDialog:
     def __init__(self, parent):
         self.parent = parent
@@ -23,7 +27,31 @@ class SettingsDialog:
             "notification_sound": True,
             "show_icons": True,
             "compact_mode": False,
-            "autosave_settings": True
+            "autosave_settings": True,
+            "notification_coalesce_window": 60,
+            "toast_rate_limit_seconds": 30,
+            "notification_retention_days": 30,
+            "notification_max_count": 1000,
+            "log_view_max_lines": 2000,
+            "structured_log": False,
+            "browser_prewarm": True,
+            "browser_spare_pages": 1,
+            "browser_spare_contexts": 1,
+            "browser_session_persist": True,
+            "browser_session_max_age_hours": 12,
+            "workspaces": {name: list(links) for name, links in DEFAULT_WORKSPACES.items()},
+            "workspace_concurrency": DEFAULT_CONCURRENCY,
+            "nav_timing_enabled": True,
+            "nav_timing_retention_days": 90,
+            "browser_disk_cache": True,
+            "browser_disk_cache_mb": 256,
+            "route_profiles_enabled": True,
+            "link_health_enabled": True,
+            "link_health_interval_seconds": 60,
+            "link_health_timeout_seconds": 5,
+            "link_health_slow_ms": 2000,
+            "route_profiles": {flow: dict(profile) for flow, profile in DEFAULT_ROUTE_PROFILES.items()},
+            "log_highlight_rules": [dict(rule) for rule in DEFAULT_HIGHLIGHT_RULES]
         }
         
         if os.path.exists(self.settings_file):
@@ -2,8 +2,9 @@ import functools
 import logging
 import json
 import os
-from datetime import datetime
-from typing import Optional, Any, Callable
+from typing import Optional, Any, Callable, List
+
+from notification_record import NotificationRecord
 
 def handle_errors(error_message: str = "An error occurred", log_error: bool = True):
     """
@@ -38,28 +39,22 @@ class NotificationManager:
         """Save a notification to persistent storage."""
         try:
             notifications = cls.load_notifications()
-            notifications.append({
-                "message": message,
-                "level": level,
-                "timestamp": datetime.now().isoformat(),
-                "read": False
-            })
+            notifications.append(NotificationRecord(message, level))
             
             # Ensure directory exists
             os.makedirs(os.path.dirname(cls.NOTIFICATION_FILE), exist_ok=True)
             
-            with open(cls.NOTIFICATION_FILE, 'w') as f:
-                json.dump(notifications, f, indent=2)
+            cls._write(notifications)
         except Exception as e:
             logging.error(f"Failed to save notification: {e}")
 
     @classmethod
-    def load_notifications(cls) -> list:
+    def load_notifications(cls) -> List[NotificationRecord]:
         """Load notifications from persistent storage."""
         try:
             if os.path.exists(cls.NOTIFICATION_FILE):
                 with open(cls.NOTIFICATION_FILE, 'r') as f:
-                    return json.load(f)
+                    return [NotificationRecord.from_dict(n) for n in json.load(f)]
         except Exception as e:
             logging.error(f"Failed to load notifications: {e}")
         return []
@@ -70,12 +65,17 @@ class NotificationManager:
         try:
             notifications = cls.load_notifications()
             if 0 <= index < len(notifications):
-                notifications[index]["read"] = True
-                with open(cls.NOTIFICATION_FILE, 'w') as f:
-                    json.dump(notifications, f, indent=2)
+                notifications[index].read = True
+                cls._write(notifications)
         except Exception as e:
             logging.error(f"Failed to mark notification as read: {e}")
 
+    @classmethod
+    def _write(cls, notifications: List[NotificationRecord]) -> None:
+        """Writes notifications in the canonical record format."""
+        with open(cls.NOTIFICATION_FILE, 'w') as f:
+            json.dump([n.to_dict() for n in notifications], f, indent=2)
+
 def cache_resource(cache_key: str):
     """
     A decorator for caching resource loading results.
@@ -56,12 +56,14 @@ class VPNManager:
                 return True
                 
             # Use the improved connection method from vpn_settings
+            started = time.perf_counter()
             success, message = connect_to_vpn_with_fallback(self.vpn_endpoint)
+            timing = {"event": "vpn.connect", "duration_ms": (time.perf_counter() - started) * 1000}
             if success:
-                logging.info(f"VPN connection successful: {message}")
+                logging.info(f"VPN connection successful: {message}", extra=timing)
                 return True
             else:
-                logging.error(f"VPN connection failed: {message}")
+                logging.error(f"VPN connection failed: {message}", extra=timing)
                 return False
                 
         except Exception as e:
@@ -124,7 +126,8 @@ class VPNManager:
             
             # Only log status changes to avoid spam
             if is_connected != self.connected:
-                logging.info(f"VPN connection status changed: {'Connected' if is_connected else 'Disconnected'}")
+                logging.info(f"VPN connection status changed: {'Connected' if is_connected else 'Disconnected'}",
+                             extra={"event": "vpn.status"})
                 self.connected = is_connected
                 
             return is_connected
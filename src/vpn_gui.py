@@ -249,7 +249,8 @@ class VPNManager:
                 
                 # Only log status changes to avoid spam
                 if is_connected != self.connected:
-                    logging.info(f"VPN connection status changed: {'Connected' if is_connected else 'Disconnected'}")
+                    logging.info(f"VPN connection status changed: {'Connected' if is_connected else 'Disconnected'}",
+                                 extra={"event": "vpn.status"})
                 
                 return is_connected
                 
@@ -0,0 +1,144 @@
+"""
+Workspace presets: named sets of LINKS opened together as tabs of the pooled browser.
+All tabs are created up front in preset order, then their navigations run concurrently,
+at most `concurrency` at a time, so the slowest page rather than the sum of all pages
+decides how long a workspace takes to open.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Callable, Dict, List, Optional
+
+from constants import LINKS
+from nav_timing import record_navigation_soon
+
+DEFAULT_WORKSPACES: Dict[str, List[str]] = {
+    "Shift Start": ["GENERAL FEATURES", "TICKETS LINK", "REPORTS", "MIDWAY ACCESS"]
+}
+DEFAULT_CONCURRENCY = 4
+
+
+class TabResult:
+    """Outcome of one tab of a workspace."""
+
+    __slots__ = ("name", "url", "elapsed_ms", "error")
+
+    def __init__(self, name: str, url: str, elapsed_ms: float = 0.0, error: Optional[str] = None):
+        self.name = name
+        self.url = url
+        self.elapsed_ms = elapsed_ms
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __str__(self):
+        if self.ok:
+            return f"{self.name} {self.elapsed_ms / 1000:.1f}s"
+        return f"{self.name} failed"
+
+
+ProgressCallback = Callable[[TabResult, int, int], None]
+
+
+def resolve_links(names: List[str], links: Optional[Dict[str, str]] = None) -> List[TabResult]:
+    """
+    Maps the link names of a preset to pending tab results, skipping unknown and repeated names.
+
+    Args:
+        names: Keys of `links`
+        links: Name to URL mapping; defaults to LINKS
+
+    Returns:
+        list: One TabResult per link to open, in preset order
+    """
+    links = LINKS if links is None else links
+    tabs, seen = [], set()
+    for name in names:
+        if name in seen:
+            continue
+        seen.add(name)
+        url = links.get(name)
+        if url is None:
+            logging.warning(f"Workspace link {name!r} is not a known link; skipping it")
+            continue
+        tabs.append(TabResult(name, url))
+    return tabs
+
+
+async def open_workspace(pool, name: str, names: List[str], concurrency: int = DEFAULT_CONCURRENCY,
+                         on_progress: Optional[ProgressCallback] = None, timeout: int = 60000) -> List[TabResult]:
+    """
+    Opens the links of a workspace as tabs of the pooled browser. Runs on the pool loop.
+
+    Args:
+        pool: BrowserPool to open the tabs in
+        name: Workspace name, for logging
+        names: Link names to open
+        concurrency: Most navigations in flight at once
+        on_progress: Called on the pool loop with (result, finished count, total) as each tab finishes
+        timeout: Navigation timeout per tab in milliseconds
+
+    Returns:
+        list: TabResult per link, in preset order; failed tabs carry an error instead of raising
+    """
+    tabs = resolve_links(names)
+    if not tabs:
+        return tabs
+    started = time.perf_counter()
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    finished = 0
+
+    def fail(tab: TabResult, error: Exception) -> None:
+        tab.error = str(error) or type(error).__name__
+        logging.error(f"Workspace {name!r}: failed to open {tab.name} - {tab.url}: {tab.error}")
+
+    # Tabs are cheap, so create them in order first; only the navigations are limited.
+    # A tab that cannot be created fails on its own instead of aborting the workspace.
+    pages = []
+    for tab in tabs:
+        try:
+            pages.append(await pool.new_page())
+        except Exception as e:
+            fail(tab, e)
+            pages.append(None)
+
+    async def load(tab: TabResult, page) -> None:
+        nonlocal finished
+        if page is not None:
+            async with semaphore:
+                tab_started = time.perf_counter()
+                try:
+                    await page.goto(tab.url, timeout=timeout)
+                    tab.elapsed_ms = (time.perf_counter() - tab_started) * 1000
+                    record_navigation_soon(page, tab.name, tab.url)
+                    await pool.sync_session(page)
+                except Exception as e:
+                    fail(tab, e)
+                    tab.elapsed_ms = (time.perf_counter() - tab_started) * 1000
+                    if page.url in ("", "about:blank"):
+                        # The navigation never committed; do not leave an empty tab behind
+                        await _close_quietly(page)
+        finished += 1
+        if on_progress is not None:
+            on_progress(tab, finished, len(tabs))
+
+    await asyncio.gather(*(load(tab, page) for tab, page in zip(tabs, pages)))
+
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    opened = sum(tab.ok for tab in tabs)
+    logging.info(
+        f"Workspace {name!r}: opened {opened}/{len(tabs)} tabs in {elapsed_ms / 1000:.1f}s "
+        f"({', '.join(str(tab) for tab in tabs)})",
+        extra={"event": "workspace.open", "duration_ms": elapsed_ms}
+    )
+    return tabs
+
+
+async def _close_quietly(page) -> None:
+    try:
+        await page.close()
+    except Exception:
+        pass
@@ -0,0 +1,158 @@
+"""
+Tests for link_health against a local HTTP server on an ephemeral port.
+Run from the repository root with: python -m unittest discover tests
+"""
+
+import os
+import socket
+import sys
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from link_health import DOWN, UNKNOWN, UP, LinkHealthChecker
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_HEAD(self):
+        if self.path == "/up":
+            self._reply(200)
+        elif self.path == "/redirect":
+            self._reply(302, {"Location": "/sign-in"})
+        elif self.path == "/error":
+            self._reply(503)
+        elif self.path == "/get-only":
+            self._reply(405)
+        else:
+            self._reply(404)
+
+    def do_GET(self):
+        if self.path == "/get-only":
+            self._reply(200)
+        else:
+            self.do_HEAD()
+
+    def _reply(self, code, headers=None):
+        self.send_response(code)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _refused_url(path="/"):
+    """Returns a URL on a local port that nothing listens on."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}{path}"
+
+
+class LinkHealthCheckerTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def _checker(self, links, **options):
+        options.setdefault("timeout", 2)
+        checker = LinkHealthChecker(links=links, **options)
+        self.addCleanup(checker.stop)
+        return checker
+
+    def _results(self, checker):
+        return {status.name: status for status in checker.run_once()}
+
+    def test_states(self):
+        checker = self._checker({
+            "up": f"{self.base}/up",
+            "redirect": f"{self.base}/redirect",
+            "error": f"{self.base}/error",
+            "get-only": f"{self.base}/get-only",
+            "refused": _refused_url(),
+        })
+        results = self._results(checker)
+
+        self.assertEqual((results["up"].state, results["up"].status_code), (UP, 200))
+        # The redirect to a sign-in page counts as up
+        self.assertEqual((results["redirect"].state, results["redirect"].status_code), (UP, 302))
+        self.assertEqual((results["error"].state, results["error"].status_code), (DOWN, 503))
+        self.assertIsNone(results["error"].error)
+        # HEAD answered 405, so the GET fallback decides
+        self.assertEqual((results["get-only"].state, results["get-only"].status_code), (UP, 200))
+        self.assertEqual(results["refused"].state, DOWN)
+        self.assertIsNone(results["refused"].status_code)
+        self.assertEqual(results["refused"].error, "ConnectionError")
+
+    def test_slow(self):
+        checker = self._checker({"up": f"{self.base}/up"}, slow_ms=-1)
+        self.assertEqual(self._results(checker)["up"].state, "slow")
+
+    def test_unreachable_host_backs_off(self):
+        url = _refused_url()
+        checker = self._checker({"refused": url}, interval=10, max_backoff=35)
+        host = checker._host(url)
+
+        for failures, delay in ((1, 20), (2, 35), (3, 35)):
+            checker.check_now()
+            started = time.time()
+            self._results(checker)
+            self.assertEqual(checker._host_failures[host], failures)
+            self.assertAlmostEqual(checker._host_next_check[host] - started, delay, delta=2)
+
+        # Not due again until the backoff has passed
+        self.assertEqual(checker.run_once(), [])
+
+    def test_one_failure_per_host_per_round(self):
+        url = _refused_url()
+        checker = self._checker({"a": url, "b": url + "other", "c": url + "third"}, interval=10)
+        self._results(checker)
+        self.assertEqual(checker._host_failures[checker._host(url)], 1)
+
+    def test_answer_resets_backoff_of_shared_host(self):
+        checker = self._checker({"up": f"{self.base}/up", "error": f"{self.base}/error"}, interval=10)
+        host = checker._host(self.base)
+        checker._host_failures[host] = 3
+
+        started = time.time()
+        self._results(checker)
+        # A 5xx answer still means the host is reachable, so neither link keeps the backoff
+        self.assertNotIn(host, checker._host_failures)
+        self.assertAlmostEqual(checker._host_next_check[host] - started, 10, delta=2)
+
+    def test_stop_does_not_wait_for_checks(self):
+        updates = []
+        checker = self._checker({"up": f"{self.base}/up"}, on_update=updates.append)
+        checker.start()
+        deadline = time.time() + 5
+        while not updates and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(len(updates), 1)
+
+        started = time.perf_counter()
+        checker.stop()
+        self.assertLess(time.perf_counter() - started, 0.5)
+
+        checker.check_now()
+        time.sleep(0.2)
+        self.assertEqual(len(updates), 1)
+
+    def test_statuses_start_unknown(self):
+        checker = self._checker({"up": f"{self.base}/up"})
+        self.assertEqual([status.state for status in checker.statuses()], [UNKNOWN])
+
+
+if __name__ == "__main__":
+    unittest.main()